@@ -0,0 +1,90 @@
+import sys
+import time
+import tracemalloc
+from instance.utils import Vec2
+from instance.headless import HeadlessFour
+from benchmarks.bench_matrix_backend import scripted_actions
+
+# Count the Vec2 objects created and the transient memory allocated by the engine per tick on a scripted game.
+#
+# usage: python -m benchmarks.bench_allocations [ticks]
+
+class Vec2Counter():
+    def __init__(self):
+        """
+        Count the Vec2 objects created while installed, by wrapping Vec2.__init__
+        """
+        self.count = 0
+        self.__init = Vec2.__init__
+
+    def __enter__(self):
+        init = self.__init
+
+        def counting_init(vec, x, y):
+            self.count += 1
+            init(vec, x, y)
+
+        Vec2.__init__ = counting_init
+        return self
+
+    def __exit__(self, *exc):
+        Vec2.__init__ = self.__init
+
+def play(script:list, matrix_backend:str, on_tick = None):
+    """
+    Play the script on a new game, restarting on game over
+
+    args:
+        script (list): The actions to perform on each tick
+        matrix_backend (str): The matrix backend to use
+        on_tick (callable): Called after each tick
+    """
+    four = HeadlessFour(seed = 0, matrix_backend = matrix_backend)
+
+    for actions in script:
+        if four.FlagStruct.GAME_OVER:
+            four = HeadlessFour(seed = 0, matrix_backend = matrix_backend)
+        four.step(actions)
+
+        if on_tick is not None:
+            on_tick()
+
+def measure(script:list, matrix_backend:str):
+    """
+    Return the Vec2 objects created per tick, the mean transient bytes allocated per tick and the time per tick in microseconds
+
+    args:
+        script (list): The actions to perform on each tick
+        matrix_backend (str): The matrix backend to use
+    """
+    start = time.perf_counter()
+    play(script, matrix_backend)
+    us_per_tick = (time.perf_counter() - start) / len(script) * 1e6
+
+    with Vec2Counter() as counter:
+        play(script, matrix_backend)
+
+    transient = []
+
+    def sample():
+        current, peak = tracemalloc.get_traced_memory()
+        transient.append(peak - current)
+        tracemalloc.reset_peak()
+
+    tracemalloc.start()
+    play(script, matrix_backend, sample)
+    tracemalloc.stop()
+
+    return counter.count / len(script), sum(transient) / len(transient), us_per_tick
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    script = scripted_actions(ticks)
+
+    print(f"{'backend':<10}{'Vec2/tick':>12}{'transient B/tick':>18}{'us/tick':>10}")
+    for matrix_backend in ('LIST', 'BITBOARD'):
+        vec2s, transient, us_per_tick = measure(script, matrix_backend)
+        print(f"{matrix_backend:<10}{vec2s:>12.2f}{transient:>18.1f}{us_per_tick:>10.2f}")
+
+if __name__ == "__main__":
+    main()
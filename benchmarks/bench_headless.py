@@ -0,0 +1,68 @@
+import subprocess
+import statistics
+import sys
+
+# Measure the import and startup cost of the headless engine against the full pygame stack.
+# Each case runs in a fresh interpreter so that module caches do not hide the import cost.
+#
+# usage: python -m benchmarks.bench_headless [runs]
+
+CASES = {
+    'headless (instance.headless)': (
+        "from instance.headless import HeadlessFour",
+        "four = HeadlessFour(); four.step()",
+    ),
+    'full stack (core.core + instance.four)': (
+        "from core.core import Core; from instance.four import Four",
+        "",
+    ),
+}
+
+PROBE = """
+import sys, time
+t0 = time.perf_counter()
+{imports}
+t1 = time.perf_counter()
+{startup}
+t2 = time.perf_counter()
+print((t1 - t0) * 1000, (t2 - t1) * 1000, int('pygame' in sys.modules))
+"""
+
+def run_case(imports:str, startup:str, runs:int):
+    """
+    Run a case in fresh interpreters and return the median import time, startup time and whether pygame was loaded
+
+    args:
+        imports (str): The import statements to time
+        startup (str): The statements that create and step the game
+        runs (int): The number of fresh interpreters to use
+    """
+    import_times, startup_times, loaded_pygame = [], [], False
+
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', PROBE.format(imports = imports, startup = startup)], capture_output = True, text = True)
+
+        if result.returncode != 0:
+            return None, None, result.stderr.strip().splitlines()[-1]
+
+        import_ms, startup_ms, pygame_flag = result.stdout.strip().splitlines()[-1].split()
+        import_times.append(float(import_ms))
+        startup_times.append(float(startup_ms))
+        loaded_pygame = bool(int(pygame_flag))
+
+    return statistics.median(import_times), statistics.median(startup_times), loaded_pygame
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"{'case':<42}{'import (ms)':>14}{'startup (ms)':>14}{'pygame':>8}")
+    for name, (imports, startup) in CASES.items():
+        import_ms, startup_ms, loaded_pygame = run_case(imports, startup, runs)
+
+        if import_ms is None:
+            print(f"{name:<42}  failed: {loaded_pygame}")
+        else:
+            print(f"{name:<42}{import_ms:>14.1f}{startup_ms:>14.2f}{str(loaded_pygame):>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import random
+import sys
+import time
+from instance.headless import HeadlessFour, Action
+
+# Compare the per tick engine cost of the matrix backends on the same scripted game.
+#
+# usage: python -m benchmarks.bench_matrix_backend [ticks]
+
+ACTIONS = [
+    Action.MOVE_LEFT, Action.MOVE_RIGHT, Action.ROTATE_CLOCKWISE, Action.ROTATE_COUNTERCLOCKWISE,
+    Action.ROTATE_180, Action.HARD_DROP, Action.SOFT_DROP, Action.SOFT_DROP_RELEASE, Action.HOLD,
+    Action.SONIC_LEFT, Action.SONIC_RIGHT, Action.SONIC_DROP,
+]
+
+def scripted_actions(ticks:int, seed:int = 0):
+    """
+    Build a reproducible list of the actions to perform on each tick
+
+    args:
+        ticks (int): The number of ticks
+        seed (int): The seed of the script
+    """
+    rng = random.Random(seed)
+    return [(rng.choice(ACTIONS),) if rng.random() < 0.35 else () for _ in range(ticks)]
+
+def time_backend(matrix_backend:str, script:list):
+    """
+    Play the script on a new game, restarting on game over, and return the time per tick in microseconds
+
+    args:
+        matrix_backend (str): The matrix backend to use
+        script (list): The actions to perform on each tick
+    """
+    four = HeadlessFour(seed = 0, matrix_backend = matrix_backend)
+    start = time.perf_counter()
+
+    for actions in script:
+        if four.FlagStruct.GAME_OVER:
+            four = HeadlessFour(seed = 0, matrix_backend = matrix_backend)
+        four.step(actions)
+
+    return (time.perf_counter() - start) / len(script) * 1e6
+
+def time_collision(matrix_backend:str, calls:int):
+    """
+    Time the collision test of the current piece against the matrix in microseconds per call
+
+    args:
+        matrix_backend (str): The matrix backend to use
+        calls (int): The number of collision tests
+    """
+    four = HeadlessFour(seed = 0, matrix_backend = matrix_backend)
+    four.step()
+    tetromino = four.GameInstanceStruct.current_tetromino
+    start = time.perf_counter()
+
+    for _ in range(calls):
+        tetromino.collision(tetromino.shape)
+
+    return (time.perf_counter() - start) / calls * 1e6
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    script = scripted_actions(ticks)
+
+    print(f"{'backend':<10}{'us/tick':>10}{'us/collision':>14}")
+    for matrix_backend in ('LIST', 'BITBOARD'):
+        print(f"{matrix_backend:<10}{time_backend(matrix_backend, script):>10.2f}{time_collision(matrix_backend, 100000):>14.3f}")
+
+if __name__ == "__main__":
+    main()
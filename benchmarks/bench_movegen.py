@@ -0,0 +1,69 @@
+import random
+import sys
+import time
+from instance.headless import Matrix, BitboardMatrix
+from instance.movegen import generate_placements, get_spawn_origin
+from instance.pieces import PIECE_TYPES, SHAPES
+
+# Measure the move generator on boards built by dropping random pieces, for each matrix backend.
+#
+# usage: python -m benchmarks.bench_movegen [boards]
+
+def build_boards(matrix_type:type, count:int, seed:int = 0):
+    """
+    Build reproducible boards by dropping random pieces at random columns and clearing lines, restarting when the stack gets too high
+
+    args:
+        matrix_type (type): The matrix backend class
+        count (int): The number of boards
+        seed (int): The seed of the boards
+    """
+    rng = random.Random(seed)
+    boards = []
+    matrix = matrix_type(10, 20)
+
+    while len(boards) < count:
+        shape = SHAPES[rng.choice(PIECE_TYPES)][rng.randint(0, 3)]
+        x, y = rng.randint(-shape.min_x, matrix.WIDTH - 1 - shape.max_x), 18
+
+        if matrix.collision(shape, x, y) or matrix.highest_row < matrix.HEIGHT // 2 + 6: # keep the stack below the spawn area
+            matrix = matrix_type(10, 20)
+            continue
+
+        matrix.insert_blocks(shape, x, y + matrix.drop_distance(shape, x, y), matrix.matrix)
+        matrix.clear_lines()
+        board = matrix_type(10, 20)
+        board.matrix = [row[:] for row in matrix.matrix]
+        boards.append(board)
+
+    return boards
+
+def time_movegen(boards:list, rotation_system:str):
+    """
+    Generate the placements of every piece type in turn on each board and return the calls per second and the mean placements per call
+
+    args:
+        boards (list): The matrices to search
+        rotation_system (str): The type of rotation system
+    """
+    placements = 0
+    start = time.perf_counter()
+
+    for idx, matrix in enumerate(boards):
+        type = PIECE_TYPES[idx % len(PIECE_TYPES)]
+        x, y = get_spawn_origin(type, 4, 18)
+        placements += len(generate_placements(matrix, type, rotation_system, x, y))
+
+    elapsed = time.perf_counter() - start
+    return len(boards) / elapsed, placements / len(boards)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    print(f"{'backend':<10}{'calls/s':>10}{'us/call':>10}{'placements':>12}")
+    for name, matrix_type in (('LIST', Matrix), ('BITBOARD', BitboardMatrix)):
+        calls, placements = time_movegen(build_boards(matrix_type, count), 'SRS')
+        print(f"{name:<10}{calls:>10.0f}{1e6 / calls:>10.1f}{placements:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import random
+import sys
+import time
+from input.handling.action import Action
+from instance.headless import HeadlessFour
+from instance.pieces import SHAPES
+from instance.replay import Replay, ReplayPlayer, play_replay
+
+# Record a bot game of a given length, then measure the size of its replay, how much faster than real time it plays back
+# and how long seeking to the end takes from its keyframes.
+#
+# usage: python -m benchmarks.bench_replay [seconds]
+
+ACTION_GAP = 48 # ticks between the bot's actions, about 5 actions a second at 256 TPS
+
+def score_placement(matrix, placement):
+    """
+    Score a placement by the height of the stack and the holes under it after it locks, higher is better
+
+    args:
+        matrix (Matrix): The matrix the piece locks in
+        placement (Placement): The placement
+    """
+    matrix = matrix.copy()
+    matrix.insert_blocks(SHAPES[placement.type][placement.state], placement.x, placement.y, matrix.matrix)
+    matrix.clear_lines()
+
+    holes = 0
+    for x in range(matrix.WIDTH):
+        column = [row[x] != 0 for row in matrix.matrix]
+        if True in column:
+            holes += column[column.index(True):].count(False)
+
+    return matrix.highest_row - 4 * holes
+
+def record_game(seconds:float, seed:int = 0):
+    """
+    Record a game played by a bot that locks each piece where it leaves the lowest stack with the fewest holes,
+    among the placements reached without soft dropping, one action at a time
+
+    args:
+        seconds (float): The length of the game in seconds of game time
+        seed (int): The seed of the game and of the bot
+    """
+    rng = random.Random(seed)
+    four = HeadlessFour(seed = seed)
+    four.start_recording()
+    end_tick = int(seconds * four.Config.TPS)
+    path = []
+
+    while four.GameInstanceStruct.ticks < end_tick and not four.FlagStruct.GAME_OVER:
+        if not path:
+            four.run(1)
+            placements = [placement for placement in four.get_placements() if Action.SOFT_DROP not in placement.path]
+
+            if not placements:
+                continue
+
+            scores = [score_placement(four.GameInstanceStruct.matrix, placement) for placement in placements]
+            best = max(scores)
+            path = list(rng.choice([placement for placement, score in zip(placements, scores) if score == best]).path)
+
+        four.step([path.pop(0)])
+        four.run(min(ACTION_GAP - 1, end_tick - four.GameInstanceStruct.ticks))
+
+    return four.stop_recording(), four
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 120
+    replay, four = record_game(seconds)
+    data = replay.to_bytes()
+
+    start = time.perf_counter()
+    played = play_replay(Replay.from_bytes(data))
+    elapsed = time.perf_counter() - start
+
+    player = ReplayPlayer(replay)
+    start = time.perf_counter()
+    player.seek(replay.end_tick - 1)
+    seek_elapsed = time.perf_counter() - start
+
+    game_seconds = replay.end_tick / four.Config.TPS
+    print(f"game length  {game_seconds:.1f} s, {replay.end_tick} ticks, {len(replay.events)} actions")
+    print(f"replay size  {len(data)} bytes ({len(data) / 1024:.2f} KB), {len(replay.keyframes)} keyframes")
+    print(f"playback     {elapsed * 1000:.1f} ms, {game_seconds / elapsed:.0f}x real time")
+    print(f"seek to end  {seek_elapsed * 1000:.1f} ms")
+    print(f"matches      {played.snapshot().matrix == four.snapshot().matrix and played.GameInstanceStruct.ticks == four.GameInstanceStruct.ticks}")
+
+if __name__ == "__main__":
+    main()
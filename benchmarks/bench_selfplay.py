@@ -0,0 +1,43 @@
+import os
+import sys
+import time
+from instance.selfplay import greedy_bot, play_game, play_games
+
+# Measure how the throughput of the self-play runner scales with the number of worker processes,
+# against the same games played one after another in this process.
+#
+# usage: python -m benchmarks.bench_selfplay [games]
+
+def time_serial(games:int):
+    """
+    Play sprint games one after another in this process and return the pieces per second
+    """
+    start = time.perf_counter()
+    pieces = sum(play_game(greedy_bot, 'SPRINT', seed).pieces for seed in range(games))
+    return pieces / (time.perf_counter() - start)
+
+def time_pool(games:int, workers:int):
+    """
+    Play sprint games across a process pool and return the pieces per second, the startup of the pool included
+    """
+    start = time.perf_counter()
+    pieces = sum(game.pieces for game in play_games(greedy_bot, 'SPRINT', range(games), max_workers = workers))
+    return pieces / (time.perf_counter() - start)
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    cpus = os.cpu_count() or 1
+    serial = time_serial(games)
+    print(f"{'serial':<10} {serial:>8.0f} pieces/s")
+
+    workers = 1
+    while True:
+        pool = time_pool(games, workers)
+        print(f"{f'{workers} workers':<10} {pool:>8.0f} pieces/s  {pool / serial:.2f}x serial")
+
+        if workers >= cpus:
+            break
+        workers = min(workers * 2, cpus)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import sys
+import time
+from instance.four import Queue, RNG
+from instance.sequence import generate_sequence, generate_sequences
+
+# Compare generating piece sequences with the Queue one piece at a time, with generate_sequence and across a process pool.
+#
+# usage: python -m benchmarks.bench_sequence [pieces]
+
+RANDOMISERS = ('7BAG', '14BAG', 'CLASSIC', 'PAIRS', 'RANDOM')
+
+def time_queue(randomiser:str, count:int):
+    """
+    Take pieces from a Queue one at a time and return the pieces per second
+
+    args:
+        randomiser (str): The randomiser type
+        count (int): The number of pieces
+    """
+    queue = Queue(RNG(0), randomiser)
+    start = time.perf_counter()
+
+    for _ in range(count):
+        queue.get_next_piece()
+
+    return count / (time.perf_counter() - start)
+
+def time_sequence(randomiser:str, count:int):
+    """
+    Generate the pieces with generate_sequence and return the pieces per second
+
+    args:
+        randomiser (str): The randomiser type
+        count (int): The number of pieces
+    """
+    start = time.perf_counter()
+    generate_sequence(randomiser, 0, count)
+    return count / (time.perf_counter() - start)
+
+def time_sweep(randomiser:str, seeds:int, count:int):
+    """
+    Generate the sequences of many seeds across a process pool and return the pieces per second
+
+    args:
+        randomiser (str): The randomiser type
+        seeds (int): The number of seeds
+        count (int): The number of pieces of each seed
+    """
+    start = time.perf_counter()
+    generate_sequences(randomiser, range(seeds), count)
+    return seeds * count / (time.perf_counter() - start)
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    print(f"{'randomiser':<12}{'queue M/s':>12}{'sequence M/s':>14}{'sweep M/s':>12}")
+    for randomiser in RANDOMISERS:
+        print(f"{randomiser:<12}{time_queue(randomiser, count // 10) / 1e6:>12.2f}{time_sequence(randomiser, count) / 1e6:>14.2f}{time_sweep(randomiser, 32, count // 4) / 1e6:>12.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import os
+import pickle
+import sys
+import time
+import numpy as np
+from instance.shared_vec_four import SharedVecFour
+from instance.vec_four import VEC_ACTIONS
+
+# Measure the steps per second of SharedVecFour for different numbers of workers, stepping random actions,
+# and what pickling the observation of every step through a pipe would cost instead.
+#
+# usage: python -m benchmarks.bench_shared_vec_four [envs] [steps]
+
+def measure(num_envs:int, num_workers:int, steps:int):
+    """
+    Return the time per batched step in milliseconds, the game steps per second and the time to pickle one observation in milliseconds
+
+    args:
+        num_envs (int): The number of games
+        num_workers (int): The number of worker processes
+        steps (int): The number of batched steps to perform
+    """
+    actions = np.random.default_rng(0).integers(0, len(VEC_ACTIONS), size = (steps, num_envs))
+
+    with SharedVecFour(num_envs, num_workers, seed = 0) as vec_four:
+        start = time.perf_counter()
+        for step_actions in actions:
+            observation, reward, done = vec_four.step(step_actions)
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pickle.loads(pickle.dumps((observation, reward, done)))
+        pickle_elapsed = time.perf_counter() - start
+
+    return elapsed / steps * 1000, steps * num_envs / elapsed, pickle_elapsed * 1000
+
+def main():
+    num_envs = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    cpus = os.cpu_count() or 1
+
+    print(f"{'workers':<10}{'ms/step':>10}{'steps/s':>14}{'pickle ms':>12}")
+    workers = 1
+    while True:
+        ms_per_step, steps_per_second, pickle_ms = measure(num_envs, workers, steps)
+        print(f"{workers:<10}{ms_per_step:>10.3f}{steps_per_second:>14.0f}{pickle_ms:>12.3f}")
+
+        if workers >= cpus:
+            break
+        workers = min(workers * 2, cpus)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import sys
+import time
+import numpy as np
+from instance.vec_four import VecFour, VEC_ACTIONS
+
+# Measure the steps per second of VecFour for different numbers of games, stepping random actions.
+#
+# usage: python -m benchmarks.bench_vec_four [steps]
+
+NUM_ENVS = (1, 16, 256, 1024, 4096)
+
+def measure(num_envs:int, steps:int):
+    """
+    Return the time per batched step in milliseconds and the game steps per second
+
+    args:
+        num_envs (int): The number of games
+        steps (int): The number of batched steps to perform
+    """
+    vec_four = VecFour(num_envs, seed = 0)
+    actions = np.random.default_rng(0).integers(0, len(VEC_ACTIONS), size = (steps, num_envs))
+
+    start = time.perf_counter()
+    for step_actions in actions:
+        vec_four.step(step_actions)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / steps * 1000, steps * num_envs / elapsed
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    print(f"{'envs':<8}{'ms/step':>10}{'steps/s':>14}")
+    for num_envs in NUM_ENVS:
+        ms_per_step, steps_per_second = measure(num_envs, steps)
+        print(f"{num_envs:<8}{ms_per_step:>10.3f}{steps_per_second:>14.0f}")
+
+if __name__ == "__main__":
+    main()
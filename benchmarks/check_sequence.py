@@ -0,0 +1,77 @@
+import sys
+from instance.four import Queue, RNG
+from instance.pieces import PIECE_IDS
+from instance.sequence import generate_sequence, generate_sequences
+
+# Check that generate_sequence, generate_sequences and Queue.seek give the same pieces as taking them from a Queue one at a time,
+# for every randomiser, many seeds and start indices inside and across bags. Exits with status 1 on the first mismatch.
+#
+# usage: python -m benchmarks.check_sequence [seeds] [pieces]
+
+RANDOMISERS = ('7BAG', '14BAG', 'CLASSIC', 'PAIRS', 'RANDOM')
+STARTS = (0, 1, 13, 50, 137)
+
+def take_pieces(randomiser:str, seed:int, count:int):
+    """
+    Take the piece ids of a seed from a Queue one at a time
+
+    args:
+        randomiser (str): The randomiser type
+        seed (int): The seed
+        count (int): The number of pieces
+    """
+    queue = Queue(RNG(seed), randomiser)
+    return [PIECE_IDS[queue.get_next_piece()] for _ in range(count)]
+
+def check_seed(randomiser:str, seed:int, count:int):
+    """
+    Compare every way of getting the pieces of a seed with the Queue
+
+    args:
+        randomiser (str): The randomiser type
+        seed (int): The seed
+        count (int): The number of pieces from each start index
+
+    returns:
+        (str): What differs, None if everything matches
+    """
+    expected = take_pieces(randomiser, seed, max(STARTS) + count)
+
+    for start in STARTS:
+        if randomiser == 'CLASSIC' and start != 0: # the classic randomiser rerolls, so it cannot seek
+            continue
+
+        if generate_sequence(randomiser, seed, count, start).tolist() != expected[start:start + count]:
+            return f"generate_sequence from piece {start}"
+
+        if start != 0:
+            queue = Queue(RNG(seed), randomiser)
+            queue.seek(start)
+
+            if [PIECE_IDS[queue.get_next_piece()] for _ in range(count)] != expected[start:start + count]:
+                return f"Queue.seek to piece {start}"
+
+    return None
+
+def main():
+    seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 29
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    for randomiser in RANDOMISERS:
+        for seed in range(seeds):
+            mismatch = check_seed(randomiser, seed, count)
+
+            if mismatch is not None:
+                print(f"MISMATCH  {randomiser}, seed {seed}: {mismatch}")
+                sys.exit(1)
+
+        sweep = generate_sequences(randomiser, range(seeds), count, max_workers = 2)
+
+        if sweep.tolist() != [take_pieces(randomiser, seed, count) for seed in range(seeds)]:
+            print(f"MISMATCH  {randomiser}: generate_sequences")
+            sys.exit(1)
+
+    print(f"match     {len(RANDOMISERS)} randomisers, {seeds} seeds, starts {STARTS}: generate_sequence, generate_sequences and Queue.seek match the Queue")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import random
+import sys
+from input.handling.action import Action
+from instance.four import SNAPSHOT_GAME_INSTANCE_FIELDS
+from instance.headless import HeadlessFour
+
+# Check that skipping idle ticks (HeadlessFour.run with skip_idle) leaves every game exactly as ticking one by one does,
+# across gravities and lock delays, with pieces locking on their own so the prevent accidental hard drop timer runs.
+# Exits with status 1 on the first mismatch.
+#
+# usage: python -m benchmarks.check_skip_ticks [seeds] [rounds]
+
+GRAVITIES = (1/60, 0.02, 0.5, 1, 20) # G, rows per frame
+LOCK_DELAYS = (60, 30, 'inf') # frames
+
+ACTIONS = (
+    Action.MOVE_LEFT, Action.MOVE_RIGHT, Action.ROTATE_CLOCKWISE, Action.ROTATE_COUNTERCLOCKWISE, Action.ROTATE_180,
+    Action.SOFT_DROP, Action.SOFT_DROP_RELEASE, Action.HARD_DROP, Action.HOLD, Action.SONIC_LEFT, Action.SONIC_RIGHT,
+)
+
+NEXT_IDX = SNAPSHOT_GAME_INSTANCE_FIELDS.index('next_tetromino')
+
+def get_state(four):
+    """
+    Get what must match between the two games: the state hash, the clock and the snapshot,
+    with the next piece by its type as the Tetromino objects of two games never compare equal
+
+    args:
+        four (HeadlessFour): The game
+    """
+    snapshot = four.snapshot()
+    game_instance = list(snapshot.game_instance)
+    next_tetromino = game_instance[NEXT_IDX]
+    game_instance[NEXT_IDX] = None if next_tetromino is None else next_tetromino.type
+
+    return (four.state_hash(), four.clock.now(), snapshot.matrix[:5], snapshot.current_tetromino, snapshot.queue, snapshot.rng,
+            snapshot.flags, tuple(game_instance), snapshot.handling, snapshot.current_time)
+
+def check_game(seed:int, gravity, lock_delay, rounds:int):
+    """
+    Play the same random actions and waits in a game that skips idle ticks and one that ticks one by one
+
+    args:
+        seed (int): The seed of the game and of the actions
+        gravity (float): The gravity in G
+        lock_delay (int or str): The lock delay in frames, 'inf' for none
+        rounds (int): The number of rounds of an action followed by a wait
+
+    returns:
+        (int): The round the games first differ at, None if they never do
+    """
+    rng = random.Random(seed)
+    games = (HeadlessFour(seed = seed), HeadlessFour(seed = seed))
+
+    for four in games:
+        four.GameInstanceStruct.gravity = gravity
+        four.GameInstanceStruct.lock_delay = lock_delay
+
+    for round in range(rounds):
+        action = rng.choice(ACTIONS) if rng.random() < 0.8 else None
+        wait = rng.choice((0, 1, 2, rng.randrange(3, 40), rng.randrange(40, 400)))
+
+        for four, skip_idle in zip(games, (True, False)):
+            four.step(() if action is None else (action,))
+            four.run(wait, skip_idle)
+
+        if get_state(games[0]) != get_state(games[1]):
+            return round
+
+        if games[0].FlagStruct.GAME_OVER:
+            break
+
+    return None
+
+def main():
+    seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    games = 0
+
+    for gravity in GRAVITIES:
+        for lock_delay in LOCK_DELAYS:
+            for seed in range(seeds):
+                mismatch = check_game(seed, gravity, lock_delay, rounds)
+                games += 1
+
+                if mismatch is not None:
+                    print(f"MISMATCH  gravity {gravity}, lock delay {lock_delay}, seed {seed}, round {mismatch}")
+                    sys.exit(1)
+
+    print(f"match     {games} games, skip_idle = True and False end every round the same")
+
+if __name__ == "__main__":
+    main()
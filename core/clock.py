@@ -44,4 +44,65 @@ class Clock:
         """
         Return the delta time of the clock
         """
-        return self.dt
\ No newline at end of file
+        return self.dt
+
+class WallClock():
+    def __init__(self, TPS:int):
+        """
+        Real time in seconds since the clock was created, time passes on its own and the game has to wait for it
+        
+        args:
+        (int) TPS: the number of game ticks per second
+        
+        attributes:
+        (float) tick_duration: the length of a game tick in the units of now()
+        (bool) max_speed: whether the clock only moves when it is advanced
+        """
+        self.tick_duration = 1 / TPS
+        self.max_speed = False
+        self.start_time = time.perf_counter()
+    
+    def now(self):
+        """
+        Return the time in seconds since the clock was created
+        """
+        return time.perf_counter() - self.start_time
+    
+    def advance(self, ticks:int = 1):
+        """
+        Real time cannot be advanced, it passes on its own
+        
+        args:
+        (int) ticks: the number of game ticks
+        """
+        pass
+
+class VirtualClock():
+    def __init__(self):
+        """
+        Simulated time counted in game ticks that only passes when the clock is advanced, so a game can run as fast as the CPU allows.
+        Every timestamp is a whole number of ticks, so the same inputs always give the same game.
+        
+        attributes:
+        (int) tick_duration: the length of a game tick in the units of now()
+        (bool) max_speed: whether the clock only moves when it is advanced
+        (int) ticks: the number of ticks the clock has been advanced by
+        """
+        self.tick_duration = 1
+        self.max_speed = True
+        self.ticks = 0
+    
+    def now(self):
+        """
+        Return the time in ticks
+        """
+        return self.ticks
+    
+    def advance(self, ticks:int = 1):
+        """
+        Move the time forward
+        
+        args:
+        (int) ticks: the number of game ticks
+        """
+        self.ticks += ticks
@@ -12,13 +12,19 @@ from core.state.struct_gameinstance import StructGameInstance
 from core.state.struct_flags import StructFlags, set_flag_attr
 from core.state.struct_handling import StructHandling
 from core.state.struct_render import StructRender
-from core.clock import Clock
+from core.clock import Clock, WallClock, VirtualClock
+from core.writer import BackgroundWriter
 
 class Core():
-    def __init__(self):
+    def __init__(self, max_speed:bool = False, replay_path:str = None):
         """
         Manage the game loop, key events, and rendering of the game
         
+        args:
+        (bool) max_speed: run the game on a virtual clock that jumps straight to the next event instead of waiting for real time,
+                          every timestamp is then in ticks so recorded inputs always give the same game
+        (str) replay_path: record the game and stream the replay to this file from a background thread, see core.writer
+        
         methods:
             run(four): Run the instance of four
         """
@@ -32,18 +38,24 @@ class Core():
         self.HandlingConfig = HandlingConfig()
         
         self.render_clock = Clock()
+        self.clock = VirtualClock() if max_speed else WallClock(self.Config.TPS)
+        self.TimingStruct.clock = self.clock
         
         self.Debug = Debug(self.Config, self.TimingStruct, self.HandlingConfig, self.HandlingStruct, self.GameInstanceStruct, self.FlagStruct, self.RenderStruct, self.DebugStruct)
-        self.handling = Handling(self.Config, self.HandlingConfig, self.HandlingStruct, self.FlagStruct)
+        self.handling = Handling(self.Config, self.HandlingConfig, self.HandlingStruct, self.FlagStruct, clock = self.clock)
           
         self.TPS = self.Config.TPS
         self.FPS = self.Config.FPS
-        self.time_per_tick = 1 / self.Config.TPS
+        self.time_per_tick = self.clock.tick_duration
+        self.second = self.clock.tick_duration * self.Config.TPS # one second of game time in the units of the clock
         self.frame_time = 1 / self.Config.FPS
         
+        self.replay_path = replay_path
+        self.writer = None
+        
         self.exited = False
          
-    def __initialise(self):
+    def __initialise(self, four):
         """
         Initalise the instance of the game
         
@@ -51,6 +63,12 @@ class Core():
         (Four) four: the instance of the game
         """
         set_flag_attr() # set the flag attributes
+        
+        if self.replay_path is not None: # the game loop only queues records, the writer thread does the disk I/O
+            self.writer = BackgroundWriter(self.replay_path)
+            self.DebugStruct.writer = self.writer
+            four.start_recording(writer = self.writer)
+        
         self.render = Render(self.Config, self.RenderStruct, self.FlagStruct, self.GameInstanceStruct, self.TimingStruct, self.DebugStruct)
         
         self.TimingStruct.start_times["handle_events"] = time.perf_counter()
@@ -76,7 +94,7 @@ class Core():
         args:
         (Four) four: the instance of the game
         """
-        self.__initialise()
+        self.__initialise(four)
         
         await asyncio.gather( 
             self.__handling_loop(),
@@ -84,6 +102,10 @@ class Core():
             self.__get_debug_info(),
             self.__render_loop(),
         )
+        
+        if self.writer is not None:
+            four.stop_recording()
+            self.writer.close()
       
     # ------------------------------------------- HANDLING LOOP -------------------------------------------
     
@@ -93,11 +115,14 @@ class Core():
         """
         while not self.exited:
                 
-                self.HandlingStruct.current_time = time.perf_counter() - self.TimingStruct.start_times["handle_events"] 
+                self.HandlingStruct.current_time = self.clock.now()
                 self.TimingStruct.elapsed_times["handle_events"] = self.HandlingStruct.current_time
                 
                 self.HandlingStruct.delta_time += (self.handling.HandlingStruct.current_time - self.handling.HandlingStruct.last_tick_time) / self.handling.polling_tick_time
                 self.HandlingStruct.last_tick_time = self.handling.HandlingStruct.current_time
+                
+                if self.clock.max_speed: # the keys are polled once per loop, however far the game time jumped
+                    self.HandlingStruct.delta_time = min(self.HandlingStruct.delta_time, 1)
               
                 if self.HandlingStruct.do_first_tick:
                     self.__handle_key_events()
@@ -107,10 +132,10 @@ class Core():
                     self.__handle_key_events()
                     self.HandlingStruct.delta_time -= 1
                 
-                if self.HandlingStruct.current_time > self.HandlingStruct.poll_counter_last_cleared + 1:
+                if self.HandlingStruct.current_time > self.HandlingStruct.poll_counter_last_cleared + self.second:
                     self.__get_polling_rate()
                     self.HandlingStruct.poll_tick_counter = 0
-                    self.HandlingStruct.poll_counter_last_cleared += 1
+                    self.HandlingStruct.poll_counter_last_cleared += self.second
             
                 await asyncio.sleep(0)
     
@@ -160,8 +185,11 @@ class Core():
         (Four) four: the instance of the game
         """
         while not self.exited:
+            
+            if self.clock.max_speed: # jump to the next event instead of waiting for it, at most a second of game time so the other loops keep up
+                self.clock.advance(min(four.next_event_tick(), self.Config.TPS))
          
-            self.TimingStruct.current_time = time.perf_counter() - self.TimingStruct.start_times["game_loop"]
+            self.TimingStruct.current_time = self.clock.now()
             self.TimingStruct.elapsed_times["game_loop"] = self.TimingStruct.current_time
             
             self.TimingStruct.delta_time += (self.TimingStruct.current_time - self.TimingStruct.last_tick_time) / self.time_per_tick
@@ -172,13 +200,21 @@ class Core():
                 self.TimingStruct.do_first_tick = False
             
             while self.TimingStruct.delta_time >= 1:
+                idle_ticks = min(four.next_event_tick() - 1, int(self.TimingStruct.delta_time)) # ticks that only count down timers are skipped at once
+                
+                if idle_ticks > 0:
+                    four.skip_ticks(idle_ticks)
+                    self.TimingStruct.tick_counter += idle_ticks
+                    self.TimingStruct.delta_time -= idle_ticks
+                    continue
+                
                 self.__do_tick(four)
                 self.TimingStruct.delta_time -= 1
                 
-            if self.TimingStruct.current_time > self.TimingStruct.tick_counter_last_cleared + 1:
+            if self.TimingStruct.current_time > self.TimingStruct.tick_counter_last_cleared + self.second:
                 self.__get_tps()
                 self.TimingStruct.tick_counter = 0
-                self.TimingStruct.tick_counter_last_cleared += 1
+                self.TimingStruct.tick_counter_last_cleared += self.second
             
             await asyncio.sleep(0)
             
@@ -159,4 +159,10 @@ class Debug():
      
         self.DebugStruct.ALLCLEARFLAG = self.FlagStruct.ALL_CLEAR
         self.DebugStruct.BACK2BACKFLAG = self.FlagStruct.BACK2BACK
-        self.DebugStruct.COMBOFLAG = self.FlagStruct.COMBO
\ No newline at end of file
+        self.DebugStruct.COMBOFLAG = self.FlagStruct.COMBO
+        
+        # background writer
+        if self.DebugStruct.writer is not None:
+            self.DebugStruct.Writer_Queued = self.DebugStruct.writer.queued()
+            self.DebugStruct.Writer_Written = self.DebugStruct.writer.records_written
+            self.DebugStruct.Writer_Dropped = self.DebugStruct.writer.records_dropped
\ No newline at end of file
@@ -34,3 +34,8 @@ class StructDebug():
    polling_time_list: List[float] = field(default_factory = list)
    polling_time: float = 0
    polling_time_idx: int = 0
+   
+   writer: object = None # the BackgroundWriter a replay is streamed to, see core.writer
+   Writer_Queued: int = 0
+   Writer_Written: int = 0
+   Writer_Dropped: int = 0
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from utils import Vec2
+from instance.utils import Vec2
 from instance.four import Queue
 from instance.matrix import Matrix
 
@@ -14,6 +14,7 @@ class StructGameInstance():
     
     queue:Queue = None
     matrix:Matrix = None
+    matrix_backend: str = 'LIST'
     
     gravity: float = 1/60
     G_units_in_ticks: int = 0
@@ -32,3 +33,5 @@ class StructGameInstance():
     cleared_blocks: list = None
     cleared_idxs: list = None
     lines_cleared: int = None
+    
+    ticks: int = 0 # the number of ticks performed
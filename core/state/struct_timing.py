@@ -12,6 +12,7 @@ class StructTiming():
     tick_counter_last_cleared: float = 0
     FPS = 144
     TPS = 256
+    clock: object = None # the WallClock or VirtualClock the game time is read from, see core.clock
 
     current_frame_time: float = 0
     last_frame_time: float = 0
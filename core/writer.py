@@ -0,0 +1,143 @@
+import os
+import queue
+import threading
+import time
+import zlib
+
+_CLOSE = object() # tells the writer thread to finish once the records before it are written
+
+class BackgroundWriter():
+    def __init__(self, path:str, max_records:int = 4096, batch_records:int = 256, flush_interval:float = 0.25, fsync_batches:int = 8, compress:bool = True):
+        """
+        Write records to a file on a thread of its own, so the game loop never waits on the disk.
+        Records are handed over through a bounded queue; when the queue is full the record is dropped and counted instead of blocking.
+        The thread writes the records in batches, compressed as one zlib stream that is flushed at the end of every batch,
+        so everything up to the last batch can be read back even if the game is killed before the writer is closed
+        (the stream then has no end, read it with zlib.decompressobj rather than zlib.decompress, as Replay.load does).
+
+        args:
+        (str) path: the path of the file, it is replaced if it exists
+        (int) max_records: the number of records the queue holds before records are dropped
+        (int) batch_records: the largest number of records written at once
+        (float) flush_interval: the longest time in seconds a record waits in the queue before its batch is written
+        (int) fsync_batches: the number of batches written between each fsync, 0 to only fsync when the writer is closed
+        (bool) compress: whether to compress the file with zlib
+
+        attributes:
+        (int) records_written: the number of records written to the file
+        (int) records_dropped: the number of records dropped because the queue was full
+        (int) bytes_written: the number of bytes written to the file after compression
+        (int) fsyncs: the number of times the file has been synced to the disk
+
+        methods:
+            write(record): Hand a record to the writer thread without blocking
+            queued(): Get the number of records waiting to be written
+            close(): Write the remaining records, sync the file and stop the thread
+        """
+        self.path = path
+        self.batch_records = batch_records
+        self.flush_interval = flush_interval
+        self.fsync_batches = fsync_batches
+
+        self.records_written = 0
+        self.records_dropped = 0
+        self.bytes_written = 0
+        self.fsyncs = 0
+        self.closed = False
+
+        self.__queue = queue.Queue(max_records)
+        self.__compressor = zlib.compressobj(6) if compress else None
+        self.__file = open(path, 'wb')
+        self.__thread = threading.Thread(target = self.__run, name = 'BackgroundWriter', daemon = True)
+        self.__thread.start()
+
+    def write(self, record:bytes):
+        """
+        Hand a record to the writer thread, never blocks
+
+        args:
+        (bytes) record: the bytes to append to the file
+
+        returns:
+        (bool): True if the record was queued, False if it was dropped because the queue was full
+        """
+        try:
+            self.__queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.records_dropped += 1
+            return False
+
+    def queued(self):
+        """
+        Return the number of records waiting to be written
+        """
+        return self.__queue.qsize()
+
+    def close(self):
+        """
+        Write the records still in the queue, sync the file to the disk and stop the writer thread
+        """
+        if self.closed:
+            return
+
+        self.closed = True
+        self.__queue.put(_CLOSE) # waits for room, the thread is draining the queue
+        self.__thread.join()
+
+    def __run(self):
+        """
+        Write the queued records a batch at a time until the writer is closed.
+        A batch is collected from its first record until it holds batch_records records or flush_interval has passed,
+        so a slow stream of records is still compressed, flushed and synced a batch at a time rather than a record at a time.
+        """
+        batches = 0
+
+        while True:
+            batch = [self.__queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_records and batch[-1] is not _CLOSE:
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    break
+
+                try:
+                    batch.append(self.__queue.get(timeout = remaining))
+                except queue.Empty:
+                    break
+
+            closing = batch[-1] is _CLOSE
+
+            if closing:
+                batch.pop()
+
+            self.__write_batch(batch, closing)
+            batches += 1
+
+            if closing or (self.fsync_batches and batches % self.fsync_batches == 0):
+                os.fsync(self.__file.fileno())
+                self.fsyncs += 1
+
+            if closing:
+                self.__file.close()
+                return
+
+    def __write_batch(self, batch:list, closing:bool):
+        """
+        Write a batch of records, compressed and flushed so that the file can be read up to the end of the batch
+
+        args:
+        (list) batch: the records to write
+        (bool) closing: whether this is the last batch, which ends the zlib stream
+        """
+        data = b''.join(batch)
+
+        if self.__compressor is not None:
+            data = self.__compressor.compress(data) + self.__compressor.flush(zlib.Z_FINISH if closing else zlib.Z_SYNC_FLUSH)
+
+        self.__file.write(data)
+        self.__file.flush()
+        self.records_written += len(batch)
+        self.bytes_written += len(data)
@@ -1,41 +1,15 @@
-from enum import Enum, auto
 import pygame as pygame
 from collections import deque
-
-class Action(Enum):
-    """
-    Actions that can be performed
-    """
-    MOVE_LEFT = auto()
-    MOVE_RIGHT = auto()
-    ROTATE_CLOCKWISE = auto()
-    ROTATE_COUNTERCLOCKWISE = auto()
-    ROTATE_180 = auto()
-    HARD_DROP = auto()
-    
-    SOFT_DROP = auto()
-    SOFT_DROP_RELEASE = auto()
-    
-    HOLD = auto()
-    
-    # ARR == 0 behaviour
-    SONIC_LEFT = auto()
-    SONIC_RIGHT = auto()
-    
-    # inf SDF behaviour
-    SONIC_DROP = auto()
-    
-    # ARR == 0 & inf SDF behaviour
-    SONIC_LEFT_DROP = auto()
-    SONIC_RIGHT_DROP = auto()
+from input.handling.action import Action
     
 class Handling():
-    def __init__(self, Config, HandlingConfig, HandlingStruct, FlagStruct):
+    def __init__(self, Config, HandlingConfig, HandlingStruct, FlagStruct, clock = None):
         """
         Handle the key inputs and provide the actions to the game loop in a queue.
         
         args:	
             config (Config): The game configuration
+            clock (WallClock | VirtualClock): The clock the key events are timed with, times are in seconds if not provided
         
         methods:
             before_loop_hook(key): Hook that is called within the game loop before the tick is executed to obtain the current action states to be used in the game loop
@@ -48,7 +22,11 @@ class Handling():
         self.HandlingConfig = HandlingConfig
         self.HandlingStruct = HandlingStruct
         self.FlagStruct = FlagStruct
-        self.polling_tick_time = 1 / self.Config.POLLING_RATE
+        
+        if clock is None:
+            self.polling_tick_time = 1 / self.Config.POLLING_RATE
+        else:
+            self.polling_tick_time = clock.tick_duration * self.Config.TPS / self.Config.POLLING_RATE # in the units of the clock
      
         self.actions = self.__GetEmptyActions()
         self.HandlingStruct.action_queue = deque()
@@ -0,0 +1,18 @@
+from dataclasses import dataclass, field
+from typing import Dict 
+
+@dataclass
+class HandlingSettings():
+    
+    HANDLING_SETTINGS: Dict[str, object] = field(default_factory = lambda: {
+        'ARR': 33,           # Auto repeat rate (int) in ms: The speed at which tetrominoes move when holding down the movement keys (ms)
+        'DAS': 167,          # Delayed Auto Shift (int) in ms: The time between the initial key press and the automatic repeat movement (ms)
+        'DCD': 0,            # DAS Cut Delay (int) in ms: If non-zero, any ongoing DAS movement will pause for a set amount of time after dropping/rotating a piece (ms)
+        'SDF': 23,           # Soft Drop Factor (int): The factor the soft dropping scales the current gravity by, or 'inf' for instant soft drop
+        'PrevAccHD': True,   # Prevent Accidental Hard Drops (bool): When a piece locks on its own, the hard drop action is disabled for a few frames
+        'PrevAccHDTime': 3,  # Prevent Accidental Hard Drops Time (int) in frames: The number of frames the hard drop action is disabled for after a piece automatically locks
+        'DASCancel': False,  # Cancel DAS When Changing Directions (bool): If true, the DAS timer will reset if the opposite direction is pressed
+        'PrefSD': True,      # Prefer Soft Drop Over Movement (bool): At very high speeds, the soft drop action will be performed first if both the soft drop and movement keys are held
+        'PrioriDir': True,   # Prioritize the Most Recent Direction (bool): whether to prioritise the most recent direction key over the other when both are held
+        'SonicDrop': False   # Sonic Drop (bool): Whether to replace the hard drop action with the sonic drop action
+    })
@@ -1,21 +1,93 @@
-from instance.tetromino import Tetromino
-from instance.matrix import Matrix
-from input.handling.handling import Action
-from instance.rotation import RotationSystem
+from dataclasses import dataclass
+from operator import attrgetter
+from instance.tetromino import Tetromino, PUSH_DOWN
+from instance.matrix import MATRIX_BACKENDS
+from instance.movegen import generate_placements, get_spawn_origin, CANONICAL_STATES, NO_SPIN, MINI_SPIN, FULL_SPIN
+from input.handling.action import Action
+from instance.rotation import compile_kick_table
 import math
-from utils import Vec2
+from instance.utils import Vec2
+from instance.pieces import PIECE_IDS, PIECE_TYPES, SHAPES
+from instance.zobrist import PIECE_PADDING, get_piece_keys, get_state_keys
+
+ID_TYPES = (None,) + PIECE_TYPES # the piece type of each piece id
+
+# the fields of the state structs that change during a game, the settings are left out
+SNAPSHOT_GAME_INSTANCE_FIELDS = (
+    'held_tetromino', 'can_hold', 'next_tetromino', 'gravity_counter', 'G_units_in_ticks', 'soft_dropping', 'soft_drop_factor',
+    'lock_delay_in_ticks', 'lines_cleared', 'cleared_blocks', 'cleared_idxs', 'reset', 'ticks',
+)
+SNAPSHOT_HANDLING_FIELDS = (
+    'current_direction', 'DAS_LEFT_COUNTER', 'DAS_LEFT_COUNTER_REMAINDER', 'ARR_LEFT_COUNTER', 'ARR_LEFT_COUNTER_REMAINDER', 'DO_MOVEMENT_LEFT',
+    'DAS_RIGHT_COUNTER', 'DAS_RIGHT_COUNTER_REMAINDER', 'ARR_RIGHT_COUNTER', 'ARR_RIGHT_COUNTER_REMAINDER', 'DO_MOVEMENT_RIGHT',
+    'PREV_ACC_HD_COUNTER', 'DONE_TAP_LEFT', 'DONE_TAP_RIGHT',
+)
+_get_game_instance_state = attrgetter(*SNAPSHOT_GAME_INSTANCE_FIELDS)
+_get_handling_state = attrgetter(*SNAPSHOT_HANDLING_FIELDS)
+
+@dataclass(frozen = True, slots = True)
+class Snapshot():
+    """
+    An immutable record of the state of a game of Four, taken by Four.snapshot() and put back by Four.restore()
+    
+    attributes:
+        matrix (tuple): The snapshot of the matrix
+        current_tetromino (tuple): The snapshot of the current piece, None if there is no current piece
+        queue (tuple): The snapshot of the queue
+        rng (int): The internal state of the RNG
+        flags (tuple): The (flag, value) pairs of the flags
+        game_instance (tuple): The values of SNAPSHOT_GAME_INSTANCE_FIELDS
+        handling (tuple): The values of SNAPSHOT_HANDLING_FIELDS
+        action_queue (tuple): The actions waiting to be performed
+        current_time (float): The time of the game
+    """
+    matrix: tuple
+    current_tetromino: tuple
+    queue: tuple
+    rng: int
+    flags: tuple
+    game_instance: tuple
+    handling: tuple
+    action_queue: tuple
+    current_time: float
+
+@dataclass(frozen = True, slots = True)
+class PlaceResult():
+    """
+    The outcome of placing a piece with Four.place()
+    
+    attributes:
+        lines_cleared (int): The number of lines the piece cleared
+        spin (str or bool): The type of the piece if it locked with a spin, False otherwise, as Flags.IS_SPIN
+        mini (bool): Whether the spin is a mini, as Flags.IS_MINI
+        game_over (bool): Whether the game is over after the piece locked and the next piece spawned
+    """
+    lines_cleared: int
+    spin: str | bool
+    mini: bool
+    game_over: bool
 
 class Four():
-    def __init__(self, Config, FlagStruct, GameInstanceStruct, TimingStruct, HandlingStruct, HandlingConfig, matrix_width, matrix_height, rotation_system:str = 'SRS', randomiser = '7BAG', queue_previews = 5, seed = 0, hold = True, allowed_spins = 'ALL-MINI', lock_out_ok = True, top_out_ok = False, reset_on_top_out = False):
+    def __init__(self, Config, FlagStruct, GameInstanceStruct, TimingStruct, HandlingStruct, HandlingConfig, matrix_width, matrix_height, rotation_system:str = 'SRS', randomiser = '7BAG', queue_previews = 5, seed = 0, hold = True, allowed_spins = 'ALL-MINI', lock_out_ok = True, top_out_ok = False, reset_on_top_out = False, matrix_backend:str = 'LIST'):
         """
         Create an instance of the game Four
         
         args:
          (Core): The core instance of the game
             rotation_system (str): The rotation system to use
+            matrix_backend (str): The matrix representation to use: ['LIST', 'BITBOARD']
             
         methods:
             loop(): The main game loop
+            next_event_tick(): Get the number of ticks until the next tick that does more than count down timers
+            skip_ticks(ticks): Perform a number of ticks that only count down timers at once
+            snapshot(): Get an immutable record of the state of the game
+            restore(snapshot): Put the game back to a snapshot
+            state_hash(): Get a 64 bit Zobrist hash of the matrix, current piece, hold and queue previews
+            get_placements(use_hold): Get every position the current piece can be locked in
+            place(piece, x, rotation, use_hold, y, spin): Lock a piece in one of its placements without ticking
+            start_recording(): Start recording the actions performed for a replay
+            stop_recording(): Stop recording and get the replay
         """
         self.Config = Config
         self.FlagStruct = FlagStruct
@@ -25,8 +97,7 @@ class Four():
         self.HandlingConfig = HandlingConfig
 
         self.GameInstanceStruct.rotation_system_type = rotation_system
-        self.GameInstanceStruct.rotation_system = RotationSystem(rotation_system)
-        self.GameInstanceStruct.kick_table = self.GameInstanceStruct.rotation_system.kick_table
+        self.GameInstanceStruct.kick_table = compile_kick_table(rotation_system)
         self.GameInstanceStruct.allowed_spins = allowed_spins
         self.GameInstanceStruct.lock_out_ok = lock_out_ok
         self.GameInstanceStruct.top_out_ok = top_out_ok
@@ -44,9 +115,18 @@ class Four():
         
         self.RNG = RNG(self.GameInstanceStruct.seed)
         self.GameInstanceStruct.queue = Queue(self.RNG, randomiser)
-        self.GameInstanceStruct.matrix = Matrix(matrix_width, matrix_height)
+        self.GameInstanceStruct.matrix_backend = matrix_backend
+        self.GameInstanceStruct.matrix = MATRIX_BACKENDS[matrix_backend](matrix_width, matrix_height)
+        self.spawn_pos = Vec2(math.floor((self.GameInstanceStruct.matrix.WIDTH - 1) / 2), self.GameInstanceStruct.matrix.HEIGHT // 2 - 2)
         
         self.GameInstanceStruct.hold = hold
+        self.GameInstanceStruct.ticks = 0
+        
+        self.recorder = None
+        
+        self.__piece_keys = None # the Zobrist keys of the current piece, made on the first state_hash
+        self.__queue_hash = (None, 0) # the queue generation the hash of the queue previews was taken at, and the hash
+        self.__placements = {False: (None, []), True: (None, [])} # hold -> the search the placements were found for, and the placements
     
     # =================================================== GAME LOGIC ===================================================
         
@@ -58,12 +138,18 @@ class Four():
 
         self.__action_dequeuer()
         self.__get_next_state()
+        self.GameInstanceStruct.ticks += 1
+        
+        if self.recorder is not None:
+            self.recorder.record(self)
            
     def __action_dequeuer(self):
         """
         Consume the actions from the action queue to be performed in the current tick
         """
-        if self.TimingStruct.TPS != 0:
+        if self.TimingStruct.clock is not None:
+            tick_duration = self.TimingStruct.clock.tick_duration # in the units of the clock timestamps are taken from
+        elif self.TimingStruct.TPS != 0:
             tick_duration = 1000 / self.TimingStruct.TPS # ms per tick
         else:
             tick_duration = 1000/ self.Config.TPS
@@ -185,7 +271,7 @@ class Four():
         if self.GameInstanceStruct.current_tetromino is None:
             return
         
-        self.GameInstanceStruct.current_tetromino.rotate(action, self.GameInstanceStruct.kick_table['90'])
+        self.GameInstanceStruct.current_tetromino.rotate(action, self.GameInstanceStruct.kick_table)
         
     def __rotate180(self, action):
         """
@@ -197,7 +283,7 @@ class Four():
         if self.GameInstanceStruct.current_tetromino is None:
             return
         
-        self.GameInstanceStruct.current_tetromino.rotate(action, self.GameInstanceStruct.kick_table['180'])
+        self.GameInstanceStruct.current_tetromino.rotate(action, self.GameInstanceStruct.kick_table)
   
     def __hard_drop(self):
         """
@@ -270,7 +356,7 @@ class Four():
         if self.GameInstanceStruct.current_tetromino is None:
             return
         
-        self.GameInstanceStruct.matrix.insert_blocks(self.GameInstanceStruct.current_tetromino.blocks, self.GameInstanceStruct.current_tetromino.position, self.GameInstanceStruct.matrix.matrix)
+        self.GameInstanceStruct.matrix.insert_blocks(self.GameInstanceStruct.current_tetromino.shape, self.GameInstanceStruct.current_tetromino.position.x, self.GameInstanceStruct.current_tetromino.position.y, self.GameInstanceStruct.matrix.matrix)
         self.__do_lock_out()
         self.GameInstanceStruct.current_tetromino = None
             
@@ -281,8 +367,7 @@ class Four():
         if self.GameInstanceStruct.current_tetromino is None:
             return
         
-        while not self.GameInstanceStruct.current_tetromino.is_on_floor():
-            self.GameInstanceStruct.current_tetromino.attempt_to_move_downwards()
+        self.GameInstanceStruct.current_tetromino.move_to_floor()
     
     def __clear_lines(self):
         """
@@ -307,7 +392,7 @@ class Four():
             if action == Action.SOFT_DROP:
                 self.__soft_drop()
                 if self.GameInstanceStruct.current_tetromino.is_on_floor():
-                    self.FlagStruct.PUSH_VERTICAL = Vec2(0, 1)
+                    self.FlagStruct.PUSH_VERTICAL = PUSH_DOWN
                 else:
                     self.FlagStruct.PUSH_VERTICAL = False
             else:
@@ -404,9 +489,6 @@ class Four():
             next_piece (str): The type of the next tetromino
             hold_spawn (bool): Whether the piece is spawning from the hold slot
         """
-        
-        self.spawn_pos = Vec2(math.floor((self.GameInstanceStruct.matrix.WIDTH - 1) / 2), self.GameInstanceStruct.matrix.HEIGHT // 2 - 2)
-        
         spawning_tetromino = Tetromino(next_piece, 0,  self.spawn_pos.x,  self.spawn_pos.y, self.FlagStruct, self.GameInstanceStruct)
         self.GameInstanceStruct.lock_delay_counter = 0
         
@@ -433,7 +515,7 @@ class Four():
         """
         Check if the tetromino can spawn in the matrix
         """
-        if not spawning_tetromino.collision(spawning_tetromino.blocks, spawning_tetromino.position):
+        if not spawning_tetromino.collision(spawning_tetromino.shape):
             return True
         else:
             self.__do_block_out()
@@ -530,16 +612,7 @@ class Four():
         """
         Test if any rows above and including the 18th row are empty
         """
-        non_zero_idx = []
-        for row in range(0, self.GameInstanceStruct.matrix.HEIGHT // 2 + 3):
-            for idx in self.GameInstanceStruct.matrix.matrix[row]:
-                if idx != 0:
-                    non_zero_idx.append(idx)
-                
-        if len(non_zero_idx) != 0:
-            return False
-        else:
-            return True
+        return self.GameInstanceStruct.matrix.highest_row >= self.GameInstanceStruct.matrix.HEIGHT // 2 + 3
                          
     def __get_next_piece_warn(self):
         """
@@ -548,10 +621,13 @@ class Four():
         if self.FlagStruct.GAME_OVER:
             return
         
-        self.GameInstanceStruct.matrix.spawn_overlap = self.GameInstanceStruct.matrix.empty_matrix()
         next_piece = self.GameInstanceStruct.queue.view_queue(idx = 0)
+        
+        if self.GameInstanceStruct.next_tetromino is not None and self.GameInstanceStruct.next_tetromino.type == next_piece: # the warning only changes with the next piece
+            return
+        
         self.GameInstanceStruct.next_tetromino =  Tetromino(next_piece, 0, self.spawn_pos.x, self.spawn_pos.y , self.FlagStruct, self.GameInstanceStruct)
-        self.GameInstanceStruct.matrix.insert_blocks(self.GameInstanceStruct.next_tetromino.blocks, self.GameInstanceStruct.next_tetromino.position, self.GameInstanceStruct.matrix.spawn_overlap)
+        self.GameInstanceStruct.matrix.set_spawn_overlap(self.GameInstanceStruct.next_tetromino.shape, self.GameInstanceStruct.next_tetromino.position.x, self.GameInstanceStruct.next_tetromino.position.y)
         
     def __event_danger(self, val:bool):
         """
@@ -565,6 +641,390 @@ class Four():
         else:
             self.FlagStruct.DANGER = False
     
+    # --------------------------------------------------- EVENT DRIVEN STEPPING ---------------------------------------------------
+    
+    def next_event_tick(self):
+        """
+        Get the number of ticks until the next tick that does more than count down timers: a queued action, a spawn, a gravity step,
+        the lock delay running out or the prevent accidental hard drop timeout. The ticks before it only increment counters,
+        so they can be skipped with skip_ticks.
+        
+        returns:
+            (int): The number of ticks until the next event, 1 for the next tick, math.inf if nothing will happen without input
+        """
+        if self.HandlingStruct.action_queue: # queued actions may be consumed on the next tick
+            return 1
+        
+        if self.FlagStruct.GAME_OVER:
+            return 1 if self.GameInstanceStruct.reset_on_top_out and self.GameInstanceStruct.reset else math.inf
+        
+        current_tetromino = self.GameInstanceStruct.current_tetromino
+        
+        if current_tetromino is None: # the next piece spawns
+            return 1
+        
+        next_event = math.inf
+        
+        if self.FlagStruct.DO_PREVENT_ACCIDENTAL_HARD_DROP:
+            timeout = int(self.HandlingConfig.HANDLING_SETTINGS['PrevAccHDTime']/60*self.Config.TPS)
+            next_event = max(1, timeout - self.HandlingStruct.PREV_ACC_HD_COUNTER)
+        
+        if current_tetromino.is_on_floor():
+            if self.GameInstanceStruct.lock_delay != 'inf':
+                if current_tetromino.max_moves_before_lock == 0:
+                    return 1
+                
+                next_event = min(next_event, max(1, self.__get_lock_delay_in_ticks() - current_tetromino.lock_delay_counter))
+        else:
+            G_units_in_ticks = self.__get_gravity_in_ticks()
+            
+            if G_units_in_ticks == 0: # instant gravity, or gravity every tick
+                return 1
+            
+            if G_units_in_ticks != 'inf':
+                next_event = min(next_event, max(1, G_units_in_ticks - self.GameInstanceStruct.gravity_counter + 1))
+        
+        return next_event
+    
+    def skip_ticks(self, ticks:int):
+        """
+        Perform a number of ticks at once, leaving the game exactly as ticking them one by one would.
+        Every skipped tick must come before the next event, see next_event_tick.
+        
+        args:
+            ticks (int): The number of ticks to skip
+        """
+        if ticks <= 0:
+            return
+        
+        next_event = self.next_event_tick()
+        
+        if ticks >= next_event:
+            raise ValueError(f"\033[31mInvalid number of ticks to skip provided!: {ticks}, the next event is in {next_event} ticks \033[31m\033[0m")
+        
+        self.actions_this_tick = []
+        self.GameInstanceStruct.ticks += ticks
+        
+        if self.FlagStruct.GAME_OVER:
+            return
+        
+        current_tetromino = self.GameInstanceStruct.current_tetromino
+        
+        if self.FlagStruct.DO_PREVENT_ACCIDENTAL_HARD_DROP:
+            self.HandlingStruct.PREV_ACC_HD_COUNTER += ticks
+        
+        on_floor = current_tetromino.is_on_floor()
+        
+        if on_floor:
+            self.GameInstanceStruct.gravity_counter = 0
+        else:
+            self.GameInstanceStruct.G_units_in_ticks = self.__get_gravity_in_ticks()
+            
+            if self.GameInstanceStruct.G_units_in_ticks != 'inf':
+                self.GameInstanceStruct.gravity_counter += ticks
+        
+        if self.GameInstanceStruct.lock_delay == 'inf':
+            self.GameInstanceStruct.lock_delay_in_ticks = 'inf'
+        else:
+            self.GameInstanceStruct.lock_delay_in_ticks = self.__get_lock_delay_in_ticks()
+            current_tetromino.lock_delay_counter = current_tetromino.lock_delay_counter + ticks if on_floor else 0
+        
+        self.GameInstanceStruct.lines_cleared, self.GameInstanceStruct.cleared_blocks, self.GameInstanceStruct.cleared_idxs = None, None, None
+    
+    def __get_gravity_in_ticks(self):
+        """
+        Get the number of ticks between gravity steps as __apply_gravity finds it, 0 for instant gravity and 'inf' for no gravity
+        """
+        G, soft_drop_factor = self.GameInstanceStruct.gravity, self.GameInstanceStruct.soft_drop_factor
+        
+        if soft_drop_factor == 'inf' or G == 20:
+            return 0
+        
+        if G == 0 and soft_drop_factor == 1:
+            return 'inf'
+        
+        if G == 0:
+            G = 1/60
+        
+        return int(self.Config.TPS/((G * soft_drop_factor) * 60))
+    
+    def __get_lock_delay_in_ticks(self):
+        """
+        Get the lock delay in ticks as __do_lock_delay finds it
+        """
+        return int(self.GameInstanceStruct.lock_delay/60 * self.Config.TPS)
+    
+    # --------------------------------------------------- SNAPSHOTS ---------------------------------------------------
+    
+    def snapshot(self):
+        """
+        Get an immutable record of the state of the game: the matrix, the current piece, the queue, the RNG, the flags and the counters.
+        Taking and restoring a snapshot is cheap enough to branch a game many times per move in a search.
+        
+        returns:
+            (Snapshot): The snapshot of the game
+        """
+        current_tetromino = self.GameInstanceStruct.current_tetromino
+        action_queue = getattr(self.HandlingStruct, 'action_queue', None)
+        
+        return Snapshot(
+            self.GameInstanceStruct.matrix.snapshot(),
+            None if current_tetromino is None else current_tetromino.snapshot(),
+            self.GameInstanceStruct.queue.snapshot(),
+            self.RNG.t,
+            tuple(self.FlagStruct.FLAGS.items()),
+            _get_game_instance_state(self.GameInstanceStruct),
+            _get_handling_state(self.HandlingStruct),
+            () if action_queue is None else tuple(action_queue),
+            self.TimingStruct.current_time,
+        )
+    
+    def restore(self, snapshot:Snapshot):
+        """
+        Put the game back to a snapshot taken from this game, a snapshot can be restored any number of times
+        
+        args:
+            snapshot (Snapshot): The snapshot to restore
+        """
+        self.GameInstanceStruct.matrix.restore(snapshot.matrix)
+        self.GameInstanceStruct.queue.restore(snapshot.queue)
+        self.RNG.t = snapshot.rng
+        self.FlagStruct.FLAGS.update(snapshot.flags)
+        
+        for name, value in zip(SNAPSHOT_GAME_INSTANCE_FIELDS, snapshot.game_instance):
+            setattr(self.GameInstanceStruct, name, value)
+        
+        for name, value in zip(SNAPSHOT_HANDLING_FIELDS, snapshot.handling):
+            setattr(self.HandlingStruct, name, value)
+        
+        if snapshot.current_tetromino is None:
+            self.GameInstanceStruct.current_tetromino = None
+        else:
+            if self.GameInstanceStruct.current_tetromino is None:
+                self.GameInstanceStruct.current_tetromino = Tetromino(snapshot.current_tetromino[0], 0, self.spawn_pos.x, self.spawn_pos.y, self.FlagStruct, self.GameInstanceStruct)
+            self.GameInstanceStruct.current_tetromino.restore(snapshot.current_tetromino)
+        
+        if getattr(self.HandlingStruct, 'action_queue', None) is not None:
+            self.HandlingStruct.action_queue.clear()
+            self.HandlingStruct.action_queue.extend(snapshot.action_queue)
+        
+        self.TimingStruct.current_time = snapshot.current_time
+    
+    # --------------------------------------------------- HASHING ---------------------------------------------------
+    
+    def state_hash(self):
+        """
+        Get a 64 bit Zobrist hash of the occupied cells, the type, rotation state and position of the current piece,
+        the held piece, whether the current piece can be held and the pieces in the queue previews.
+        
+        The matrix keeps the hash of its cells up to date as blocks lock and lines clear, the hash of the queue previews
+        is kept until a piece is taken from the queue, and the piece and hold are one key each, so this costs a few lookups.
+        
+        returns:
+            (int): The hash of the state
+        """
+        GameInstanceStruct = self.GameInstanceStruct
+        matrix = GameInstanceStruct.matrix
+        hold_keys, can_hold_key, queue_keys = get_state_keys()
+        
+        if self.__piece_keys is None:
+            self.__piece_keys = get_piece_keys(matrix.WIDTH, matrix.HEIGHT)
+        
+        state_hash = matrix.hash
+        current_tetromino = GameInstanceStruct.current_tetromino
+        
+        if current_tetromino is not None:
+            position = current_tetromino.position
+            state_hash ^= self.__piece_keys[PIECE_IDS[current_tetromino.type]][current_tetromino.state][position.y + PIECE_PADDING][position.x + PIECE_PADDING]
+        
+        held = GameInstanceStruct.held_tetromino
+        state_hash ^= hold_keys[0 if held is None else PIECE_IDS[held]]
+        
+        if GameInstanceStruct.can_hold:
+            state_hash ^= can_hold_key
+        
+        queue = GameInstanceStruct.queue
+        generation, queue_hash = self.__queue_hash
+        
+        if generation != queue.generation:
+            queue_hash = 0
+            for preview, piece_id in enumerate(queue.view_queue_ids(GameInstanceStruct.queue_previews)):
+                queue_hash ^= queue_keys[preview][piece_id]
+            self.__queue_hash = (queue.generation, queue_hash)
+        
+        return state_hash ^ queue_hash
+    
+    # --------------------------------------------------- PLACEMENTS ---------------------------------------------------
+    
+    def get_placements(self, use_hold:bool = True):
+        """
+        Get every position the current piece, and the piece hold would swap in, can be locked in.
+        A new game has no current piece until its first tick spawns one, so nothing is found before then.
+        
+        args:
+            use_hold (bool): Whether to include the placements of the piece hold would swap in
+        
+        returns:
+            (list): The Placements of the current piece followed by those of the hold piece, empty if there is no current piece
+        """
+        if self.GameInstanceStruct.current_tetromino is None:
+            return []
+        
+        placements = self.__get_piece_placements(hold = False)
+        
+        if use_hold:
+            placements.extend(self.__get_piece_placements(hold = True))
+        
+        return placements
+    
+    def __get_piece_placements(self, hold:bool):
+        """
+        Get every position the current piece, or the piece hold would swap in, can be locked in.
+        The placements of the last search of each are kept with the matrix version and the piece they were found for,
+        so asking again before the piece moves or the matrix changes (as place does after get_placements) does not search again.
+        
+        args:
+            hold (bool): Whether to get the placements of the piece hold would swap in, none if it cannot be swapped in
+        
+        returns:
+            (list): The Placements, a new list that can be changed by the caller
+        """
+        GameInstanceStruct = self.GameInstanceStruct
+        
+        if not hold:
+            current_tetromino = GameInstanceStruct.current_tetromino
+            piece, x, y, state = current_tetromino.type, current_tetromino.position.x, current_tetromino.position.y, current_tetromino.state
+            
+            if self.FlagStruct.IS_SPIN == piece:
+                spin = MINI_SPIN if self.FlagStruct.IS_MINI is True else FULL_SPIN
+            else:
+                spin = NO_SPIN
+        else:
+            if not (GameInstanceStruct.hold and GameInstanceStruct.can_hold):
+                return []
+            
+            piece = GameInstanceStruct.held_tetromino
+            
+            if piece is None:
+                piece = GameInstanceStruct.queue.view_queue(idx = 0)
+            
+            x, y = get_spawn_origin(piece, self.spawn_pos.x, self.spawn_pos.y)
+            state, spin = 0, NO_SPIN
+        
+        key = (GameInstanceStruct.matrix.version, piece, x, y, state, spin, GameInstanceStruct.rotation_system_type, GameInstanceStruct.allowed_spins)
+        cached_key, placements = self.__placements[hold]
+        
+        if cached_key != key:
+            placements = generate_placements(GameInstanceStruct.matrix, piece, GameInstanceStruct.rotation_system_type, x, y, state, GameInstanceStruct.allowed_spins, hold, spin)
+            self.__placements[hold] = (key, placements)
+        
+        return list(placements)
+    
+    def place(self, piece:str, x:int, rotation:int, use_hold:bool = False, y:int = None, spin = None):
+        """
+        Lock a piece in one of the positions the move generator finds for it, then clear lines and spawn the next piece, in one call.
+        The position is checked against get_placements, but no tick is performed: gravity, lock delay and the other timers do not move.
+        Positions of the S, Z and I pieces in opposite rotation states that fill the same cells are the same placement.
+        There must be a current piece, a new game only has one after its first tick (HeadlessFour.step()).
+        
+        args:
+            piece (str): The type of the piece, the current piece or with use_hold the piece hold swaps in
+            x (int): The x position of the piece
+            rotation (int): The rotation state of the piece
+            use_hold (bool): Whether to hold first and place the piece that is swapped in
+            y (int): The y position of the piece, the highest position at x the piece can lock in (where a hard drop lands) if not provided
+            spin (str or bool): The spin of the placement as Placement.spin, the first placement found if not provided (no spin if the position can be reached without one)
+        
+        returns:
+            (PlaceResult): The lines cleared, the spin and whether the game is over
+        """
+        if self.FlagStruct.GAME_OVER or self.GameInstanceStruct.current_tetromino is None:
+            raise ValueError(f"\033[31mInvalid state to place a piece in provided!: there is no current piece \033[31m\033[0m")
+        
+        if self.recorder is not None: # a replay only holds actions, a placement would be missing from it
+            raise ValueError(f"\033[31mInvalid state to place a piece in provided!: the game is being recorded \033[31m\033[0m")
+        
+        shape = SHAPES[piece][rotation]
+        cells = (CANONICAL_STATES[piece][rotation], x + shape.min_x)
+        placement = None
+        
+        for candidate in self.__get_piece_placements(use_hold):
+            candidate_shape = SHAPES[candidate.type][candidate.state]
+            
+            if candidate.type != piece or (CANONICAL_STATES[piece][candidate.state], candidate.x + candidate_shape.min_x) != cells:
+                continue
+            
+            if spin is not None and candidate.spin != spin:
+                continue
+            
+            if y is None:
+                if placement is None or candidate.y + candidate_shape.min_y < placement.y + SHAPES[piece][placement.state].min_y:
+                    placement = candidate
+                continue
+            
+            if candidate.y + candidate_shape.min_y == y + shape.min_y:
+                placement = candidate
+                break
+        
+        if placement is None:
+            raise ValueError(f"\033[31mInvalid placement provided!: {piece} at x {x}, y {y}, rotation {rotation}, hold {use_hold} \033[31m\033[0m")
+        
+        if use_hold:
+            self.__hold()
+            
+            if self.GameInstanceStruct.current_tetromino is None: # the swapped in piece could not spawn
+                return PlaceResult(0, False, False, self.FlagStruct.GAME_OVER)
+        
+        current_tetromino = self.GameInstanceStruct.current_tetromino
+        current_tetromino.restore((placement.type, placement.state, placement.x, placement.y, placement.x, placement.y, current_tetromino.lowest_pivot_position, 0, current_tetromino.max_moves_before_lock))
+        self.FlagStruct.IS_SPIN, self.FlagStruct.IS_MINI = placement.spin, placement.mini
+        self.actions_this_tick = []
+        
+        self.__lock()
+        self.__clear_lines()
+        lines_cleared = self.GameInstanceStruct.lines_cleared or 0
+        
+        if not self.FlagStruct.GAME_OVER:
+            self.__get_next_piece(hold = False)
+        
+        self.__do_block_out_warning()
+        self.__update_current_tetromino()
+        self.GameInstanceStruct.gravity_counter = 0
+        
+        return PlaceResult(lines_cleared, placement.spin, placement.mini, self.FlagStruct.GAME_OVER)
+    
+    # --------------------------------------------------- REPLAYS ---------------------------------------------------
+    
+    def start_recording(self, keyframe_interval:int = None, writer = None):
+        """
+        Start recording the settings of the game and the actions performed on each tick, which is enough to play the game again exactly,
+        along with keyframes of the state of the game to seek from. The game must not have been ticked yet.
+        
+        args:
+            keyframe_interval (int): The number of pieces between keyframes, 0 for no keyframes, instance.replay.KEYFRAME_INTERVAL if not provided
+            writer (BackgroundWriter): The writer to stream the replay to as it is recorded, see core.writer
+        """
+        from instance.replay import ReplayHeader, ReplayRecorder, KEYFRAME_INTERVAL # instance.replay plays replays back with HeadlessFour, which imports this module
+        
+        if self.GameInstanceStruct.ticks != 0:
+            raise ValueError(f"\033[31mInvalid tick to start recording provided!: {self.GameInstanceStruct.ticks}, recording must start before the first tick \033[31m\033[0m")
+        
+        self.recorder = ReplayRecorder(ReplayHeader.from_four(self), KEYFRAME_INTERVAL if keyframe_interval is None else keyframe_interval, writer)
+    
+    def stop_recording(self):
+        """
+        Stop recording the game, a replay streamed to a writer is ended but the writer is left open
+        
+        returns:
+            (Replay): The replay of the game up to the current tick, None if the game was not being recorded
+        """
+        if self.recorder is None:
+            return None
+        
+        replay = self.recorder.finish(self.GameInstanceStruct.ticks)
+        self.recorder = None
+        return replay
+    
     def reset_flags(self):
         self.FlagStruct.IS_SPIN = False
         self.FlagStruct_IS_MINI = False
@@ -574,11 +1034,37 @@ class Four():
         self.FlagStruct.GAME_OVER = False
         self.GameInstanceStruct.reset = False
        
+def get_batch_draws(randomiser:str):
+    """
+    Get the number of pieces a randomiser adds at a time and the number of random numbers it draws for them
+    
+    args:
+        randomiser (str): The randomiser type
+    
+    returns:
+        (tuple): The batch size and the draws per batch, None for the classic randomiser, which rerolls a varying number of times
+    """
+    match randomiser:
+        case '7BAG':
+            return 7, 6 # one draw per swap of the Fisher–Yates shuffle
+        case '14BAG':
+            return 14, 13
+        case 'PAIRS':
+            return 6, 6 + 5 # a shuffle of the 7 tetrominos then a shuffle of the 6 pieces
+        case 'RANDOM':
+            return 1, 1
+        case _:
+            return None
+
 class Queue():
     def __init__(self, RNG, randomiser = '7BAG'):
         """
         Queue of next tetrominos
         
+        The pieces are kept as piece ids in a fixed capacity ring buffer, so taking the next piece and viewing any piece in the queue
+        never moves the rest of the queue. The queue is refilled a whole bag (or batch) at a time once it runs low.
+        The generation increases every time a piece is taken or the queue is restored, so it can be compared instead of the pieces.
+        
         args:
             rng (RNG): The random number generator to use
             randomiser (str): The randomiser type to use
@@ -591,11 +1077,45 @@ class Queue():
         else:
             self.tetrominos = ["Z", "L", "O", "S", "I", "J", "T"]
         
+        self.piece_ids = [PIECE_IDS[tetromino] for tetromino in self.tetrominos]
         self.length = len(self.tetrominos) * 3
         self.last_generated = None
         
-        self.queue = []
+        self.__buffer = [0] * (1 << (self.length + len(self.tetrominos)).bit_length()) # holds a full queue and the largest batch a randomiser adds
+        self.__mask = len(self.__buffer) - 1
+        self.__head = 0 # the index of the next piece in the buffer
+        self.size = 0
+        self.generation = 0
+        self.__start_state = self.RNG.t # the state of the RNG before the first piece, where seeking counts from
         self.get_queue()
+    
+    @property
+    def queue(self):
+        """
+        The pieces in the queue in order, built on each access
+        """
+        return [ID_TYPES[self.__buffer[(self.__head + idx) & self.__mask]] for idx in range(self.size)]
+    
+    def __push(self, piece_id:int):
+        """
+        Add a piece to the end of the queue
+        
+        args:
+            piece_id (int): The id of the piece
+        """
+        self.__buffer[(self.__head + self.size) & self.__mask] = piece_id
+        self.size += 1
+    
+    def __extend(self, piece_ids:list):
+        """
+        Add pieces to the end of the queue
+        
+        args:
+            piece_ids (list): The ids of the pieces
+        """
+        for piece_id in piece_ids:
+            self.__buffer[(self.__head + self.size) & self.__mask] = piece_id
+            self.size += 1
 
     def get_queue(self):
         """
@@ -617,8 +1137,13 @@ class Queue():
         """
         Get the next piece from the queue and refill the queue as necessary.
         """
-        next_piece = self.queue.pop(0)
-        self.get_queue()
+        next_piece = ID_TYPES[self.__buffer[self.__head]]
+        self.__head = (self.__head + 1) & self.__mask
+        self.size -= 1
+        self.generation += 1
+        
+        if self.size <= self.length: # every randomiser tops the queue up past its length
+            self.get_queue()
             
         return next_piece
     
@@ -626,9 +1151,76 @@ class Queue():
         """
         See the next piece in the queue without removing it.
         """
-        if idx < 0 or idx >= len(self.queue):
+        if idx < 0 or idx >= self.size:
             return None
-        return self.queue[idx]
+        return ID_TYPES[self.__buffer[(self.__head + idx) & self.__mask]]
+    
+    def view_queue_ids(self, count:int):
+        """
+        See the ids of the next pieces in the queue without removing them, see PIECE_IDS
+        
+        args:
+            count (int): The number of pieces, fewer are returned if the queue is shorter
+        """
+        return [self.__buffer[(self.__head + idx) & self.__mask] for idx in range(min(count, self.size))]
+    
+    def seek(self, piece_index:int):
+        """
+        Position the queue so that the next piece is the piece at an index of the sequence, without generating the pieces before it.
+        
+        The bag and pairs randomisers draw the same number of random numbers for every bag (or batch) and the random randomiser one per piece,
+        so the RNG is jumped straight to the start of the bag holding the piece in O(log n). The queue and RNG end up exactly as if the pieces
+        before the index had been taken one by one. The classic randomiser rerolls, so it cannot seek.
+        
+        args:
+            piece_index (int): The index of the piece in the sequence, 0 for the first piece
+        """
+        if piece_index < 0:
+            raise ValueError(f"\033[31mInvalid piece index provided!: {piece_index} \033[31m\033[0m")
+        
+        batch_draws = get_batch_draws(self.randomiser)
+        
+        if batch_draws is None:
+            raise ValueError(f"\033[31mInvalid randomiser provided for seeking!: {self.randomiser} \033[31m\033[0m")
+        
+        batch_size, batch_draws = batch_draws
+        batch, skipped = divmod(piece_index, batch_size)
+        self.RNG.t = self.__start_state
+        self.RNG.jump(batch * batch_draws)
+        
+        self.__head, self.size = 0, 0
+        self.get_queue()
+        self.__head, self.size = skipped, self.size - skipped
+        self.get_queue()
+        self.generation += 1
+    
+    def snapshot(self):
+        """
+        Get an immutable record of the queue
+        
+        returns:
+            (tuple): The ids of the pieces in the queue and the last piece index generated by the classic randomiser
+        """
+        end = self.__head + self.size
+        
+        if end <= len(self.__buffer):
+            pieces = tuple(self.__buffer[self.__head:end])
+        else: # the queue wraps around the end of the buffer
+            pieces = tuple(self.__buffer[self.__head:] + self.__buffer[:end & self.__mask])
+        
+        return (pieces, self.last_generated)
+    
+    def restore(self, snapshot:tuple):
+        """
+        Put the queue back to a snapshot, as a new generation of the queue
+        
+        args:
+            snapshot (tuple): A snapshot taken by snapshot()
+        """
+        self.__head, self.size = 0, len(snapshot[0])
+        self.__buffer[:self.size] = snapshot[0]
+        self.last_generated = snapshot[1]
+        self.generation += 1
     
     def bag_randomiser(self):
         """
@@ -637,8 +1229,8 @@ class Queue():
         
         The 14-bag randomization system is a variant of the 7-bag system with less of a guarantee against droughts.
         """
-        while len(self.queue) <= self.length: 
-            self.queue.extend(self.RNG.shuffle_array(self.tetrominos.copy())) 
+        while self.size <= self.length: 
+            self.__extend(self.RNG.shuffle_array(self.piece_ids.copy())) 
     
     def classic_randomiser(self):
         """
@@ -647,29 +1239,29 @@ class Queue():
         representing a reroll. If a reroll or the same tetromino that was previously generated is rolled, 
         then the randomizer selects randomly from the tetrominos.
         """
-        while len(self.queue) <= self.length:
+        while self.size <= self.length:
                 index = math.floor(self.RNG.next_float() * (len(self.tetrominos) + 1))
                 if index == self.last_generated or index >= len(self.tetrominos):
                     index = math.floor(self.RNG.next_float() * len(self.tetrominos))
                 self.last_generated = index
-                self.queue.append(self.tetrominos[index]) 
+                self.__push(self.piece_ids[index]) 
     
     def pairs_randomiser(self):
         """
         This randomizer picks pairs of tetromino types and gives three of each in a random order.
         """
-        while len(self.queue) <= self.length:
-                s = self.RNG.shuffle_array(self.tetrominos.copy())
+        while self.size <= self.length:
+                s = self.RNG.shuffle_array(self.piece_ids.copy())
                 pairs = [s[0], s[0], s[0], s[1], s[1], s[1]]
-                self.queue.extend(self.RNG.shuffle_array(pairs))
+                self.__extend(self.RNG.shuffle_array(pairs))
                
     def random_randomiser(self):
         """
         This randomizer is entirely random.
         """
-        while len(self.queue) < self.length:
+        while self.size < self.length:
                 index = math.floor(self.RNG.next_float() * len(self.tetrominos))
-                self.queue.append(self.tetrominos[index])
+                self.__push(self.piece_ids[index])
 
 class RNG:
     def __init__(self, seed):
@@ -705,6 +1297,16 @@ class RNG:
             float: A pseudorandom floating-point number between 0 and 1.
         """
         return (self.next() - 1) / 2147483646
+    
+    def jump(self, steps:int):
+        """
+        Advance the internal state as if next() had been called a number of times, in O(log n) with modular exponentiation.
+        A negative number of steps moves the state back.
+        
+        args:
+            steps (int): The number of steps to advance
+        """
+        self.t = (pow(16807, steps, 2147483647) * self.t) % 2147483647
 
     def shuffle_array(self, array):
         """
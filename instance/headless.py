@@ -0,0 +1,123 @@
+from collections import deque
+from config import StructConfig
+from core.clock import VirtualClock
+from core.state.struct_flags import StructFlags, set_flag_attr
+from core.state.struct_gameinstance import StructGameInstance
+from core.state.struct_handling import StructHandling
+from core.state.struct_timing import StructTiming
+from input.handling.action import Action
+from input.handling.handling_settings import HandlingSettings
+from instance.four import Four, Queue, RNG
+from instance.matrix import Matrix, BitboardMatrix
+from instance.rotation import RotationSystem, compile_kick_table
+from instance.tetromino import Tetromino
+
+__all__ = ['HeadlessFour', 'Four', 'Queue', 'RNG', 'Matrix', 'BitboardMatrix', 'Tetromino', 'RotationSystem', 'compile_kick_table', 'Action', 'HandlingSettings']
+
+class HeadlessFour(Four):
+    def __init__(self, matrix_width = 10, matrix_height = 20, rotation_system:str = 'SRS', randomiser = '7BAG', queue_previews = 5, seed = 0, hold = True, allowed_spins = 'ALL-MINI', lock_out_ok = True, top_out_ok = False, reset_on_top_out = False, matrix_backend:str = 'BITBOARD', HandlingConfig = None):
+        """
+        An instance of the game Four that owns its state structs and is stepped directly,
+        without pygame, a window, fonts or the Core loops. Nothing imported by this module touches pygame or SDL.
+        The game time is kept by a VirtualClock in ticks, so it runs as fast as it is stepped.
+        The first piece spawns on the first tick, so step a new game once before get_placements or place.
+
+        args:
+            matrix_width (int): The width of the matrix
+            matrix_height (int): The visible height of the matrix
+            rotation_system (str): The rotation system to use
+            randomiser (str): The randomiser type to use
+            queue_previews (int): The number of queue previews
+            seed (int): The seed of the piece sequence
+            hold (bool): Whether hold is enabled
+            allowed_spins (str): The spin ruleset
+            lock_out_ok (bool): Whether locking out is allowed
+            top_out_ok (bool): Whether topping out is allowed
+            reset_on_top_out (bool): Whether to reset the game on top out
+            matrix_backend (str): The matrix representation to use: ['LIST', 'BITBOARD']
+            HandlingConfig (HandlingSettings): The handling settings, defaults are used if not provided
+
+        methods:
+            queue_action(action): Queue an action to be performed on the next tick
+            step(actions): Queue the actions and perform one tick
+            skip_ticks(ticks): Perform a number of ticks that only count down timers at once
+            run(ticks, skip_idle): Perform a number of ticks with no new actions
+            restore(snapshot): Put the game and its clock back to a snapshot
+        """
+        set_flag_attr()
+
+        if HandlingConfig is None:
+            HandlingConfig = HandlingSettings()
+
+        super().__init__(StructConfig(), StructFlags(), StructGameInstance(), StructTiming(), StructHandling(), HandlingConfig,
+                         matrix_width = matrix_width, matrix_height = matrix_height, rotation_system = rotation_system, randomiser = randomiser,
+                         queue_previews = queue_previews, seed = seed, hold = hold, allowed_spins = allowed_spins,
+                         lock_out_ok = lock_out_ok, top_out_ok = top_out_ok, reset_on_top_out = reset_on_top_out, matrix_backend = matrix_backend)
+
+        self.HandlingStruct.action_queue = deque()
+        self.clock = VirtualClock()
+        self.TimingStruct.clock = self.clock
+
+    def queue_action(self, action:Action):
+        """
+        Queue an action to be performed on the next tick
+
+        args:
+            action (Action): The action to perform
+        """
+        self.HandlingStruct.action_queue.append({'action': action, 'timestamp': self.TimingStruct.current_time})
+
+    def step(self, actions = ()):
+        """
+        Queue the actions and perform one tick of the game
+
+        args:
+            actions (iterable): The actions to perform this tick
+        """
+        for action in actions:
+            self.queue_action(action)
+
+        self.tick()
+        self.clock.advance()
+        self.TimingStruct.current_time = self.clock.now()
+
+    def skip_ticks(self, ticks:int):
+        """
+        Perform a number of ticks before the next event at once, see Four.next_event_tick
+
+        args:
+            ticks (int): The number of ticks to skip
+        """
+        super().skip_ticks(ticks)
+        self.clock.advance(ticks)
+        self.TimingStruct.current_time = self.clock.now()
+
+    def run(self, ticks:int, skip_idle:bool = True):
+        """
+        Perform a number of ticks with no new actions
+
+        args:
+            ticks (int): The number of ticks to perform
+            skip_idle (bool): Whether to skip the ticks between events at once instead of performing them one by one, the game ends up the same
+        """
+        while ticks > 0:
+            if skip_idle:
+                idle_ticks = min(self.next_event_tick() - 1, ticks)
+
+                if idle_ticks > 0:
+                    self.skip_ticks(idle_ticks)
+                    ticks -= idle_ticks
+                    continue
+
+            self.step()
+            ticks -= 1
+
+    def restore(self, snapshot):
+        """
+        Put the game and its clock back to a snapshot
+
+        args:
+            snapshot (Snapshot): The snapshot to restore
+        """
+        super().restore(snapshot)
+        self.clock.ticks = snapshot.current_time
@@ -0,0 +1,440 @@
+from dataclasses import dataclass, field
+from input.handling.action import Action
+from instance.matrix import Matrix, BitboardMatrix
+from instance.pieces import PIECE_TYPES, SHAPES
+from instance.rotation import compile_kick_table
+from instance.tetromino import T_CORNER_PAIRS, T_CORNERS
+
+# spin classifications of a piece, as the IS_SPIN and IS_MINI flags set by Tetromino.rotate
+NO_SPIN = 0
+MINI_SPIN = 1
+FULL_SPIN = 2
+
+ROTATIONS = (
+    (Action.ROTATE_CLOCKWISE, 1),
+    (Action.ROTATE_COUNTERCLOCKWISE, 3),
+    (Action.ROTATE_180, 2),
+)
+
+# bit x + PAD of a position mask is set if the piece is at x, so positions left of the matrix can be shifted without being lost
+PAD = 8
+
+def _build_cell_rows():
+    """
+    Get the x offsets of the cells in each occupied row of each rotation state of each piece, as (y, (x, ...)) pairs
+    """
+    return {
+        type: tuple(
+            tuple((cell_y, tuple(x for x in range(shape.size) if mask >> x & 1)) for cell_y, mask in shape.row_masks)
+            for shape in SHAPES[type]
+        )
+        for type in PIECE_TYPES
+    }
+
+def _build_canonical_states():
+    """
+    Map each rotation state of each piece to the lowest rotation state that covers the same cells up to a translation,
+    so that placements of the S, Z and I pieces in opposite states that fill the same cells are only listed once
+    """
+    canonical = {}
+
+    for type in PIECE_TYPES:
+        normalised = [
+            frozenset((x - shape.min_x, y - shape.min_y) for x, y in shape.cells)
+            for shape in SHAPES[type]
+        ]
+        canonical[type] = tuple(normalised.index(cells) for cells in normalised)
+
+    return canonical
+
+CELL_ROWS = _build_cell_rows()
+CANONICAL_STATES = _build_canonical_states()
+
+_KICK_REACH = {} # rotation system -> the furthest any of its kicks moves a piece
+
+def get_kick_reach(rotation_system:str):
+    """
+    Get the furthest any kick of a rotation system moves a piece along either axis
+
+    args:
+        rotation_system (str): The type of rotation system
+    """
+    try:
+        return _KICK_REACH[rotation_system]
+    except KeyError:
+        kick_table = compile_kick_table(rotation_system)
+        _KICK_REACH[rotation_system] = max((max(abs(kick_x), abs(kick_y)) for kicks in kick_table for kick_x, kick_y in kicks), default = 0)
+        return _KICK_REACH[rotation_system]
+
+@dataclass(frozen = True, slots = True)
+class Placement():
+    """
+    A position a piece can be locked in and the inputs that lock it there
+
+    attributes:
+        type (str): The type of the piece
+        state (int): The rotation state of the piece when it locks
+        x (int): The x position of the piece when it locks
+        y (int): The y position of the piece when it locks
+        spin (str or bool): The type of the piece if the lock is a spin, False otherwise, as Flags.IS_SPIN
+        mini (bool): Whether the spin is a mini, as Flags.IS_MINI
+        hold (bool): Whether the piece is swapped in from the hold slot first
+        path (tuple): The actions that lock the piece in this position, ending with a hard drop. Each soft drop moves the piece down one row.
+                      The path is traced back through the search when it is read, as most placements of a search are never played
+    """
+    type: str
+    state: int
+    x: int
+    y: int
+    spin: str | bool
+    mini: bool
+    hold: bool
+    trace: tuple = field(repr = False, compare = False) # the arguments of _trace_path
+
+    @property
+    def path(self):
+        return _trace_path(*self.trace)
+
+def get_spawn_origin(type:str, x:int, y:int):
+    """
+    Get the origin a piece spawned at the spawn position is placed at, as Tetromino.__get_origin
+
+    args:
+        type (str): The type of the piece
+        x (int): The x spawn position
+        y (int): The y spawn position
+    """
+    return (x, y - 1) if type == 'O' else (x - 1, y - 1)
+
+def get_row_masks(matrix:Matrix):
+    """
+    Get the placed blocks of each row of the matrix as a bitmask, bit x is set if column x is occupied
+
+    args:
+        matrix (Matrix): The matrix to read
+    """
+    if isinstance(matrix, BitboardMatrix):
+        return matrix.rows
+
+    return [sum(1 << x for x, cell in enumerate(row) if cell != 0) for row in matrix.matrix]
+
+def get_fit_rows(rows:list, type:str, width:int, highest_row:int, reach:int):
+    """
+    Get the mask of the x positions a piece fits at in every row, as Matrix.collision, for each rotation state of the piece.
+
+    The masks of a state are a list indexed by y, so the search reads them without a call. The rows past the bottom of the matrix
+    are followed by the rows above its top, so negative y reads them from the end of the list: a piece that fits is at most
+    3 rows above the top and a kick moves it at most reach rows further, so reach + 4 rows either side are enough.
+    Every row the piece's blocks are above the stack in fits wherever the walls allow, so only the rows reaching the stack are tested.
+
+    args:
+        rows (list): The row bitmasks of the matrix
+        type (str): The type of the piece
+        width (int): The width of the matrix
+        highest_row (int): The highest occupied row of the matrix
+        reach (int): The furthest any kick moves the piece
+
+    returns:
+        (tuple): The list of masks of each rotation state
+    """
+    height = len(rows)
+    in_bounds = (1 << (PAD + width)) - 1
+    walls = ((1 << PAD) - 1) | ((1 << PAD) - 1) << (PAD + width)
+    walled_rows = [row << PAD | walls for row in rows]
+    ys = [*range(height + reach + 4), *range(-reach - 4, 0)]
+    fit_rows = []
+
+    for cells in CELL_ROWS[type]:
+        top, bottom = cells[0][0], cells[-1][0]
+        open_mask = in_bounds
+
+        for _, cell_xs in cells:
+            for cell_x in cell_xs:
+                open_mask &= ~(walls >> cell_x)
+
+        masks = []
+
+        for y in ys:
+            if y + top <= 0 or y + bottom >= height:
+                masks.append(0)
+            elif y + bottom < highest_row:
+                masks.append(open_mask)
+            else:
+                collisions = 0
+
+                for cell_y, cell_xs in cells:
+                    row = walled_rows[y + cell_y]
+
+                    for cell_x in cell_xs:
+                        collisions |= row >> cell_x
+
+                masks.append(~collisions & in_bounds)
+
+        fit_rows.append(masks)
+
+    return tuple(fit_rows)
+
+def generate_placements(matrix:Matrix, type:str, rotation_system:str, x:int, y:int, state:int = 0, allowed_spins:str = 'ALL-MINI', hold:bool = False, spin:int = NO_SPIN):
+    """
+    Find every position a piece can be locked in from its current position.
+
+    The positions reachable by moving one column, soft dropping one row and rotating (with the kicks of the rotation system) are
+    flood filled breadth first. Positions are kept as one bitmask of x positions per rotation state, row and spin classification,
+    so each move, drop and kick is tested for a whole row of positions at once against the masks of get_fit_rows. Rows further above
+    the highest block than any kick can move the piece all behave the same, so the piece is soft dropped through them at once. Rotations that land on the floor are
+    classified as Tetromino.rotate would, and those positions are kept apart with their spin until the piece moves again.
+    Placements that fill the same cells with the same spin are only listed once.
+
+    args:
+        matrix (Matrix): The matrix the piece is in
+        type (str): The type of the piece
+        rotation_system (str): The type of rotation system
+        x (int): The x position of the piece
+        y (int): The y position of the piece
+        state (int): The rotation state of the piece
+        allowed_spins (str): The spin ruleset
+        hold (bool): Whether the piece is swapped in from the hold slot, the paths start with a hold
+        spin (int): The spin classification of the piece at its current position: [NO_SPIN, MINI_SPIN, FULL_SPIN]
+
+    returns:
+        (list): The Placements, an empty list if the piece collides at its current position
+    """
+    shapes = SHAPES[type]
+    canonical_states = CANONICAL_STATES[type]
+    kick_table = compile_kick_table(rotation_system)
+    reach_rows = get_kick_reach(rotation_system)
+    rows = get_row_masks(matrix)
+    width, height = matrix.WIDTH, matrix.HEIGHT
+    can_spin = type == 'T' or allowed_spins != 'T-SPIN'
+    fit_rows = get_fit_rows(rows, type, width, matrix.highest_row, reach_rows)
+
+    def classify(state, x, y, offset):
+        """
+        Classify a successful rotation onto the floor as Tetromino.rotate does: T pieces with the 3 corner rule and the other pieces with the immobility test
+        """
+        if allowed_spins == 'STUPID': # anything is a spin if the piece is on the floor at the end of the rotation
+            return FULL_SPIN
+
+        spin = NO_SPIN
+
+        if type == 'T':
+            facing_corners = count_filled_corners(rows, T_CORNER_PAIRS[state], x, y, width, height)
+
+            if facing_corners == 1:
+                if count_filled_corners(rows, T_CORNER_PAIRS[(state + 2) % 4], x, y, width, height) > 1:
+                    spin = FULL_SPIN if offset == 4 else MINI_SPIN
+
+            elif facing_corners == 2:
+                if count_filled_corners(rows, T_CORNERS, x, y, width, height) >= 3:
+                    spin = FULL_SPIN
+
+        elif allowed_spins != 'T-SPIN':
+            bit = x + PAD
+
+            if not (fit_rows[state][y] >> (bit - 1) & 0b101 or fit_rows[state][y - 1] >> bit & 1): # on the floor, so it cannot move down either
+                spin = MINI_SPIN if allowed_spins == 'ALL-MINI' else FULL_SPIN
+
+        return spin
+
+    start_bit = 1 << (x + PAD)
+
+    if not fit_rows[state][y] & start_bit:
+        return []
+
+    open_rows = matrix.highest_row - reach_rows - 1 - max(shape.max_y for shape in shapes) # rows above this are out of reach of the blocks
+
+    reached = {(state, y, spin): start_bit} # (state, y, spin) -> mask of the positions reached
+    origins = {} # (state, y, spin) -> [(mask, action, dx, dy, source state, source spin)], how each position was first reached
+    pending = {(state, y, spin): start_bit} # positions reached but not expanded yet, in the order they were first reached
+    locks = {}
+
+    def reach(state, y, spin, mask, action, dx, dy, source_state, source_spin):
+        key = (state, y, spin)
+        previous = reached.get(key, 0)
+        mask &= ~previous
+
+        if mask:
+            reached[key] = previous | mask
+            origins.setdefault(key, []).append((mask, action, dx, dy, source_state, source_spin))
+            pending[key] = pending.get(key, 0) | mask
+
+    while pending:
+        key = next(iter(pending))
+        mask = pending.pop(key)
+        state, y, spin = key
+        shape = shapes[state]
+        fits = fit_rows[state]
+        fitted = fits[y]
+        below = fits[y + 1]
+
+        if spin == NO_SPIN: # slide along the row as far as the piece can move
+            row = reached[key]
+            moved = mask
+
+            while moved:
+                moved_left = moved >> 1 & fitted & ~row
+                moved_right = moved << 1 & fitted & ~row
+
+                if moved_left:
+                    origins.setdefault(key, []).append((moved_left, Action.MOVE_LEFT, -1, 0, state, NO_SPIN))
+                if moved_right:
+                    origins.setdefault(key, []).append((moved_right, Action.MOVE_RIGHT, 1, 0, state, NO_SPIN))
+
+                moved = moved_left | moved_right
+                row |= moved
+                mask |= moved
+
+            reached[key] = row
+        else:
+            reach(state, y, NO_SPIN, mask >> 1 & fitted, Action.MOVE_LEFT, -1, 0, state, spin)
+            reach(state, y, NO_SPIN, mask << 1 & fitted, Action.MOVE_RIGHT, 1, 0, state, spin)
+
+        on_floor = mask & ~below
+
+        while on_floor:
+            low_bit = on_floor & -on_floor
+            on_floor ^= low_bit
+            lock_x = low_bit.bit_length() - 1 - PAD
+            lock_key = (canonical_states[state], lock_x + shape.min_x, y + shape.min_y, spin)
+
+            if lock_key not in locks:
+                locks[lock_key] = (lock_x, y, state, spin)
+
+        dropped = mask & below
+        if dropped:
+            if reach_rows < y < open_rows - 2: # fall through the open rows to the last of them
+                reach(state, open_rows - 1, NO_SPIN, dropped & fits[open_rows - 1], Action.SOFT_DROP, 0, open_rows - 1 - y, state, spin)
+            else:
+                reach(state, y + 1, NO_SPIN, dropped, Action.SOFT_DROP, 0, 1, state, spin)
+
+        for action, rotation in ROTATIONS:
+            desired_state = (state + rotation) % 4
+            desired_fits = fit_rows[desired_state]
+            remaining = mask
+
+            for offset, (kick_x, kick_y) in enumerate(kick_table[(shape.id * 4 + state) * 4 + desired_state]):
+                kicked = (remaining << kick_x if kick_x >= 0 else remaining >> -kick_x) & desired_fits[y + kick_y]
+
+                if not kicked:
+                    continue
+
+                remaining &= ~(kicked >> kick_x if kick_x >= 0 else kicked << -kick_x)
+
+                if can_spin: # a spin is only kept if the piece locks without moving again, so only rotations onto the floor are classified
+                    landed = kicked & ~desired_fits[y + kick_y + 1]
+
+                    while landed:
+                        low_bit = landed & -landed
+                        landed ^= low_bit
+                        rotation_spin = classify(desired_state, low_bit.bit_length() - 1 - PAD, y + kick_y, offset)
+
+                        if rotation_spin != NO_SPIN:
+                            kicked ^= low_bit
+                            reach(desired_state, y + kick_y, rotation_spin, low_bit, action, kick_x, kick_y, state, spin)
+
+                if kicked: # as reach, inlined since most kicks only land on positions that were already reached
+                    kicked_key = (desired_state, y + kick_y, NO_SPIN)
+                    previous = reached.get(kicked_key, 0)
+                    kicked &= ~previous
+
+                    if kicked:
+                        reached[kicked_key] = previous | kicked
+                        origins.setdefault(kicked_key, []).append((kicked, action, kick_x, kick_y, state, spin))
+                        pending[kicked_key] = pending.get(kicked_key, 0) | kicked
+
+                if not remaining:
+                    break
+
+            if remaining and spin != NO_SPIN: # a failed rotation still resets the spin flags
+                reach(state, y, NO_SPIN, remaining, action, 0, 0, state, spin)
+
+    return [
+        Placement(type, lock_state, lock_x, lock_y, type if lock_spin else False, lock_spin == MINI_SPIN, hold, (origins, fit_rows, hold, lock_x, lock_y, lock_state, lock_spin))
+        for lock_x, lock_y, lock_state, lock_spin in locks.values()
+    ]
+
+def _trace_path(origins:dict, fit_rows:tuple, hold:bool, x:int, y:int, state:int, spin:int):
+    """
+    Follow how a position was first reached back to the start and return the actions that lead to it, ending with a hard drop.
+    Soft drops onto the floor are replaced by a sonic drop and soft drops just before the hard drop are left out.
+
+    args:
+        origins (dict): How each position was first reached
+        fit_rows (tuple): The masks of the x positions the piece fits at in each row, from get_fit_rows
+        hold (bool): Whether the piece is swapped in from the hold slot first
+        x (int): The x position of the piece
+        y (int): The y position of the piece
+        state (int): The rotation state of the piece
+        spin (int): The spin classification of the piece
+    """
+    actions, nodes = [], [(x, y, state)]
+
+    while True:
+        bit = x + PAD
+
+        for mask, action, dx, dy, source_state, source_spin in origins.get((state, y, spin), ()):
+            if mask >> bit & 1:
+                break
+        else: # the start position
+            break
+
+        x, y, state, spin = x - dx, y - dy, source_state, source_spin
+        actions.append((action, dy if action is Action.SOFT_DROP else 1))
+        nodes.append((x, y, state))
+
+    actions.reverse()
+    nodes.reverse()
+
+    path = [Action.HOLD] if hold else []
+    idx = 0
+
+    while idx < len(actions):
+        action, rows = actions[idx]
+
+        if action is not Action.SOFT_DROP:
+            path.append(action)
+            idx += 1
+            continue
+
+        end = idx + 1
+        while end < len(actions) and actions[end][0] is Action.SOFT_DROP:
+            rows += actions[end][1]
+            end += 1
+
+        if end == len(actions): # the hard drop covers the soft drops before it
+            break
+
+        end_x, end_y, end_state = nodes[end]
+
+        if fit_rows[end_state][end_y + 1] >> (end_x + PAD) & 1: # still in the air, the piece is tucked from this height
+            path.extend([Action.SOFT_DROP] * rows)
+        else:
+            path.append(Action.SONIC_DROP)
+
+        idx = end
+
+    path.append(Action.HARD_DROP)
+    return tuple(path)
+
+def count_filled_corners(rows:list, corners:tuple, x:int, y:int, width:int, height:int):
+    """
+    Count the corners of a piece bounding box that are out of bounds or occupied, as Tetromino.__test_corners
+
+    args:
+        rows (list): The row bitmasks of the matrix
+        corners (tuple): The (x, y) corners of the piece bounding box
+        x (int): The x position of the piece
+        y (int): The y position of the piece
+        width (int): The width of the matrix
+        height (int): The height of the matrix
+    """
+    filled = 0
+
+    for corner_x, corner_y in corners:
+        corner_x += x
+        corner_y += y
+
+        if corner_x < 0 or corner_x >= width or corner_y < 0 or corner_y >= height or rows[corner_y] >> corner_x & 1:
+            filled += 1
+
+    return filled
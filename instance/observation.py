@@ -0,0 +1,93 @@
+import numpy as np
+from instance.pieces import PIECE_IDS
+
+# Fixed size NumPy encodings of the state of a game of Four, with the layout of one game of VecFour.observe.
+# The matrix planes are the views kept by the Matrix itself, the piece, hold and queue encoders fill small int arrays,
+# in place if an array is given, so an observation can be taken every step without walking the colour plane.
+
+def encode_piece(four, out:np.ndarray = None):
+    """
+    Encode the current piece
+
+    args:
+        four (Four): The game
+        out (np.ndarray): The (4,) int array to write into, a new int64 array if not provided
+
+    returns:
+        (np.ndarray): The piece id, rotation state, x and y of the current piece, all 0 if there is no current piece
+    """
+    if out is None:
+        out = np.zeros(4, dtype = np.int64)
+
+    current = four.GameInstanceStruct.current_tetromino
+
+    if current is None:
+        out[:] = 0
+    else:
+        out[:] = (PIECE_IDS[current.type], current.state, current.position.x, current.position.y)
+
+    return out
+
+def encode_hold(four, out:np.ndarray = None):
+    """
+    Encode the held piece
+
+    args:
+        four (Four): The game
+        out (np.ndarray): The (2,) int array to write into, a new int64 array if not provided
+
+    returns:
+        (np.ndarray): The piece id of the held piece, 0 if nothing is held, and whether the current piece can be held
+    """
+    if out is None:
+        out = np.zeros(2, dtype = np.int64)
+
+    held = four.GameInstanceStruct.held_tetromino
+    out[0] = 0 if held is None else PIECE_IDS[held]
+    out[1] = four.GameInstanceStruct.can_hold
+    return out
+
+def encode_queue(four, out:np.ndarray = None):
+    """
+    Encode the queue previews
+
+    args:
+        four (Four): The game
+        out (np.ndarray): The int array to write into, its length is the number of pieces encoded,
+            a new int64 array of queue_previews pieces if not provided
+
+    returns:
+        (np.ndarray): The piece ids of the next pieces, padded with 0
+    """
+    if out is None:
+        out = np.zeros(four.GameInstanceStruct.queue_previews, dtype = np.int64)
+
+    pieces = four.GameInstanceStruct.queue.view_queue_ids(len(out))
+    out[:len(pieces)] = pieces
+    out[len(pieces):] = 0
+    return out
+
+def observe(four):
+    """
+    Get the observation of a game
+
+    args:
+        four (Four): The game
+
+    returns:
+        (dict):
+            matrix (HEIGHT, WIDTH): The piece id of each placed block, a view kept in sync by the matrix, see Matrix.ids
+            occupancy (HEIGHT, WIDTH): Whether each cell holds a placed block, a view kept in sync by the matrix
+            piece (4,): The piece id, rotation state, x and y of the current piece
+            hold (2,): The piece id of the held piece and whether the current piece can be held
+            queue (queue_previews,): The piece ids of the next pieces
+    """
+    matrix = four.GameInstanceStruct.matrix
+
+    return {
+        'matrix': matrix.ids,
+        'occupancy': matrix.occupancy,
+        'piece': encode_piece(four),
+        'hold': encode_hold(four),
+        'queue': encode_queue(four),
+    }
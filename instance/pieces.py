@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from instance.utils import get_tetromino_blocks
+
+PIECE_TYPES = ('Z', 'L', 'O', 'S', 'I', 'J', 'T')
+PIECE_IDS = {type: idx + 1 for idx, type in enumerate(PIECE_TYPES)} # 0 is reserved for an empty cell
+
+@dataclass(frozen = True, slots = True)
+class PieceShape():
+    """
+    One rotation state of a tetromino, shared by every piece of that type and state
+
+    attributes:
+        type (str): Type of the piece: ['T', 'S', 'Z', 'L', 'J', 'I', 'O']
+        id (int): The id of the piece type, see PIECE_IDS
+        state (int): Rotation state of the piece: [0, 1, 2, 3]
+        blocks (tuple): The rotated block grid
+        size (int): The width and height of the block grid
+        cells (tuple): The (x, y) offsets of the occupied cells in the block grid
+        min_x (int): Leftmost occupied column of the block grid
+        max_x (int): Rightmost occupied column of the block grid
+        min_y (int): Topmost occupied row of the block grid
+        max_y (int): Bottommost occupied row of the block grid
+        row_masks (tuple): (y, mask) for each occupied row of the block grid, bit x of the mask is set if column x is occupied
+        bottom_profile (tuple): (x, y) of the lowest occupied cell in each occupied column of the block grid
+    """
+    type: str
+    id: int
+    state: int
+    blocks: tuple
+    size: int
+    cells: tuple
+    min_x: int
+    max_x: int
+    min_y: int
+    max_y: int
+    row_masks: tuple
+    bottom_profile: tuple
+
+def _rotate_cw(blocks):
+    """
+    Rotate a block grid clockwise
+    """
+    return [list(reversed(col)) for col in zip(*blocks)]
+
+def _rotate_ccw(blocks):
+    """
+    Rotate a block grid counter clockwise
+    """
+    return [list(col) for col in reversed(list(zip(*blocks)))]
+
+def _rotate_180(blocks):
+    """
+    Rotate a block grid 180 degrees
+    """
+    return [row[::-1] for row in reversed(blocks)]
+
+def _build_shape(type:str, state:int, blocks:list):
+    """
+    Build the shape of a rotation state from its block grid
+
+    args:
+        type (str): The type of the piece
+        state (int): The rotation state of the piece
+        blocks (list): The rotated block grid
+    """
+    cells = tuple((x, y) for y, row in enumerate(blocks) for x, val in enumerate(row) if val != 0)
+    row_masks = {}
+    bottoms = {}
+
+    for x, y in cells:
+        row_masks[y] = row_masks.get(y, 0) | 1 << x
+        bottoms[x] = max(bottoms.get(x, y), y)
+
+    return PieceShape(
+        type = type,
+        id = PIECE_IDS[type],
+        state = state,
+        blocks = tuple(tuple(row) for row in blocks),
+        size = len(blocks),
+        cells = cells,
+        min_x = min(x for x, _ in cells),
+        max_x = max(x for x, _ in cells),
+        min_y = min(y for _, y in cells),
+        max_y = max(y for _, y in cells),
+        row_masks = tuple(sorted(row_masks.items())),
+        bottom_profile = tuple(sorted(bottoms.items())),
+    )
+
+def _build_shapes():
+    """
+    Build the table of the 4 rotation states of every piece
+    """
+    shapes = {}
+
+    for type in PIECE_TYPES:
+        blocks = get_tetromino_blocks(type)
+        shapes[type] = (
+            _build_shape(type, 0, blocks),
+            _build_shape(type, 1, _rotate_cw(blocks)),
+            _build_shape(type, 2, _rotate_180(blocks)),
+            _build_shape(type, 3, _rotate_ccw(blocks)),
+        )
+
+    return shapes
+
+SHAPES = _build_shapes() # SHAPES[type][state], built once at import
@@ -0,0 +1,700 @@
+import json
+import struct
+import zlib
+from bisect import bisect_right
+from dataclasses import dataclass, astuple
+from core.state.struct_flags import FLAG
+from input.handling.action import Action
+from input.handling.handling_settings import HandlingSettings
+from instance.four import Snapshot, SNAPSHOT_GAME_INSTANCE_FIELDS
+from instance.headless import HeadlessFour
+from instance.tetromino import Tetromino
+from instance.utils import Vec2
+
+# A replay is the settings of a game and the actions performed in it, which is enough to play the game again exactly:
+#
+#   MAGIC, VERSION
+#   varint length, UTF-8 JSON of the ReplayHeader
+#   per action: varint ticks since the previous record, one byte action code (Action.value)
+#   per keyframe: varint ticks since the previous record, KEYFRAME_CODE, varint length, zlib compressed JSON of the game state
+#   varint ticks since the previous record, END_CODE, the game ran for the tick of the end marker
+#   index footer: varint keyframe count, then varint tick, varint event index and varint byte offset of the length of each keyframe
+#   uint32 little endian byte offset of the index footer, INDEX_MAGIC
+#
+# Actions performed on the same tick are stored with a delta of 0, in the order they were performed.
+# A keyframe is the state of the game before the tick it is stored at, so playing from it gives the same game as playing from the start.
+# The index footer is at a fixed place from the end, so the keyframes can be found without reading the actions.
+# Version 1 replays have no keyframes and no index footer.
+
+MAGIC = b'FOUR'
+INDEX_MAGIC = b'FIDX'
+VERSION = 2
+END_CODE = 0
+KEYFRAME_CODE = 0xFF
+KEYFRAME_INTERVAL = 50 # pieces between keyframes
+
+CODE_ACTIONS = {action.value: action for action in Action}
+
+def _write_varint(value:int, data:bytearray):
+    """
+    Append an unsigned integer as a LEB128 varint, 7 bits per byte with the high bit set on every byte but the last
+
+    args:
+        value (int): The integer to write
+        data (bytearray): The buffer to append to
+    """
+    while value > 0x7F:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+
+def _read_varint(data:bytes, idx:int):
+    """
+    Read a LEB128 varint
+
+    args:
+        data (bytes): The buffer to read from
+        idx (int): The index of the first byte of the varint
+
+    returns:
+        (tuple): The integer and the index after it
+    """
+    value, shift = 0, 0
+
+    while True:
+        if idx >= len(data):
+            raise ValueError(f"\033[31mInvalid replay provided!: truncated at byte {idx} \033[31m\033[0m")
+
+        byte = data[idx]
+        idx += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+
+        if byte < 0x80:
+            return value, idx
+
+def _encode_value(value):
+    """
+    Get a value of the game state as JSON, actions and vectors are tagged so they can be told apart from plain values
+
+    args:
+        value: The value, a flag or a field of the state structs
+    """
+    if isinstance(value, Action):
+        return {'action': value.value}
+    if isinstance(value, Vec2):
+        return {'vec2': [value.x, value.y]}
+    return value
+
+def _decode_value(value):
+    """
+    Get a value of the game state back from its JSON, see _encode_value
+
+    args:
+        value: The JSON of the value
+    """
+    if isinstance(value, dict):
+        if 'action' in value:
+            return CODE_ACTIONS[value['action']]
+        return Vec2(*value['vec2'])
+    return value
+
+def _encode_keyframe(four):
+    """
+    Get the state of a game as a keyframe payload: the board rows, the current piece, the queue and RNG, the flags and the counters.
+    The payload does not depend on the matrix backend.
+
+    args:
+        four (Four): The game
+
+    returns:
+        (bytes): The zlib compressed JSON of the state
+    """
+    snapshot = four.snapshot()
+    game_instance = list(snapshot.game_instance)
+    next_idx = SNAPSHOT_GAME_INSTANCE_FIELDS.index('next_tetromino')
+
+    if game_instance[next_idx] is not None: # the next piece warning is rebuilt from its type
+        game_instance[next_idx] = game_instance[next_idx].type
+
+    state = [
+        [''.join('.' if cell == 0 else cell for cell in row) for row in four.GameInstanceStruct.matrix.matrix],
+        snapshot.current_tetromino,
+        snapshot.queue,
+        snapshot.rng,
+        [[flag.name, _encode_value(value)] for flag, value in snapshot.flags],
+        [_encode_value(value) for value in game_instance],
+        [_encode_value(value) for value in snapshot.handling],
+    ]
+    return zlib.compress(json.dumps(state, separators = (',', ':')).encode(), 9)
+
+def _decode_keyframe(four, data:bytes, tick:int):
+    """
+    Get the snapshot a keyframe payload puts a game back to
+
+    args:
+        four (Four): The game the snapshot is restored to, the matrix of the snapshot is built for its backend
+        data (bytes): The keyframe payload
+        tick (int): The tick of the keyframe, the game time of a HeadlessFour
+
+    returns:
+        (Snapshot): The snapshot of the keyframe
+    """
+    rows, current_tetromino, queue, rng, flags, game_instance, handling = json.loads(zlib.decompress(data))
+    game_instance = [_decode_value(value) for value in game_instance]
+    next_idx = SNAPSHOT_GAME_INSTANCE_FIELDS.index('next_tetromino')
+
+    matrix = type(four.GameInstanceStruct.matrix)(four.GameInstanceStruct.matrix.WIDTH, four.GameInstanceStruct.matrix.HEIGHT // 2)
+    matrix.matrix = [[0 if cell == '.' else cell for cell in row] for row in rows]
+
+    if game_instance[next_idx] is not None:
+        next_tetromino = Tetromino(game_instance[next_idx], 0, four.spawn_pos.x, four.spawn_pos.y, four.FlagStruct, four.GameInstanceStruct)
+        matrix.set_spawn_overlap(next_tetromino.shape, next_tetromino.position.x, next_tetromino.position.y)
+        game_instance[next_idx] = next_tetromino
+
+    return Snapshot(
+        matrix.snapshot(),
+        None if current_tetromino is None else tuple(current_tetromino),
+        (tuple(queue[0]), queue[1]),
+        rng,
+        tuple((FLAG[name], _decode_value(value)) for name, value in flags),
+        tuple(game_instance),
+        tuple(_decode_value(value) for value in handling),
+        (),
+        tick,
+    )
+
+def _write_header(header, data:bytearray):
+    """
+    Append the start of a replay: the magic, the version and the settings of the game
+
+    args:
+        header (ReplayHeader): The settings of the game
+        data (bytearray): The buffer to append to
+    """
+    data += MAGIC
+    data.append(VERSION)
+    fields = json.dumps(astuple(header), separators = (',', ':')).encode()
+    _write_varint(len(fields), data)
+    data += fields
+
+def _write_record(delta:int, code:int, data:bytearray):
+    """
+    Append an action or the end marker
+
+    args:
+        delta (int): The number of ticks since the previous record
+        code (int): The action code or END_CODE
+        data (bytearray): The buffer to append to
+    """
+    _write_varint(delta, data)
+    data.append(code)
+
+def _write_keyframe(delta:int, payload:bytes, data:bytearray):
+    """
+    Append a keyframe
+
+    args:
+        delta (int): The number of ticks since the previous record
+        payload (bytes): The payload of the keyframe
+        data (bytearray): The buffer to append to
+
+    returns:
+        (int): The index in the buffer of the length of the payload, where the index footer points
+    """
+    _write_varint(delta, data)
+    data.append(KEYFRAME_CODE)
+    offset = len(data)
+    _write_varint(len(payload), data)
+    data += payload
+    return offset
+
+def _write_index(keyframes, offsets, index_offset:int, data:bytearray):
+    """
+    Append the index footer and the fixed size trailer that points to it
+
+    args:
+        keyframes (iterable): The Keyframes of the replay
+        offsets (iterable): The offset in the replay of the length of each keyframe
+        index_offset (int): The offset in the replay the index footer starts at
+        data (bytearray): The buffer to append to
+    """
+    keyframes = list(keyframes)
+    _write_varint(len(keyframes), data)
+
+    for keyframe, offset in zip(keyframes, offsets):
+        _write_varint(keyframe.tick, data)
+        _write_varint(keyframe.event_idx, data)
+        _write_varint(offset, data)
+
+    data += struct.pack('<I', index_offset) + INDEX_MAGIC
+
+@dataclass(frozen = True, slots = True)
+class Keyframe():
+    """
+    The state of a recorded game before a tick, so a replay can be played from it instead of from the start
+
+    attributes:
+        tick (int): The tick the keyframe is before
+        event_idx (int): The index of the first event on or after the tick
+        data (bytes): The payload of the keyframe, see _encode_keyframe
+    """
+    tick: int
+    event_idx: int
+    data: bytes
+
+@dataclass(frozen = True, slots = True)
+class ReplayHeader():
+    """
+    The settings of a recorded game, everything besides the actions that decides how it plays out
+
+    attributes:
+        seed (int): The seed of the piece sequence
+        matrix_width (int): The width of the matrix
+        matrix_height (int): The visible height of the matrix
+        rotation_system (str): The rotation system
+        randomiser (str): The randomiser type
+        queue_previews (int): The number of queue previews
+        hold (bool): Whether hold is enabled
+        allowed_spins (str): The spin ruleset
+        lock_out_ok (bool): Whether locking out is allowed
+        top_out_ok (bool): Whether topping out is allowed
+        reset_on_top_out (bool): Whether the game resets on top out
+        gravity (float): The gravity in G
+        lock_delay (int): The lock delay in frames, or 'inf'
+        TPS (int): The ticks per second of the game
+        handling_settings (tuple): The (setting, value) pairs of the handling settings
+    """
+    seed: int
+    matrix_width: int
+    matrix_height: int
+    rotation_system: str
+    randomiser: str
+    queue_previews: int
+    hold: bool
+    allowed_spins: str
+    lock_out_ok: bool
+    top_out_ok: bool
+    reset_on_top_out: bool
+    gravity: float
+    lock_delay: int
+    TPS: int
+    handling_settings: tuple
+
+    @classmethod
+    def from_four(cls, four):
+        """
+        Get the settings of a game of Four
+
+        args:
+            four (Four): The game
+
+        returns:
+            (ReplayHeader): The settings of the game
+        """
+        GameInstanceStruct = four.GameInstanceStruct
+
+        return cls(
+            GameInstanceStruct.seed, GameInstanceStruct.matrix.WIDTH, GameInstanceStruct.matrix.HEIGHT // 2, GameInstanceStruct.rotation_system_type,
+            GameInstanceStruct.randomiser, GameInstanceStruct.queue_previews, GameInstanceStruct.hold, GameInstanceStruct.allowed_spins,
+            GameInstanceStruct.lock_out_ok, GameInstanceStruct.top_out_ok, GameInstanceStruct.reset_on_top_out,
+            GameInstanceStruct.gravity, GameInstanceStruct.lock_delay, four.Config.TPS, tuple(four.HandlingConfig.HANDLING_SETTINGS.items()),
+        )
+
+@dataclass(frozen = True, slots = True)
+class Replay():
+    """
+    A recorded game: its settings, the actions performed on each tick and keyframes of its state
+
+    attributes:
+        header (ReplayHeader): The settings of the game
+        events (tuple): The (tick, action) pairs in the order the actions were performed
+        end_tick (int): The number of ticks the game ran for
+        keyframes (tuple): The Keyframes in the order of their ticks
+    """
+    header: ReplayHeader
+    events: tuple
+    end_tick: int
+    keyframes: tuple = ()
+
+    def to_bytes(self):
+        """
+        Encode the replay in the replay format, see the top of this module
+
+        returns:
+            (bytes): The encoded replay
+        """
+        data = bytearray()
+        _write_header(self.header, data)
+
+        last_tick, keyframe_idx = 0, 0
+        offsets = []
+
+        for event_idx in range(len(self.events) + 1):
+            while keyframe_idx < len(self.keyframes) and self.keyframes[keyframe_idx].event_idx == event_idx:
+                keyframe = self.keyframes[keyframe_idx]
+                offsets.append(_write_keyframe(keyframe.tick - last_tick, keyframe.data, data))
+                last_tick = keyframe.tick
+                keyframe_idx += 1
+
+            if event_idx < len(self.events):
+                tick, action = self.events[event_idx]
+                _write_record(tick - last_tick, action.value, data)
+                last_tick = tick
+
+        _write_record(self.end_tick - last_tick, END_CODE, data)
+        _write_index(self.keyframes, offsets, len(data), data)
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data:bytes, recover:bool = False):
+        """
+        Decode a replay encoded by Replay.to_bytes
+
+        args:
+            data (bytes): The encoded replay
+            recover (bool): Whether to decode a replay cut short, such as one streamed by a game that was killed:
+                without an index footer, the actions and keyframes up to the last whole record are kept and the game ends on its tick
+
+        returns:
+            (Replay): The replay
+        """
+        if data[:len(MAGIC)] != MAGIC or len(data) <= len(MAGIC) or data[len(MAGIC)] not in (1, VERSION):
+            raise ValueError(f"\033[31mInvalid replay provided!: {bytes(data[:len(MAGIC) + 1])} \033[31m\033[0m")
+
+        length, idx = _read_varint(data, len(MAGIC) + 1)
+
+        if idx + length > len(data):
+            raise ValueError(f"\033[31mInvalid replay provided!: truncated at byte {len(data)} \033[31m\033[0m")
+
+        fields = json.loads(bytes(data[idx:idx + length]))
+        fields[-1] = tuple(tuple(setting) for setting in fields[-1])
+        header = ReplayHeader(*fields)
+        idx += length
+
+        version = data[len(MAGIC)]
+        recovering = recover and version == VERSION and data[-len(INDEX_MAGIC):] != INDEX_MAGIC
+        index_keyframes = read_keyframe_index(data) if version == VERSION and not recovering else ()
+        events, keyframes, tick = [], [], 0
+
+        try:
+            for tick, code, payload in _read_records(data, idx):
+                if code == END_CODE:
+                    return cls(header, tuple(events), tick, tuple(keyframes) if recovering else index_keyframes)
+
+                if code == KEYFRAME_CODE:
+                    keyframes.append(Keyframe(tick, len(events), payload))
+                else:
+                    events.append((tick, CODE_ACTIONS[code]))
+        except ValueError:
+            if not recovering:
+                raise
+
+        if not recovering:
+            raise ValueError(f"\033[31mInvalid replay provided!: no end marker \033[31m\033[0m")
+
+        return cls(header, tuple(events), tick, tuple(keyframes))
+
+    def save(self, path:str):
+        """
+        Write the encoded replay to a file
+
+        args:
+            path (str): The path of the file
+        """
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path:str):
+        """
+        Read a replay from a file written by Replay.save, or by a recording streamed through a compressing BackgroundWriter.
+        A streamed replay whose writer was never closed, because the game was killed, is read up to its last whole record.
+
+        args:
+            path (str): The path of the file
+
+        returns:
+            (Replay): The replay
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        if not data.startswith(MAGIC):
+            data = zlib.decompressobj().decompress(data) # unlike zlib.decompress, keeps what was flushed before a stream that never ended
+
+        return cls.from_bytes(data, recover = True)
+
+def _read_records(data:bytes, idx:int):
+    """
+    Read the records of an encoded replay, raising ValueError at the first record that is cut short or invalid
+
+    args:
+        data (bytes): The encoded replay
+        idx (int): The index of the first record
+
+    returns:
+        (generator): The tick, the code and the keyframe payload (None for other records) of each whole record, up to the end marker
+    """
+    tick = 0
+
+    while True:
+        delta, idx = _read_varint(data, idx)
+
+        if idx >= len(data):
+            raise ValueError(f"\033[31mInvalid replay provided!: truncated at byte {idx} \033[31m\033[0m")
+
+        code = data[idx]
+        idx += 1
+        payload = None
+
+        if code == KEYFRAME_CODE:
+            length, idx = _read_varint(data, idx)
+
+            if idx + length > len(data):
+                raise ValueError(f"\033[31mInvalid replay provided!: truncated at byte {len(data)} \033[31m\033[0m")
+
+            payload = bytes(data[idx:idx + length])
+            idx += length
+        elif code != END_CODE and code not in CODE_ACTIONS:
+            raise ValueError(f"\033[31mInvalid replay action code provided!: {code} \033[31m\033[0m")
+
+        tick += delta
+        yield tick, code, payload
+
+        if code == END_CODE:
+            return
+
+def read_keyframe_index(data:bytes):
+    """
+    Read the keyframes of an encoded replay through its index footer, without reading the actions
+
+    args:
+        data (bytes): The encoded replay
+
+    returns:
+        (tuple): The Keyframes of the replay
+    """
+    if len(data) < 8 or data[-4:] != INDEX_MAGIC:
+        raise ValueError(f"\033[31mInvalid replay index footer provided!: {bytes(data[-4:])} \033[31m\033[0m")
+
+    idx = struct.unpack('<I', data[-8:-4])[0]
+    count, idx = _read_varint(data, idx)
+    keyframes = []
+
+    for _ in range(count):
+        tick, idx = _read_varint(data, idx)
+        event_idx, idx = _read_varint(data, idx)
+        offset, idx = _read_varint(data, idx)
+        length, offset = _read_varint(data, offset)
+        keyframes.append(Keyframe(tick, event_idx, bytes(data[offset:offset + length])))
+
+    return tuple(keyframes)
+
+class ReplayRecorder():
+    def __init__(self, header:ReplayHeader, keyframe_interval:int = KEYFRAME_INTERVAL, writer = None):
+        """
+        Collect the actions performed in a game and keyframes of its state, see Four.start_recording.
+        With a writer, the replay is also streamed to it in the replay format as it is recorded, so nothing is written on the tick thread.
+        The records are tick deltas and the index footer holds byte offsets, so if the writer drops a record nothing after it is streamed
+        and the footer is left out: the file then loads as the game up to the last record before the drop, never as a different game.
+
+        args:
+            header (ReplayHeader): The settings of the game
+            keyframe_interval (int): The number of pieces between keyframes, 0 for no keyframes
+            writer (BackgroundWriter): The writer to stream the replay to, the replay is only kept in memory if not provided
+
+        methods:
+            record(four): Record the tick the game just performed
+            finish(end_tick): Get the replay of the game so far
+        """
+        self.header = header
+        self.keyframe_interval = keyframe_interval
+        self.writer = writer
+        self.events = []
+        self.keyframes = []
+        self.pieces = 0
+        self.generation = None
+
+        self.last_tick = 0 # the tick of the last record streamed to the writer
+        self.offset = 0 # the number of bytes streamed to the writer
+        self.keyframe_offsets = []
+        self.stream_broken = False # whether the writer dropped a record, which ends the stream
+
+        if self.writer is not None:
+            data = bytearray()
+            _write_header(header, data)
+            self.__stream(data)
+
+    def __stream(self, data:bytearray):
+        """
+        Hand encoded records to the writer, and end the stream if the writer drops them
+
+        args:
+            data (bytearray): The records
+        """
+        if not self.writer.write(bytes(data)):
+            self.stream_broken = True
+            return
+
+        self.offset += len(data)
+
+    def record(self, four):
+        """
+        Record the actions performed on the tick the game just performed, and a keyframe if enough pieces were taken since the last one
+
+        args:
+            four (Four): The game
+        """
+        tick = four.GameInstanceStruct.ticks - 1
+        events = len(self.events)
+        self.events.extend((tick, action_dict['action']) for action_dict in four.actions_this_tick)
+
+        generation = four.GameInstanceStruct.queue.generation
+
+        if self.generation is not None and generation != self.generation:
+            self.pieces += generation - self.generation
+        self.generation = generation
+
+        keyframe = None
+
+        if self.keyframe_interval and self.pieces >= self.keyframe_interval:
+            self.pieces = 0
+            keyframe = Keyframe(four.GameInstanceStruct.ticks, len(self.events), _encode_keyframe(four))
+            self.keyframes.append(keyframe)
+
+        if self.writer is None or self.stream_broken or (events == len(self.events) and keyframe is None):
+            return
+
+        data = bytearray()
+
+        for tick, action in self.events[events:]:
+            _write_record(tick - self.last_tick, action.value, data)
+            self.last_tick = tick
+
+        if keyframe is not None:
+            self.keyframe_offsets.append(self.offset + _write_keyframe(keyframe.tick - self.last_tick, keyframe.data, data))
+            self.last_tick = keyframe.tick
+
+        self.__stream(data)
+
+    def finish(self, end_tick:int):
+        """
+        Get the replay of the game so far, and end the replay streamed to the writer. The writer is left open.
+        If the writer dropped a record, stream_broken is set and the streamed replay is not ended, so it loads up to the drop.
+
+        args:
+            end_tick (int): The number of ticks the game ran for
+
+        returns:
+            (Replay): The replay
+        """
+        if self.writer is not None and not self.stream_broken:
+            data = bytearray()
+            _write_record(end_tick - self.last_tick, END_CODE, data)
+            _write_index(self.keyframes, self.keyframe_offsets, self.offset + len(data), data)
+            self.__stream(data)
+
+        return Replay(self.header, tuple(self.events), end_tick, tuple(self.keyframes))
+
+class ReplayPlayer():
+    def __init__(self, replay:Replay, matrix_backend:str = 'BITBOARD'):
+        """
+        Play a replay back through a HeadlessFour as fast as it can be stepped, skipping the ticks between events
+
+        args:
+            replay (Replay): The replay to play
+            matrix_backend (str): The matrix representation to use: ['LIST', 'BITBOARD']
+
+        methods:
+            play(until_tick): Play the replay up to a tick
+            seek(tick): Put the game at a tick from the nearest keyframe before it
+        """
+        self.replay = replay
+        header = replay.header
+
+        self.four = HeadlessFour(
+            header.matrix_width, header.matrix_height, header.rotation_system, header.randomiser, header.queue_previews, header.seed, header.hold,
+            header.allowed_spins, header.lock_out_ok, header.top_out_ok, header.reset_on_top_out, matrix_backend = matrix_backend,
+            HandlingConfig = HandlingSettings(dict(header.handling_settings)),
+        )
+        self.four.Config.TPS = header.TPS
+        self.four.GameInstanceStruct.gravity = header.gravity
+        self.four.GameInstanceStruct.lock_delay = header.lock_delay
+
+        self.event_idx = 0
+        self.start = self.four.snapshot()
+        self.keyframe_ticks = [keyframe.tick for keyframe in replay.keyframes]
+
+    @property
+    def tick(self):
+        """
+        The number of ticks played
+        """
+        return self.four.GameInstanceStruct.ticks
+
+    def play(self, until_tick:int = None):
+        """
+        Play the replay up to a tick, the actions of that tick are not performed yet
+
+        args:
+            until_tick (int): The tick to stop at, the end of the replay if not provided
+
+        returns:
+            (HeadlessFour): The game
+        """
+        events = self.replay.events
+        until_tick = self.replay.end_tick if until_tick is None else min(until_tick, self.replay.end_tick)
+
+        while self.event_idx < len(events) and events[self.event_idx][0] < until_tick:
+            tick = events[self.event_idx][0]
+            self.four.run(tick - self.tick)
+
+            actions = []
+            while self.event_idx < len(events) and events[self.event_idx][0] == tick:
+                actions.append(events[self.event_idx][1])
+                self.event_idx += 1
+
+            self.four.step(actions)
+
+        self.four.run(until_tick - self.tick)
+        return self.four
+
+    def seek(self, tick:int):
+        """
+        Put the game at a tick, before the actions of that tick are performed. The game is restored to the nearest keyframe before the tick
+        and played forward from there, unless it is already between that keyframe and the tick.
+
+        args:
+            tick (int): The tick to seek to, clamped to the replay
+
+        returns:
+            (HeadlessFour): The game
+        """
+        tick = max(0, min(tick, self.replay.end_tick))
+        keyframe_idx = bisect_right(self.keyframe_ticks, tick) - 1
+        keyframe = self.replay.keyframes[keyframe_idx] if keyframe_idx >= 0 else None
+        start_tick = 0 if keyframe is None else keyframe.tick
+
+        if not start_tick <= self.tick <= tick:
+            if keyframe is None:
+                self.four.restore(self.start)
+                self.event_idx = 0
+            else:
+                self.four.restore(_decode_keyframe(self.four, keyframe.data, keyframe.tick))
+                self.event_idx = keyframe.event_idx
+
+        return self.play(tick)
+
+def play_replay(replay:Replay, matrix_backend:str = 'BITBOARD'):
+    """
+    Play a whole replay back headlessly
+
+    args:
+        replay (Replay): The replay to play
+        matrix_backend (str): The matrix representation to use: ['LIST', 'BITBOARD']
+
+    returns:
+        (HeadlessFour): The game at the end of the replay
+    """
+    return ReplayPlayer(replay, matrix_backend).play()
@@ -1,4 +1,5 @@
-from utils import Vec2
+from instance.utils import Vec2
+from instance.pieces import PIECE_TYPES, PIECE_IDS
 
 class RotationSystem():
     def __init__(self, type):
@@ -172,5 +173,40 @@ class RotationSystem():
                 '90': {'T_KICKS': self.T_KICKS, 'S_KICKS': self.S_KICKS, 'Z_KICKS': self.Z_KICKS, 'L_KICKS': self.L_KICKS, 'J_KICKS': self.J_KICKS, 'I_KICKS': self.I_KICKS, 'O_KICKS': self.O_KICKS},
                 '180': {'T_KICKS': self.T_180_KICKS, 'S_KICKS': self.S_180_KICKS, 'Z_KICKS': self.Z_180_KICKS, 'L_KICKS': self.L_180_KICKS, 'J_KICKS': self.J_180_KICKS, 'I_KICKS': self.I_180_KICKS, 'O_KICKS': self.O_180_KICKS}
             }
-            
-    
\ No newline at end of file
+
+_COMPILED_KICK_TABLES = {}
+
+def compile_kick_table(type:str):
+    """
+    Compile the kick tables of a rotation system into a flat, immutable table shared by every game that uses it.
+    
+    The kicks of a rotation from one state to another are found at index (piece_id * 4 + from_state) * 4 + to_state,
+    as a tuple of (dx, dy) int offsets with y already inverted since the top left of the matrix is (0, 0).
+    Rotations that the rotation system has no kicks for are empty.
+    
+    args:
+        type (str): The type of rotation system to use
+    
+    returns:
+        (tuple): The compiled kick table
+    """
+    try:
+        return _COMPILED_KICK_TABLES[type]
+    except KeyError:
+        pass
+    
+    rotation_system = RotationSystem(type)
+    
+    if not hasattr(rotation_system, 'kick_table'):
+        raise ValueError(f"\033[31mInvalid rotation system provided!: {type} \033[31m\033[0m")
+    
+    table = [()] * ((len(PIECE_TYPES) + 1) * 16)
+    
+    for kicks in rotation_system.kick_table.values():
+        for piece_type in PIECE_TYPES:
+            for transition, offsets in kicks[f'{piece_type}_KICKS'].items():
+                from_state, to_state = map(int, transition.split('->'))
+                table[(PIECE_IDS[piece_type] * 4 + from_state) * 4 + to_state] = tuple((kick.x, -kick.y) for kick in offsets)
+    
+    _COMPILED_KICK_TABLES[type] = tuple(table)
+    return _COMPILED_KICK_TABLES[type]
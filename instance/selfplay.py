@@ -0,0 +1,282 @@
+import argparse
+import importlib
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from instance.headless import HeadlessFour
+from instance.pieces import SHAPES
+
+# Play many seeded games with a bot across a process pool and summarise how it did, to compare bots or versions of a bot.
+#
+# A bot is any picklable callable (a function at the top level of a module) that is given the game and returns one of
+# four.get_placements(), or None to give up. Each game is played with Four.place, so no ticks are spent moving pieces.
+#
+# usage: python -m instance.selfplay [--bot module:function] [--mode SPRINT] [--games 1000] [--workers N]
+
+MODES = ('SPRINT', 'SURVIVAL', 'CHEESE')
+SPRINT_LINES = 40
+CHEESE_ROWS = 10
+GARBAGE = 'G' # the cell value of garbage blocks
+
+@dataclass(frozen = True, slots = True)
+class GameStats():
+    """
+    The outcome of a game played by a bot
+
+    attributes:
+        mode (str): The game mode
+        seed (int): The seed of the game
+        pieces (int): The number of pieces placed
+        lines (int): The number of lines cleared
+        spins (int): The number of pieces locked with a spin, minis included
+        time (float): The time the game took in seconds, the bot included
+        pps (float): The pieces placed per second
+        finished (bool): Whether the goal of the mode was reached: 40 lines, the piece limit alive or every garbage row cleared
+        game_over (bool): Whether the game topped out
+    """
+    mode: str
+    seed: int
+    pieces: int
+    lines: int
+    spins: int
+    time: float
+    pps: float
+    finished: bool
+    game_over: bool
+
+def random_bot(four):
+    """
+    Lock the current piece in a random placement, the random module is seeded with the seed of each game
+    """
+    placements = four.get_placements()
+    return random.choice(placements) if placements else None
+
+def greedy_bot(four):
+    """
+    Lock the current piece where it scores best on the height, lines cleared, holes and bumpiness of the stack it leaves,
+    with the weights of the well known hand tuned bot, needs the BITBOARD matrix
+    """
+    matrix = four.GameInstanceStruct.matrix
+    best, best_score = None, None
+
+    for placement in four.get_placements():
+        board = matrix.copy()
+        board.insert_blocks(SHAPES[placement.type][placement.state], placement.x, placement.y, board.matrix)
+        lines_cleared = board.clear_lines()[0] or 0
+
+        holes, covered = 0, 0
+        for row in board.rows[board.highest_row:]: # a hole is an empty cell under a filled one
+            holes += (covered & ~row).bit_count()
+            covered |= row
+
+        heights = board.column_heights
+        bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+        score = -0.51 * sum(heights) + 0.76 * lines_cleared - 0.36 * holes - 0.18 * bumpiness
+
+        if best_score is None or score > best_score:
+            best, best_score = placement, score
+
+    return best
+
+def add_cheese(four, rows:int, seed:int):
+    """
+    Fill the bottom rows of the matrix with garbage that has one hole per row at a random column
+
+    args:
+        four (Four): The game, before the first piece spawns
+        rows (int): The number of garbage rows
+        seed (int): The seed of the hole columns
+    """
+    rng = random.Random(seed)
+    matrix = four.GameInstanceStruct.matrix
+    blocks = [row[:] for row in matrix.matrix]
+
+    for y in range(matrix.HEIGHT - rows, matrix.HEIGHT):
+        hole = rng.randrange(matrix.WIDTH)
+        blocks[y] = [0 if x == hole else GARBAGE for x in range(matrix.WIDTH)]
+
+    matrix.matrix = blocks
+
+def play_game(bot, mode:str, seed:int, max_pieces:int = 1000, randomiser:str = '7BAG'):
+    """
+    Play a game with a bot until the goal of the mode is reached, the game tops out, the bot gives up or the piece limit is hit
+
+    args:
+        bot (callable): Gets the game and returns one of its placements, or None to give up
+        mode (str): The game mode: ['SPRINT', 'SURVIVAL', 'CHEESE']
+        seed (int): The seed of the game, of the garbage and of the random module
+        max_pieces (int): The most pieces to place
+        randomiser (str): The randomiser type
+
+    returns:
+        (GameStats): The outcome of the game
+    """
+    if mode not in MODES:
+        raise ValueError(f"\033[31mInvalid game mode provided!: {mode} \033[31m\033[0m")
+
+    random.seed(seed)
+    four = HeadlessFour(seed = seed, randomiser = randomiser)
+
+    if mode == 'CHEESE':
+        add_cheese(four, CHEESE_ROWS, seed)
+
+    four.step() # spawn the first piece
+
+    matrix = four.GameInstanceStruct.matrix
+    pieces, lines, spins, finished = 0, 0, 0, False
+    start = time.perf_counter()
+
+    while pieces < max_pieces and not four.FlagStruct.GAME_OVER:
+        placement = bot(four)
+
+        if placement is None:
+            break
+
+        result = four.place(placement.type, placement.x, placement.state, placement.hold, placement.y, placement.spin)
+        pieces += 1
+        lines += result.lines_cleared
+        spins += result.spin is not False
+
+        if mode == 'SPRINT' and lines >= SPRINT_LINES:
+            finished = True
+            break
+
+        if mode == 'CHEESE' and result.lines_cleared and not any(GARBAGE in row for row in matrix.matrix[matrix.HEIGHT - CHEESE_ROWS:]):
+            finished = True
+            break
+
+    elapsed = time.perf_counter() - start
+
+    if mode == 'SURVIVAL':
+        finished = pieces == max_pieces and not four.FlagStruct.GAME_OVER
+
+    return GameStats(mode, seed, pieces, lines, spins, elapsed, pieces / elapsed if elapsed > 0 else 0, finished, four.FlagStruct.GAME_OVER)
+
+def _play_shard(bot, mode:str, seeds:list, max_pieces:int, randomiser:str):
+    """
+    Play the games of a shard of seeds in a worker process
+    """
+    return [play_game(bot, mode, seed, max_pieces, randomiser) for seed in seeds]
+
+def play_games(bot, mode:str, seeds, max_pieces:int = 1000, randomiser:str = '7BAG', max_workers:int = None, shard_size:int = None):
+    """
+    Play a game for every seed across a process pool, yielding the stats of each game as its shard finishes
+
+    args:
+        bot (callable): Gets the game and returns one of its placements, or None to give up, it must be picklable
+        mode (str): The game mode: ['SPRINT', 'SURVIVAL', 'CHEESE']
+        seeds (iterable): The seeds of the games
+        max_pieces (int): The most pieces to place in each game
+        randomiser (str): The randomiser type
+        max_workers (int): The number of processes, the number of CPUs if not provided
+        shard_size (int): The number of games sent to a process at once, a few shards per process if not provided
+
+    returns:
+        (generator): The GameStats of the games, in the order they finish
+    """
+    seeds = list(seeds)
+    max_workers = max_workers or os.cpu_count() or 1
+    shard_size = shard_size or max(1, min(16, len(seeds) // (max_workers * 4))) # small shards balance the load and stream the results sooner
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        futures = [executor.submit(_play_shard, bot, mode, seeds[idx:idx + shard_size], max_pieces, randomiser) for idx in range(0, len(seeds), shard_size)]
+
+        for future in as_completed(futures):
+            yield from future.result()
+
+def summarise(stats:list):
+    """
+    Aggregate the stats of many games
+
+    args:
+        stats (list): The GameStats of the games
+
+    returns:
+        (dict): The number of games, the finished and topped out games, and the mean and median pieces, lines, spins, time and PPS
+    """
+    if not stats:
+        return {'games': 0}
+
+    summary = {
+        'games': len(stats),
+        'finished': sum(game.finished for game in stats),
+        'game_over': sum(game.game_over for game in stats),
+    }
+
+    for field in ('pieces', 'lines', 'spins', 'time', 'pps'):
+        values = [getattr(game, field) for game in stats]
+        summary[f'mean_{field}'] = statistics.fmean(values)
+        summary[f'median_{field}'] = statistics.median(values)
+
+    finished_times = [game.time for game in stats if game.finished]
+    summary['median_finish_time'] = statistics.median(finished_times) if finished_times else None
+    return summary
+
+def format_summary(mode:str, summary:dict, elapsed:float):
+    """
+    Format a summary as a table
+
+    args:
+        mode (str): The game mode
+        summary (dict): The summary from summarise
+        elapsed (float): The wall time of the whole run in seconds
+    """
+    if summary['games'] == 0:
+        return f"{mode}: no games played"
+
+    games = summary['games']
+    rows = [
+        ('games', f"{games}"),
+        ('finished', f"{summary['finished']} ({summary['finished'] / games:.1%})"),
+        ('topped out', f"{summary['game_over']} ({summary['game_over'] / games:.1%})"),
+    ]
+
+    for field, label in (('pieces', 'pieces'), ('lines', 'lines'), ('spins', 'spins'), ('time', 'time (s)'), ('pps', 'PPS')):
+        rows.append((label, f"{summary[f'mean_{field}']:.2f} mean, {summary[f'median_{field}']:.2f} median"))
+
+    if summary['median_finish_time'] is not None:
+        rows.append(('finish time (s)', f"{summary['median_finish_time']:.3f} median"))
+
+    rows.append(('throughput', f"{games / elapsed:.1f} games/s, {summary['mean_pieces'] * games / elapsed:.0f} pieces/s"))
+
+    width = max(len(label) for label, _ in rows)
+    return "\n".join([f"== {mode} =="] + [f"{label:<{width}}  {value}" for label, value in rows])
+
+def load_bot(path:str):
+    """
+    Import a bot from a 'module:function' path, a bare name is looked up in this module
+
+    args:
+        path (str): The path of the bot
+    """
+    module, _, name = path.rpartition(':')
+    return getattr(importlib.import_module(module) if module else sys.modules[__name__], name)
+
+def main():
+    parser = argparse.ArgumentParser(description = "Play seeded games with a bot across a process pool and summarise the results")
+    parser.add_argument('--bot', default = 'greedy_bot', help = "the bot as module:function, or random_bot / greedy_bot")
+    parser.add_argument('--mode', default = 'SPRINT', choices = MODES)
+    parser.add_argument('--games', type = int, default = 100, help = "the number of games, seeded 0 to games - 1 after --seed")
+    parser.add_argument('--seed', type = int, default = 0, help = "the seed of the first game")
+    parser.add_argument('--max-pieces', type = int, default = 1000)
+    parser.add_argument('--randomiser', default = '7BAG')
+    parser.add_argument('--workers', type = int, default = None, help = "the number of processes, the number of CPUs by default")
+    args = parser.parse_args()
+
+    bot = load_bot(args.bot)
+    stats = []
+    start = time.perf_counter()
+
+    for game in play_games(bot, args.mode, range(args.seed, args.seed + args.games), args.max_pieces, args.randomiser, args.workers):
+        stats.append(game)
+        print(f"\r{len(stats)}/{args.games} games", end = '', file = sys.stderr, flush = True)
+
+    print(file = sys.stderr)
+    print(format_summary(args.mode, summarise(stats), time.perf_counter() - start))
+
+if __name__ == "__main__":
+    main()
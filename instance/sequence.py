@@ -0,0 +1,187 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from itertools import repeat
+import numpy as np
+from instance.four import RNG, get_batch_draws
+from instance.pieces import PIECE_IDS, PIECE_TYPES
+
+CHUNK_DRAWS = 1 << 16 # random numbers drawn per chunk, bounds the memory of long sequences
+TETROMINO_IDS = np.array([PIECE_IDS[type] for type in PIECE_TYPES], dtype = np.uint8) # the order of Queue.tetrominos
+
+@cache
+def _get_multipliers():
+    """
+    Get 16807^k mod 2147483647 for k = 1..CHUNK_DRAWS, so the RNG states k steps ahead of a state are one multiplication each
+    """
+    multipliers = np.empty(CHUNK_DRAWS, dtype = np.int64)
+    multipliers[0] = 16807
+    filled = 1
+
+    while filled < CHUNK_DRAWS: # double the powers known so far: a^(filled + k) = a^k * a^filled
+        n = min(filled, CHUNK_DRAWS - filled)
+        multipliers[filled:filled + n] = multipliers[:n] * multipliers[filled - 1] % 2147483647
+        filled += n
+
+    return multipliers
+
+def _draw(state:int, draws:int):
+    """
+    Get the next random numbers of the RNG from a state, as RNG.next_float, and the state after them
+
+    args:
+        state (int): The internal state of the RNG
+        draws (int): The number of random numbers, at most CHUNK_DRAWS
+
+    returns:
+        (tuple): The random numbers as a float64 array and the state after them
+    """
+    if draws == 0:
+        return np.empty(0), state
+
+    states = state * _get_multipliers()[:draws] % 2147483647 # both factors are below 2^31, so the products fit in int64
+    return (states - 1) / 2147483646, int(states[-1])
+
+def _shuffle_rows(rows:np.ndarray, draws:np.ndarray):
+    """
+    Fisher–Yates shuffle every row in place as RNG.shuffle_array does, one swap of every row at a time
+
+    args:
+        rows (np.ndarray): The rows to shuffle
+        draws (np.ndarray): The random numbers of each row, one per swap
+    """
+    idxs = np.arange(len(rows))
+
+    for step, i in enumerate(range(rows.shape[1] - 1, 0, -1)):
+        r = np.floor(draws[:, step] * (i + 1)).astype(np.intp)
+        swapped = rows[idxs, r]
+        rows[idxs, r] = rows[:, i]
+        rows[:, i] = swapped
+
+def _generate_batches(randomiser:str, state:int, batches:int):
+    """
+    Generate whole bags (or batches) of pieces a chunk at a time
+
+    args:
+        randomiser (str): The randomiser type, one that draws the same number of random numbers for every batch
+        state (int): The internal state of the RNG at the start of the first batch
+        batches (int): The number of batches
+
+    returns:
+        (np.ndarray): The piece ids of the batches in order
+    """
+    batch_size, batch_draws = get_batch_draws(randomiser)
+    pieces = np.empty(batches * batch_size, dtype = np.uint8)
+    per_chunk = CHUNK_DRAWS // batch_draws
+
+    for start in range(0, batches, per_chunk):
+        count = min(per_chunk, batches - start)
+        draws, state = _draw(state, count * batch_draws)
+        draws = draws.reshape(count, batch_draws)
+
+        match randomiser:
+            case '7BAG' | '14BAG':
+                chunk = np.tile(TETROMINO_IDS, (count, batch_size // len(TETROMINO_IDS)))
+                _shuffle_rows(chunk, draws)
+
+            case 'PAIRS':
+                tetrominos = np.tile(TETROMINO_IDS, (count, 1))
+                _shuffle_rows(tetrominos, draws[:, :6])
+                chunk = np.repeat(tetrominos[:, :2], 3, axis = 1)
+                _shuffle_rows(chunk, draws[:, 6:])
+
+            case 'RANDOM':
+                chunk = TETROMINO_IDS[np.floor(draws * len(TETROMINO_IDS)).astype(np.intp)]
+
+        pieces[start * batch_size:(start + count) * batch_size] = chunk.ravel()
+
+    return pieces
+
+def _generate_classic(state:int, count:int):
+    """
+    Generate pieces with the classic randomiser, which depends on the previous piece and rerolls, so the pieces are found one at a time
+    from random numbers drawn a chunk at a time
+
+    args:
+        state (int): The internal state of the RNG at the start of the sequence
+        count (int): The number of pieces
+    """
+    pieces = np.empty(count, dtype = np.uint8)
+    tetrominos = len(TETROMINO_IDS)
+    draws, last_generated = [], None
+    idx = 0
+
+    for piece in range(count):
+        if idx + 2 > len(draws): # a piece takes at most 2 random numbers
+            chunk, state = _draw(state, CHUNK_DRAWS)
+            draws, idx = draws[idx:] + chunk.tolist(), 0
+
+        index = math.floor(draws[idx] * (tetrominos + 1))
+        idx += 1
+
+        if index == last_generated or index >= tetrominos:
+            index = math.floor(draws[idx] * tetrominos)
+            idx += 1
+
+        last_generated = index
+        pieces[piece] = TETROMINO_IDS[index]
+
+    return pieces
+
+def generate_sequence(randomiser:str, seed:int, count:int, start:int = 0):
+    """
+    Generate a piece sequence at once: the same pieces, in the same order, that Queue(RNG(seed), randomiser).get_next_piece() gives one at a time.
+    The bag, pairs and random randomisers are generated a chunk of bags at a time with NumPy, the classic randomiser a piece at a time.
+
+    args:
+        randomiser (str): The randomiser type: ['7BAG', '14BAG', 'CLASSIC', 'PAIRS', 'RANDOM']
+        seed (int): The seed of the sequence
+        count (int): The number of pieces
+        start (int): The index of the first piece, the RNG is jumped to it as in Queue.seek (not supported by the classic randomiser)
+
+    returns:
+        (np.ndarray): The piece ids as uint8, see PIECE_IDS
+    """
+    if count < 0 or start < 0:
+        raise ValueError(f"\033[31mInvalid sequence range provided!: start {start}, count {count} \033[31m\033[0m")
+
+    rng = RNG(seed)
+
+    if randomiser == 'CLASSIC':
+        if start != 0:
+            raise ValueError(f"\033[31mInvalid randomiser provided for seeking!: {randomiser} \033[31m\033[0m")
+        return _generate_classic(rng.t, count)
+
+    batch_draws = get_batch_draws(randomiser)
+
+    if batch_draws is None:
+        raise ValueError(f"\033[31mInvalid randomiser provided!: {randomiser} \033[31m\033[0m")
+
+    batch_size, batch_draws = batch_draws
+    first_batch, skipped = divmod(start, batch_size)
+    rng.jump(first_batch * batch_draws)
+
+    return _generate_batches(randomiser, rng.t, -(-(skipped + count) // batch_size))[skipped:skipped + count]
+
+def generate_sequences(randomiser:str, seeds, count:int, max_workers:int = None):
+    """
+    Generate the piece sequences of many seeds across a process pool, for seed sweeps
+
+    args:
+        randomiser (str): The randomiser type
+        seeds (iterable): The seeds of the sequences
+        count (int): The number of pieces of each sequence
+        max_workers (int): The number of processes, the number of CPUs if not provided
+
+    returns:
+        (np.ndarray): The piece ids of each seed as a (seeds, count) uint8 array
+    """
+    seeds = list(seeds)
+    max_workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(seeds) // (max_workers * 4)) # a few tasks per process to balance the load without a round trip per seed
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        sequences = list(executor.map(generate_sequence, repeat(randomiser), seeds, repeat(count), chunksize = chunksize))
+
+    return np.stack(sequences) if sequences else np.empty((0, count), dtype = np.uint8)
@@ -0,0 +1,353 @@
+import multiprocessing as mp
+import os
+import threading
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from instance.headless import HeadlessFour
+from instance.observation import encode_piece, encode_queue
+from instance.pieces import PIECE_IDS
+from instance.vec_four import VEC_ACTIONS
+
+# Commands the learner sends the workers through shared memory, read by every worker after the first barrier of a step
+_STEP = 0
+_RESET = 1
+_CLOSE = 2
+
+def _get_layout(num_envs:int, height:int, width:int, queue_previews:int):
+    """
+    Get the name, shape and dtype of every shared array, the observation arrays have the layout of VecFour.observe
+
+    args:
+        num_envs (int): The number of games
+        height (int): The height of the matrix, including the buffer zone
+        width (int): The width of the matrix
+        queue_previews (int): The number of queue previews
+    """
+    return {
+        'actions': ((num_envs,), np.int64),
+        'matrix': ((num_envs, height, width), np.uint8),
+        'piece': ((num_envs, 4), np.int64),
+        'hold': ((num_envs,), np.int64),
+        'can_hold': ((num_envs,), np.bool_),
+        'queue': ((num_envs, queue_previews), np.int64),
+        'reward': ((num_envs,), np.float32),
+        'done': ((num_envs,), np.bool_),
+    }
+
+def _attach(layout:dict, blocks:dict):
+    """
+    Wrap the shared memory blocks of a layout in NumPy arrays, without copying them
+
+    args:
+        layout (dict): The layout from _get_layout
+        blocks (dict): The SharedMemory of each array
+    """
+    return {name: np.ndarray(shape, dtype, buffer = blocks[name].buf) for name, (shape, dtype) in layout.items()}
+
+class _Games():
+    def __init__(self, envs:range, arrays:dict, seed:int, num_envs:int, max_episode_steps:int, four_kwargs:dict):
+        """
+        The games of one worker process, which step them and write their observations into the shared arrays
+
+        args:
+            envs (range): The indices of the games of the worker
+            arrays (dict): The shared arrays
+            seed (int): The seed of game 0
+            num_envs (int): The number of games across every worker
+            max_episode_steps (int): The number of steps after which a game ends, None for no limit
+            four_kwargs (dict): The arguments of each HeadlessFour
+
+        methods:
+            reset(): Start a new game in every env
+            step(): Perform the action of every env
+        """
+        self.envs = envs
+        self.arrays = arrays
+        self.seed = seed
+        self.num_envs = num_envs
+        self.max_episode_steps = max_episode_steps
+        self.four_kwargs = four_kwargs
+
+        self.games = {}
+        self.episodes = {env: 0 for env in envs}
+        self.steps = {env: 0 for env in envs}
+        self.versions = {} # the matrix version last written for each env, the matrix is only written again when its blocks change
+
+    def reset(self):
+        """
+        Start a new game in every env of the worker
+        """
+        for env in self.envs:
+            self.__new_game(env)
+            self.arrays['reward'][env] = 0
+            self.arrays['done'][env] = False
+
+    def step(self):
+        """
+        Perform the action of every env, resetting games that end
+        """
+        actions, reward, done = self.arrays['actions'], self.arrays['reward'], self.arrays['done']
+
+        for env in self.envs:
+            four = self.games[env]
+            action = VEC_ACTIONS[actions[env]]
+            four.step(() if action is None else (action,))
+            self.steps[env] += 1
+
+            reward[env] = four.GameInstanceStruct.lines_cleared or 0
+            done[env] = four.FlagStruct.GAME_OVER or (self.max_episode_steps is not None and self.steps[env] >= self.max_episode_steps)
+
+            if done[env]:
+                self.episodes[env] += 1
+                self.__new_game(env)
+            else:
+                self.__write(env)
+
+    def __new_game(self, env:int):
+        """
+        Start the next episode of an env and spawn its first piece, seeded as VecFour seeds its games
+
+        args:
+            env (int): The index of the game
+        """
+        four = HeadlessFour(seed = self.seed + env + self.episodes[env] * self.num_envs, **self.four_kwargs)
+        four.step()
+        self.games[env] = four
+        self.steps[env] = 0
+        self.__write(env)
+
+    def __write(self, env:int):
+        """
+        Write the observation of a game into the shared arrays
+
+        args:
+            env (int): The index of the game
+        """
+        four, arrays = self.games[env], self.arrays
+        GameInstanceStruct = four.GameInstanceStruct
+        matrix = GameInstanceStruct.matrix
+
+        if self.versions.get(env) != matrix.version:
+            self.versions[env] = matrix.version
+            arrays['matrix'][env] = matrix.ids
+
+        encode_piece(four, arrays['piece'][env])
+        held = GameInstanceStruct.held_tetromino
+        arrays['hold'][env] = 0 if held is None else PIECE_IDS[held]
+        arrays['can_hold'][env] = GameInstanceStruct.can_hold
+        encode_queue(four, arrays['queue'][env])
+
+def _run_worker(envs:range, names:dict, layout:dict, barrier, command, seed:int, num_envs:int, max_episode_steps:int, four_kwargs:dict):
+    """
+    The loop of a worker process: every step waits for the learner at the barrier, runs the command and waits again,
+    so the learner only reads the shared arrays while every worker is waiting
+
+    args:
+        envs (range): The indices of the games of the worker
+        names (dict): The name of the shared memory block of each array
+        layout (dict): The layout from _get_layout
+        barrier (Barrier): The barrier shared by the learner and every worker
+        command (RawValue): The command of the step
+        seed (int): The seed of game 0
+        num_envs (int): The number of games across every worker
+        max_episode_steps (int): The number of steps after which a game ends, None for no limit
+        four_kwargs (dict): The arguments of each HeadlessFour
+    """
+    blocks = {name: SharedMemory(block_name) for name, block_name in names.items()}
+    games = None
+
+    try:
+        games = _Games(envs, _attach(layout, blocks), seed, num_envs, max_episode_steps, four_kwargs)
+        games.reset()
+        barrier.wait() # the first observation is ready
+
+        while True:
+            barrier.wait()
+
+            if command.value == _CLOSE:
+                break
+            elif command.value == _RESET:
+                games.reset()
+            else:
+                games.step()
+
+            barrier.wait()
+    except threading.BrokenBarrierError:
+        pass # the learner or another worker failed, the learner reports it
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        games = None # release the views of the shared memory before closing it
+        for block in blocks.values():
+            block.close()
+
+class SharedVecFour():
+    def __init__(self, num_envs:int, num_workers:int = None, matrix_width:int = 10, matrix_height:int = 20, rotation_system:str = 'SRS', randomiser:str = '7BAG', queue_previews:int = 5, seed:int = 0, hold:bool = True, allowed_spins:str = 'ALL-MINI', max_episode_steps:int = None, timeout:float = 60):
+        """
+        N games of Four split across worker processes, each running HeadlessFour games, stepped in lockstep with one action per game per step.
+
+        The workers write the observations straight into NumPy arrays in shared memory, so nothing is pickled per step:
+        the learner writes the actions into a shared array, and the learner and the workers meet at a barrier before and after
+        every step. The observation, reward and done arrays returned are views of the shared memory that are overwritten by the
+        next step, copy them to keep them.
+
+        The actions and the observation have the layout of VecFour, so the two can be swapped. Each step performs one tick of Four,
+        so gravity, lock delay and spins follow the full rules. Games that top out (or reach max_episode_steps) are reset automatically,
+        the observation returned for them is the first of the new episode, and game i is seeded with seed + i plus num_envs per episode.
+
+        args:
+            num_envs (int): The number of games
+            num_workers (int): The number of worker processes, the number of CPUs if not provided
+            matrix_width (int): The width of the matrix
+            matrix_height (int): The visible height of the matrix
+            rotation_system (str): The rotation system to use
+            randomiser (str): The randomiser type to use
+            queue_previews (int): The number of queue previews in the observation
+            seed (int): The seed of game 0
+            hold (bool): Whether hold is enabled
+            allowed_spins (str): The spin ruleset
+            max_episode_steps (int): The number of steps after which a game ends, None for no limit
+            timeout (float): The longest time in seconds to wait for the workers to finish a step before giving up
+
+        methods:
+            reset(): Reset every game and return the observation
+            step(actions): Perform one action in every game and return the observation, reward and done arrays
+            observe(): Get the observation of every game
+            close(): Stop the workers and free the shared memory
+        """
+        num_workers = max(1, min(num_workers or os.cpu_count() or 1, num_envs))
+        queue_previews = min(queue_previews, 6)
+
+        self.num_envs = num_envs
+        self.num_workers = num_workers
+        self.WIDTH = matrix_width
+        self.HEIGHT = matrix_height * 2
+        self.timeout = timeout
+        self.closed = False
+
+        layout = _get_layout(num_envs, self.HEIGHT, self.WIDTH, queue_previews)
+        self.__blocks = {name: SharedMemory(create = True, size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)) for name, (shape, dtype) in layout.items()}
+        self.arrays = _attach(layout, self.__blocks)
+
+        context = mp.get_context()
+        self.__barrier = context.Barrier(num_workers + 1)
+        self.__command = context.RawValue('b', _STEP)
+
+        four_kwargs = {
+            'matrix_width': matrix_width, 'matrix_height': matrix_height, 'rotation_system': rotation_system, 'randomiser': randomiser,
+            'queue_previews': queue_previews, 'hold': hold, 'allowed_spins': allowed_spins,
+        }
+        names = {name: block.name for name, block in self.__blocks.items()}
+        bounds = np.linspace(0, num_envs, num_workers + 1).astype(int) # contiguous slices of games, so each worker writes its own rows
+
+        self.__workers = [
+            context.Process(target = _run_worker, args = (range(bounds[idx], bounds[idx + 1]), names, layout, self.__barrier, self.__command, seed, num_envs, max_episode_steps, four_kwargs),
+                            name = f'SharedVecFour-{idx}', daemon = True)
+            for idx in range(num_workers)
+        ]
+
+        for worker in self.__workers:
+            worker.start()
+
+        self.__wait() # the first observation
+
+    def reset(self):
+        """
+        Reset every game to the start of its next episode
+
+        returns:
+            (dict): The observation of every game
+        """
+        self.__run(_RESET)
+        return self.observe()
+
+    def step(self, actions):
+        """
+        Perform one action in every game, resetting games that end
+
+        args:
+            actions (array): The action id of each game, see VEC_ACTIONS
+
+        returns:
+            observation (dict): The observation of every game after the step
+            reward (array): The number of lines cleared by each game this step
+            done (array): Whether each game ended this step, these games have already been reset
+        """
+        self.arrays['actions'][:] = actions
+        self.__run(_STEP)
+        return self.observe(), self.arrays['reward'], self.arrays['done']
+
+    def observe(self):
+        """
+        Get the observation of every game, as views of the shared memory
+
+        returns:
+            (dict):
+                matrix (N, HEIGHT, WIDTH): The piece id of each placed block, 0 for an empty cell and GARBAGE_ID for other blocks, including the buffer zone
+                piece (N, 4): The piece id, rotation state, x and y of the current piece
+                hold (N,): The piece id of the held piece, 0 if nothing is held
+                can_hold (N,): Whether the current piece can be held
+                queue (N, queue_previews): The piece ids of the next pieces
+        """
+        return {name: self.arrays[name] for name in ('matrix', 'piece', 'hold', 'can_hold', 'queue')}
+
+    def close(self):
+        """
+        Stop the workers and free the shared memory
+        """
+        if self.closed:
+            return
+
+        self.closed = True
+        self.__command.value = _CLOSE
+
+        try:
+            self.__barrier.wait(self.timeout)
+        except threading.BrokenBarrierError:
+            pass
+
+        for worker in self.__workers:
+            worker.join(self.timeout)
+            if worker.is_alive():
+                worker.terminate()
+
+        self.arrays = None
+
+        for block in self.__blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                pass # observations kept by the caller still view the block, it is unmapped once they are gone
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __run(self, command:int):
+        """
+        Have every worker run a command: release them at the barrier, then wait for them to finish
+
+        args:
+            command (int): The command to run
+        """
+        if self.closed:
+            raise ValueError("\033[31mInvalid use of a closed SharedVecFour! \033[31m\033[0m")
+
+        self.__command.value = command
+        self.__wait()
+        self.__wait()
+
+    def __wait(self):
+        """
+        Wait at the barrier with the workers, raising if a worker failed or did not arrive in time
+        """
+        try:
+            self.__barrier.wait(self.timeout)
+        except threading.BrokenBarrierError:
+            exit_codes = [worker.exitcode for worker in self.__workers]
+            self.close()
+            raise RuntimeError(f"A SharedVecFour worker failed or timed out, worker exit codes: {exit_codes}") from None
@@ -1,8 +1,23 @@
-from utils import Vec2, get_tetromino_blocks
+from instance.utils import Vec2
 from instance.matrix import Matrix
-from input.handling.handling import Action
+from instance.pieces import SHAPES, PieceShape
+from input.handling.action import Action
 from core.state.struct_flags import FLAG
 
+# the direction a piece was pushed in, shared and read only so that setting the push flags does not allocate
+PUSH_LEFT = Vec2(-1, 0)
+PUSH_RIGHT = Vec2(1, 0)
+PUSH_DOWN = Vec2(0, 1)
+
+# the (x, y) corners of the T piece bounding box, the pair it faces in each rotation state and all 4 corners
+T_CORNER_PAIRS = (
+    ((0, 0), (2, 0)),
+    ((2, 0), (2, 2)),
+    ((2, 2), (0, 2)),
+    ((0, 2), (0, 0)),
+)
+T_CORNERS = ((0, 0), (2, 0), (0, 2), (2, 2))
+
 class Tetromino():
     def __init__(self, type:str, state:int, x:int, y:int, FlagStruct:FLAG, GameInstanceStruct):
         """
@@ -20,7 +35,7 @@ class Tetromino():
         """
         self.type = type
         self.state = state
-        self.blocks = get_tetromino_blocks(self.type)
+        self.shape = SHAPES[self.type][self.state] # allows for pre-rotation, default state is 0
         self.position = self.__get_origin(x, y)
         self.pivot = self.__get_pivot()
         
@@ -32,13 +47,25 @@ class Tetromino():
         self.lock_delay_counter = 0
         self.max_moves_before_lock = 15
         
-        # default state is 0, but this is allows for pre-rotation
-        if self.state == 1:
-            self.blocks = self.__rotate_cw()
-        elif self.state == 2:
-            self.blocks = self.__rotate_180()
-        elif self.state == 3:
-            self.blocks = self.__rotate_ccw()
+        # floor, wall and shadow queries are cached on (matrix version, x, y, state) and are recomputed when any of them change
+        self.__floor_key = None
+        self.__on_floor = False
+        self.__wall_key = None
+        self.__walls = {}
+        self.__shadow_key = None
+    
+    def __get_query_key(self):
+        """
+        Get the key that the cached queries of the piece are valid for
+        """
+        return (self.GameInstanceStruct.matrix.version, self.position.x, self.position.y, self.state)
+    
+    @property
+    def blocks(self):
+        """
+        The block grid of the current rotation state of the piece
+        """
+        return self.shape.blocks
 
     def __get_origin(self, x:int, y:int):
         """
@@ -67,7 +94,7 @@ class Tetromino():
         """
         Get the geometric center of the piece
         """
-        return Vec2(len(self.blocks) / 2, len(self.blocks) / 2)
+        return Vec2(self.shape.size / 2, self.shape.size / 2)
     
     # ========================================================== MOVEMENT ============================================================
             
@@ -80,23 +107,22 @@ class Tetromino():
         """
         match action:
             case Action.MOVE_LEFT:
-                vector = Vec2(-1, 0)
+                dx, push = -1, PUSH_LEFT
             
             case Action.MOVE_RIGHT:
-                vector = Vec2(1, 0)
+                dx, push = 1, PUSH_RIGHT
     
             case _:
-                vector = Vec2(0, 0)
                 raise ValueError(f"\033[31mInvalid movement action provided!: {action} \033[31m\033[0m")
             
-        if self.collision(self.blocks, vector + self.position): # validate movement
-            self.Flags.PUSH_HORIZONTAL = vector
+        if self.is_against_wall(dx): # validate movement
+            self.Flags.PUSH_HORIZONTAL = push
             return
 
         self.Flags.PUSH_HORIZONTAL = False
         self.__reset_lock_delay_valid_movement()
         self.reset_spin_flags() # spin is not valid if the piece can move after a rotation
-        self.position += vector
+        self.position.x += dx
        
     def sonic_move(self, action:Action):
         """
@@ -107,23 +133,21 @@ class Tetromino():
         """
         match action:
             case Action.SONIC_LEFT:
-                vector = Vec2(-1, 0)
+                dx, push = -1, PUSH_LEFT
             
             case Action.SONIC_RIGHT:
-                vector = Vec2(1, 0)
+                dx, push = 1, PUSH_RIGHT
     
             case _:
-                vector = Vec2(0, 0)
                 raise ValueError(f"\033[31mInvalid movement action provided!: {action} \033[31m\033[0m")
         
-        while not self.collision(self.blocks, vector + self.position):    
-            self.position += vector
+        while not self.is_against_wall(dx):    
+            self.position.x += dx
             self.__reset_lock_delay_valid_movement()
             self.reset_spin_flags()
             self.Flags.PUSH_HORIZONTAL = False
         
-        if self.collision(self.blocks, self.position + vector):
-            self.Flags.PUSH_HORIZONTAL = vector
+        self.Flags.PUSH_HORIZONTAL = push
         
     def sonic_move_and_drop(self, action:Action, PrefSD:bool):
         """
@@ -138,85 +162,95 @@ class Tetromino():
         """
         match action:
             case Action.SONIC_LEFT_DROP:
-                horizontal_vector = Vec2(-1, 0)
+                dx, push = -1, PUSH_LEFT
             case Action.SONIC_RIGHT_DROP:
-                horizontal_vector = Vec2(1, 0)
+                dx, push = 1, PUSH_RIGHT
             case _:
                 raise ValueError(f"\033[31mInvalid movement action provided!: {action} \033[31m\033[0m")
 
         if PrefSD:
-            if not self.collision(self.blocks, self.position + Vec2(0, 1)):
-                self.position += Vec2(0, 1)
+            if not self.is_on_floor():
+                self.position.y += 1
                 self.sonic_move_and_drop(action, PrefSD)
                 self.Flags.PUSH_VERTICAL = False
             else:
-                self.Flags.PUSH_VERTICAL = Vec2(0, 1)
-                if not self.collision(self.blocks, self.position + horizontal_vector):
+                self.Flags.PUSH_VERTICAL = PUSH_DOWN
+                if not self.is_against_wall(dx):
                     self.__reset_lock_delay_valid_movement()
                     self.reset_spin_flags()
-                    self.position += horizontal_vector
+                    self.position.x += dx
                     self.sonic_move_and_drop(action, PrefSD)
                     self.Flags.PUSH_HORIZONTAL = False
                 else:
-                    self.Flags.PUSH_HORIZONTAL = horizontal_vector
+                    self.Flags.PUSH_HORIZONTAL = push
                     return
         else:
-            if not self.collision(self.blocks, self.position + horizontal_vector): 
+            if not self.is_against_wall(dx): 
                 self.__reset_lock_delay_valid_movement()
                 self.reset_spin_flags()
-                self.position += horizontal_vector
+                self.position.x += dx
                 self.sonic_move_and_drop(action, PrefSD) 
                 self.Flags.PUSH_HORIZONTAL = False
             else:
-                self.Flags.PUSH_HORIZONTAL = horizontal_vector
-                if not self.collision(self.blocks, self.position + Vec2(0, 1)):
-                    self.position += Vec2(0, 1)
+                self.Flags.PUSH_HORIZONTAL = push
+                if not self.is_on_floor():
+                    self.position.y += 1
                     self.sonic_move_and_drop(action, PrefSD) 
                     self.Flags.PUSH_VERTICAL = False
                 else:
-                    self.Flags.PUSH_VERTICAL = Vec2(0, 1)
+                    self.Flags.PUSH_VERTICAL = PUSH_DOWN
                     return
     
     def attempt_to_move_downwards(self):
         """
         Attempt to move the piece downwards
         """
-        if self.collision(self.blocks, self.position + Vec2(0, 1)):
+        if self.is_on_floor():
             return
         else:
             self.reset_spin_flags() # spin is not valid if the piece can fall
-            self.position = self.position + Vec2(0, 1)
+            self.position.y += 1
+                
+    def move_to_floor(self):
+        """
+        Move the piece down until it is on the floor
+        """
+        distance = self.drop_distance()
+        
+        if distance < 0: # the piece already overlaps placed blocks, step it down until it rests on something
+            while not self.is_on_floor():
+                self.attempt_to_move_downwards()
+            return
+        
+        if distance > 0:
+            self.reset_spin_flags() # spin is not valid if the piece can fall
+            self.position.y += distance
+    
+    def drop_distance(self):
+        """
+        Get the number of rows the piece can fall before it lands, -1 if it already collides
+        """
+        return self.GameInstanceStruct.matrix.drop_distance(self.shape, self.position.x, self.position.y)
                 
-    def collision(self, desired_piece_blocks:list, desired_position:Vec2):
+    def collision(self, desired_shape:PieceShape, dx:int = 0, dy:int = 0):
         """
-        Check if the piece at the desired position will collide with the matrix bounds or other blocks
+        Check if the piece translated from its current position will collide with the matrix bounds or other blocks
         
         args:
-            desired_piece_blocks (list): The blocks of the piece at the desired position
-            desired_position (Vec2): The desired position of the piece
-            matrix (Matrix): The matrix object that contains the blocks that are already placed
+            desired_shape (PieceShape): The shape of the piece at the desired position
+            dx (int): The x translation from the current position of the piece
+            dy (int): The y translation from the current position of the piece
         
         returns
             (bool): True if the piece will collide, False otherwise
         """
-        if any (
-            val != 0 and (
-                desired_position.x + x < 0 or desired_position.x + x >= self.GameInstanceStruct.matrix.WIDTH or 
-                desired_position.y + y <= 0 or desired_position.y + y >= self.GameInstanceStruct.matrix.HEIGHT or 
-                self.GameInstanceStruct.matrix.matrix[desired_position.y + y][desired_position.x + x] != 0
-            )
-            for y, row in enumerate(desired_piece_blocks)
-            for x, val in enumerate(row)
-        ):
-            return True         
-        else:
-            return False
+        return self.GameInstanceStruct.matrix.collision(desired_shape, self.position.x + dx, self.position.y + dy)
         
     def get_height(self):
         """
         Get the true height of the piece, ignoring empty rows
         """
-        return sum(1 for row in self.blocks if any(cell != 0 for cell in row))
+        return self.shape.max_y - self.shape.min_y + 1
     
     def is_in_buffer_zone(self, matrix:Matrix):
         """
@@ -225,15 +259,7 @@ class Tetromino():
         args:
             matrix (Matrix): The matrix object that contains the blocks that are already placed
         """
-        if all(
-            self.position.y + y <= matrix.HEIGHT//2 - 1
-            for y, row in enumerate(self.blocks)
-            for x, val in enumerate(row)
-            if val != 0
-        ):
-            return True
-        else:
-            return False
+        return self.position.y + self.shape.max_y <= matrix.HEIGHT//2 - 1
     
     # ========================================================== ROTATION ============================================================
     
@@ -243,133 +269,75 @@ class Tetromino():
         
         args:
             action (Action): The action to perform
-            kick_table (dict): The kick table to use for the piece
+            kick_table (tuple): The compiled kick table of the rotation system
         """
         self.reset_spin_flags() # reset spin flags before rotation to avoid false positives
-        kick_table = self.__get_piece_kick_table(kick_table)
             
         match action:
             case Action.ROTATE_CLOCKWISE:    
                 desired_state = (self.state + 1) % 4
-                rotated_piece = self.__rotate_cw()
         
             case Action.ROTATE_COUNTERCLOCKWISE:
                 desired_state = (self.state - 1) % 4
-                rotated_piece = self.__rotate_ccw()
 
             case Action.ROTATE_180:
                 desired_state = (self.state + 2) % 4
-                rotated_piece = self.__rotate_180()
-        
-        self.__do_kick_tests(rotated_piece, desired_state, kick_table, offset = 0, action = action)
         
-    def __rotate_cw(self):
-        """
-        Rotate the piece clockwise
-        """
-        return [list(reversed(col)) for col in zip(*self.blocks)]
-    
-    def __rotate_ccw(self):
-        """
-        Rotate the piece counter clockwise
-        """
-        return [list(col) for col in reversed(list(zip(*self.blocks)))]
-    
-    def __rotate_180(self):
-        """
-        Rotate the piece 180 degrees
-        """
-        return [row[::-1] for row in reversed(self.blocks)]
-    
-    def __get_piece_kick_table(self, kick_table):
-        match self.type:
-            case 'T':
-                kick_table = kick_table['T_KICKS']
-            case 'S':
-                kick_table = kick_table['S_KICKS']
-            case 'Z':
-                kick_table = kick_table['Z_KICKS']
-            case 'L':
-                kick_table = kick_table['L_KICKS']
-            case 'J':
-                kick_table = kick_table['J_KICKS']    
-            case 'I':
-                kick_table = kick_table['I_KICKS']  
-            case 'O':
-                kick_table = kick_table['O_KICKS']
-         
-        return kick_table
+        kicks = kick_table[(self.shape.id * 4 + self.state) * 4 + desired_state]
+        self.__do_kick_tests(SHAPES[self.type][desired_state], desired_state, kicks, offset = 0, action = action)
     
     # ------------------------------------------------ KICK TESTS ------------------------------------------------
               
-    def __do_kick_tests(self, rotated_piece:list, desired_state:int, kick_table, offset:int, action):
+    def __do_kick_tests(self, rotated_shape:PieceShape, desired_state:int, kicks:tuple, offset:int, action):
         """
         Find a valid rotation of the piece by recursively applying kick translations to it
         until a valid rotation is found or no more offsets are available (rotation is invalid).
         
         args:
-            rotated_piece (list): The rotated piece
+            rotated_shape (PieceShape): The shape of the desired rotation state
             desired_state (int): Desired rotation state of the piece [0, 1, 2, 3]
-            kick_table (dict): The kick table containing the kicks to apply to the piece for the given rotation type
-            offset (int): The kick translation to try from the kick table
+            kicks (tuple): The (dx, dy) kick translations to try for the rotation, y is already inverted
+            offset (int): The kick translation to try from the kicks
             
         returns:
             (None): if the rotation is invalid
         """
         self.reset_spin_flags()
-        kick = self.__get_kick(kick_table, desired_state, offset)
         
-        if kick is None: # no more offsets to try => rotation is invalid
+        if offset >= len(kicks): # no more offsets to try => rotation is invalid
             return
 
-        kick = Vec2(kick.x, -kick.y) # have to invert y as top left of the matrix is (0, 0)
+        kick_x, kick_y = kicks[offset]
          
-        if self.collision(rotated_piece, self.position + kick): 
-            self.__do_kick_tests(rotated_piece, desired_state, kick_table, offset + 1, action) 
+        if self.collision(rotated_shape, kick_x, kick_y): 
+            self.__do_kick_tests(rotated_shape, desired_state, kicks, offset + 1, action) 
         else:
             if self.type == 'T':
-                self.__Is_T_Spin(offset, desired_state, kick, action)
+                self.__Is_T_Spin(offset, desired_state, kick_x, kick_y, action)
                 
             else: # all other pieces use immobility test for spin detection
                 if not self.GameInstanceStruct.allowed_spins == 'STUPID': 
-                    self.__is_spin(rotated_piece, kick, action)
+                    self.__is_spin(rotated_shape, kick_x, kick_y, action)
             
             self.__reset_lock_delay_valid_movement() 
             self.state = desired_state
-            self.blocks = rotated_piece
-            self.position += kick
+            self.shape = rotated_shape
+            self.position.x += kick_x
+            self.position.y += kick_y
             
             if self.GameInstanceStruct.allowed_spins == 'STUPID': # stupid mode is done at the end of the rotation since we detect if its on the floor
-                self.__is_spin(self.blocks, Vec2(0, 0), action)
+                self.__is_spin(self.shape, 0, 0, action)
               
-    def __get_kick(self, kick_table, desired_state:int, offset:int):
-        """
-        Get the kick translation to apply to the piece for the given offset_order
-     
-        args:
-            kick_table (dict): The kick table containing the kicks to apply to the piece for the given rotation type
-            initial_state (int): Initial rotation state of the piece: [0, 1, 2, 3]
-            desired_state (int): Desired rotation state of the piece: [0, 1, 2, 3]
-            offset (int): The kick translation to try from the kick table
-        
-        returns:
-            kick (Vec2): The kick translation to apply to the piece
-        """
-        
-        if offset > len(kick_table[f'{self.state}->{desired_state}']) - 1:
-            return None
-        else:
-            return kick_table[f'{self.state}->{desired_state}'][offset]
-    
     # ------------------------------------------------ SPIN TESTS ------------------------------------------------
        
-    def __is_spin(self, rotated_piece:int, kick:Vec2, action):
+    def __is_spin(self, rotated_shape:PieceShape, kick_x:int, kick_y:int, action):
         """
         check if the rotation is a spin: this is when the piece rotates into an position where it is then immobile
         
         args:
-            rotated_piece (list): The rotated piece
-            kick (Vec2): The kick translation to apply
+            rotated_shape (PieceShape): The shape of the desired rotation state
+            kick_x (int): The x kick translation to apply
+            kick_y (int): The y kick translation to apply
         """
         if self.GameInstanceStruct.allowed_spins == 'T-SPIN': # only allow T-Spins
             return 
@@ -382,7 +350,7 @@ class Tetromino():
                 self.Flags.SPIN_DIRECTION = action
                 self.Flags.SPIN_ANIMATION = True
         else:
-            if self.collision(rotated_piece, self.position + kick + Vec2(1, 0)) and self.collision(rotated_piece, self.position + kick + Vec2(-1, 0)) and self.collision(rotated_piece, self.position + kick+ Vec2(0, 1)) and self.collision(rotated_piece, self.position + kick + Vec2(0, -1)):
+            if self.collision(rotated_shape, kick_x + 1, kick_y) and self.collision(rotated_shape, kick_x - 1, kick_y) and self.collision(rotated_shape, kick_x, kick_y + 1) and self.collision(rotated_shape, kick_x, kick_y - 1):
                 self.Flags.IS_SPIN = self.type
                 
                 if self.GameInstanceStruct.allowed_spins == 'ALL-MINI': # allow t spins and t spin minis, everything else is a mini
@@ -394,7 +362,7 @@ class Tetromino():
                     self.Flags.SPIN_DIRECTION = action 
                     self.Flags.SPIN_ANIMATION = True
                      
-    def __Is_T_Spin(self, offset:int, desired_state:int, kick:Vec2, action):
+    def __Is_T_Spin(self, offset:int, desired_state:int, kick_x:int, kick_y:int, action):
         """
         Test if the T piece rotation is a T-spin.
         
@@ -413,20 +381,14 @@ class Tetromino():
         args:
             offset (int): The kick translation to try from the kick table
             desired_state (int): Desired rotation state of the piece [0, 1, 2, 3]
-            kick (Vec2): The kick translation to apply  
-        """
-        corner_pairs = {
-            0: [Vec2(0, 0), Vec2(2, 0)],
-            1: [Vec2(2, 0), Vec2(2, 2)],
-            2: [Vec2(2, 2), Vec2(0, 2)],
-            3: [Vec2(0, 2), Vec2(0, 0)]
-        }
-            
-        filled_corners = self.__test_corners(corner_pairs[desired_state], kick) # do facing test
+            kick_x (int): The x kick translation to apply
+            kick_y (int): The y kick translation to apply
+        """
+        filled_corners = self.__test_corners(T_CORNER_PAIRS[desired_state], kick_x, kick_y) # do facing test
             
         if len(filled_corners) == 1: # 1 corner test for T-Spin Mini
     
-            filled_corners = self.__test_corners(corner_pairs[(desired_state + 2) % 4], kick) # do back corner test
+            filled_corners = self.__test_corners(T_CORNER_PAIRS[(desired_state + 2) % 4], kick_x, kick_y) # do back corner test
             
             if len(filled_corners) > 1:
                 
@@ -449,8 +411,7 @@ class Tetromino():
             
         elif len(filled_corners) == 2: # 2 corner test for T-Spin
         
-            corners = [Vec2(0, 0), Vec2(2, 0), Vec2(0, 2), Vec2(2, 2)]
-            filled_corners = self.__test_corners(corners, kick)
+            filled_corners = self.__test_corners(T_CORNERS, kick_x, kick_y)
             
             if len(filled_corners) >= 3: # 3 corner test for T-Spin
                 self.Flags.IS_SPIN = self.type
@@ -462,25 +423,29 @@ class Tetromino():
             self.Flags.IS_SPIN = False
             self.Flags.IS_MINI = False
     
-    def __test_corners(self, corners:list, kick:Vec2):
+    def __test_corners(self, corners:tuple, kick_x:int, kick_y:int):
         """
         Test if the corners of the pieces bounding box are occupied
         
         args:
-            corners (list): The corners of the piece bounding box
-            kick (Vec2): The kick translation to apply
+            corners (tuple): The (x, y) corners of the piece bounding box
+            kick_x (int): The x kick translation to apply
+            kick_y (int): The y kick translation to apply
         
         returns:
             filled_corners (list): The corners that are occupied
         """
+        x, y = self.position.x + kick_x, self.position.y + kick_y
+        matrix = self.GameInstanceStruct.matrix
+        
         return [
-            corner for _, corner in enumerate(corners)
+            corner for corner in corners
             if (
-                (corner_pos := self.position + kick + corner).x < 0 or 
-                corner_pos.x >= self.GameInstanceStruct.matrix.WIDTH or 
-                corner_pos.y < 0 or 
-                corner_pos.y >= self.GameInstanceStruct.matrix.HEIGHT or 
-                self.GameInstanceStruct.matrix.matrix[corner_pos.y][corner_pos.x] != 0
+                (corner_x := x + corner[0]) < 0 or 
+                corner_x >= matrix.WIDTH or 
+                (corner_y := y + corner[1]) < 0 or 
+                corner_y >= matrix.HEIGHT or 
+                matrix.matrix[corner_y][corner_x] != 0
             )
         ]
             
@@ -490,14 +455,39 @@ class Tetromino():
         """
         Check if the piece is on the floor
         """
-        return self.collision(self.blocks, self.position + Vec2(0, 1))
+        key = self.__get_query_key()
+        
+        if key != self.__floor_key:
+            self.__floor_key = key
+            self.__on_floor = self.collision(self.shape, 0, 1)
+            
+        return self.__on_floor
+    
+    def is_against_wall(self, dx:int):
+        """
+        Check if the piece cannot move one column in the given direction
+        
+        args:
+            dx (int): The direction to test: -1 for left, 1 for right
+        """
+        key = self.__get_query_key()
+        
+        if key != self.__wall_key:
+            self.__wall_key = key
+            self.__walls.clear()
+        
+        try:
+            return self.__walls[dx]
+        except KeyError:
+            self.__walls[dx] = self.collision(self.shape, dx, 0)
+            return self.__walls[dx]
     
     def reset_lock_delay_lower_pivot(self):
         """
         Update the lowest pivot position of the piece and reset the lock delay if it is 
         lower than the previous lowest pivot position
         """
-        pivot_pos_y = self.GameInstanceStruct.matrix.HEIGHT - (len(self.blocks) / 2 + self.position.y)
+        pivot_pos_y = self.GameInstanceStruct.matrix.HEIGHT - (self.shape.size / 2 + self.position.y)
 
         if pivot_pos_y < self.lowest_pivot_position:
             self.lowest_pivot_position = pivot_pos_y
@@ -521,13 +511,39 @@ class Tetromino():
         """
         Create a shadow of the piece that shows where the piece will land
         """
-        self.shadow_position = Vec2(self.position.x, self.position.y)
+        key = self.__get_query_key()
         
-        while not self.collision(self.blocks, self.shadow_position):
-            self.shadow_position.y += 1
-            
-        self.shadow_position.y -= 1
-        self.shadow_position.x = self.position.x 
+        if key == self.__shadow_key:
+            return
+        
+        self.__shadow_key = key
+        self.shadow_position.x = self.position.x
+        self.shadow_position.y = self.position.y + self.drop_distance()
+    
+    # ========================================================== SNAPSHOTS ============================================================
+    
+    def snapshot(self):
+        """
+        Get an immutable record of the piece
+        
+        returns:
+            (tuple): The type, rotation state, position, shadow position, lowest pivot position, lock delay counter and moves left before lock
+        """
+        return (self.type, self.state, self.position.x, self.position.y, self.shadow_position.x, self.shadow_position.y, self.lowest_pivot_position, self.lock_delay_counter, self.max_moves_before_lock)
+    
+    def restore(self, snapshot:tuple):
+        """
+        Put the piece back to a snapshot, the piece may be of another type
+        
+        args:
+            snapshot (tuple): A snapshot taken by snapshot()
+        """
+        self.type, self.state, self.position.x, self.position.y, self.shadow_position.x, self.shadow_position.y, self.lowest_pivot_position, self.lock_delay_counter, self.max_moves_before_lock = snapshot
+        self.shape = SHAPES[self.type][self.state]
+        self.pivot = self.__get_pivot()
+        self.__floor_key = None
+        self.__wall_key = None
+        self.__shadow_key = None
     
     def reset_spin_flags(self):
         self.Flags.IS_SPIN = False
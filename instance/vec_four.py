@@ -0,0 +1,630 @@
+import numpy as np
+from input.handling.action import Action
+from instance.pieces import PIECE_TYPES, SHAPES
+from instance.rotation import compile_kick_table
+
+# The actions a VecFour env can take each step, the index of an action is its action id. Id 0 does nothing.
+VEC_ACTIONS = (
+    None,
+    Action.MOVE_LEFT,
+    Action.MOVE_RIGHT,
+    Action.ROTATE_CLOCKWISE,
+    Action.ROTATE_COUNTERCLOCKWISE,
+    Action.ROTATE_180,
+    Action.SOFT_DROP,
+    Action.HARD_DROP,
+    Action.HOLD,
+    Action.SONIC_LEFT,
+    Action.SONIC_RIGHT,
+    Action.SONIC_DROP,
+)
+
+VEC_ACTION_IDS = {action: idx for idx, action in enumerate(VEC_ACTIONS) if action is not None}
+
+RANDOMISERS = ('7BAG', '14BAG', 'CLASSIC', 'PAIRS', 'RANDOM')
+
+_MODULUS = 2147483647 # the MINSTD parameters used by instance.four.RNG
+_MULTIPLIER = 16807
+
+_ROTATIONS = {
+    Action.ROTATE_CLOCKWISE: 1,
+    Action.ROTATE_COUNTERCLOCKWISE: 3,
+    Action.ROTATE_180: 2,
+}
+
+def _build_cell_table():
+    """
+    Build the (piece id, state, cell, (x, y)) table of the cell offsets of every rotation state, id 0 is unused
+    """
+    cells = np.zeros((len(PIECE_TYPES) + 1, 4, 4, 2), dtype = np.int64)
+
+    for type in PIECE_TYPES:
+        for shape in SHAPES[type]:
+            cells[shape.id, shape.state] = shape.cells
+
+    return cells
+
+def _build_kick_arrays(rotation_system:str):
+    """
+    Pad the compiled kick table of a rotation system into a (rotation index, kick, (dx, dy)) array and the number of kicks of each rotation
+
+    args:
+        rotation_system (str): The rotation system to use
+    """
+    kick_table = compile_kick_table(rotation_system)
+    max_kicks = max(len(kicks) for kicks in kick_table)
+
+    kicks = np.zeros((len(kick_table), max_kicks, 2), dtype = np.int64)
+    counts = np.zeros(len(kick_table), dtype = np.int64)
+
+    for idx, offsets in enumerate(kick_table):
+        counts[idx] = len(offsets)
+
+        if offsets:
+            kicks[idx, :len(offsets)] = offsets
+
+    return kicks, counts
+
+CELLS = _build_cell_table()
+MAX_Y = CELLS[..., 1].max(axis = 2) # bottommost occupied row of each (piece id, state)
+SIZES = np.array([0] + [SHAPES[type][0].size for type in PIECE_TYPES], dtype = np.int64)
+
+class VecFour():
+    def __init__(self, num_envs:int, matrix_width:int = 10, matrix_height:int = 20, rotation_system:str = 'SRS', randomiser:str = '7BAG', queue_previews:int = 5, seed:int = 0, hold:bool = True, gravity:float = 0, lock_delay:int = 30, lock_out_ok:bool = True, max_episode_steps:int = None):
+        """
+        N games of Four held in NumPy arrays and stepped in lockstep, one action per game per step.
+
+        Each step applies the action of every game, then gravity and lock delay, then locks, clears lines and spawns
+        the next piece where a piece locked. Games that top out (or reach max_episode_steps) are reset automatically,
+        the observation returned for them is the first of the new episode.
+
+        Pieces move, rotate (with the kicks of the rotation system), hold, spawn and top out as in Four, and the piece sequence
+        of a game is the same as Four's for the same seed and randomiser. The timing model is simpler: gravity and lock delay
+        are counted in steps instead of ticks, lock delay is reset by up to 15 successful moves or rotations while on the floor
+        and the resets are replenished when the piece reaches a new lowest position. Spins are not detected.
+
+        args:
+            num_envs (int): The number of games
+            matrix_width (int): The width of the matrix
+            matrix_height (int): The visible height of the matrix
+            rotation_system (str): The rotation system to use
+            randomiser (str): The randomiser type to use: ['7BAG', '14BAG', 'CLASSIC', 'PAIRS', 'RANDOM']
+            queue_previews (int): The number of queue previews in the observation
+            seed (int): The seed of game 0, game i is seeded with seed + i and each reset adds num_envs to its seed
+            hold (bool): Whether hold is enabled
+            gravity (float): The number of rows the piece falls per step, 0 for no gravity and 20 or more to drop instantly
+            lock_delay (int): The number of steps a piece can spend on the floor before it locks
+            lock_out_ok (bool): Whether locking a piece entirely in the buffer zone is allowed
+            max_episode_steps (int): The number of steps after which a game ends, None for no limit
+
+        methods:
+            reset(envs): Reset games and return the observation
+            step(actions): Perform one action in every game and return the observation, reward and done arrays
+            observe(): Get the observation of every game
+        """
+        if randomiser not in RANDOMISERS:
+            raise ValueError(f"\033[31mInvalid randomiser provided!: {randomiser} \033[31m\033[0m")
+
+        if queue_previews < 0:
+            raise ValueError(f"\033[31mInvalid queue previews provided!: {queue_previews} \033[31m\033[0m")
+
+        self.num_envs = num_envs
+        self.WIDTH = matrix_width
+        self.HEIGHT = matrix_height * 2
+        self.randomiser = randomiser
+        self.queue_previews = queue_previews # the queue buffer is sized from it, so any number of previews fits
+        self.seed = seed
+        self.hold_enabled = hold
+        self.gravity = gravity
+        self.lock_delay = lock_delay
+        self.lock_out_ok = lock_out_ok
+        self.max_episode_steps = max_episode_steps
+
+        self.kicks, self.kick_counts = _build_kick_arrays(rotation_system)
+
+        self.tetrominos = np.arange(1, len(PIECE_TYPES) + 1, dtype = np.int64)
+        if randomiser == '14BAG':
+            self.tetrominos = np.concatenate([self.tetrominos, self.tetrominos])
+
+        self.spawn_x = (self.WIDTH - 1) // 2 - np.array([0] + [0 if type == 'O' else 1 for type in PIECE_TYPES], dtype = np.int64) # as Tetromino.__get_origin
+        self.spawn_y = self.HEIGHT // 2 - 3
+
+        N = num_envs
+        self.envs = np.arange(N)
+        self.matrix = np.zeros((N, self.HEIGHT, self.WIDTH), dtype = np.uint8)
+
+        self.piece = np.zeros(N, dtype = np.int64)
+        self.state = np.zeros(N, dtype = np.int64)
+        self.x = np.zeros(N, dtype = np.int64)
+        self.y = np.zeros(N, dtype = np.int64)
+
+        self.held = np.zeros(N, dtype = np.int64)
+        self.can_hold = np.ones(N, dtype = bool)
+
+        self.queue = np.zeros((N, self.queue_previews + 1 + len(self.tetrominos)), dtype = np.int64)
+        self.queue_length = np.zeros(N, dtype = np.int64)
+        self.rng = np.zeros(N, dtype = np.int64)
+        self.last_generated = np.full(N, -1, dtype = np.int64)
+
+        self.gravity_counter = np.zeros(N, dtype = np.float64)
+        self.lock_delay_counter = np.zeros(N, dtype = np.int64)
+        self.moves_before_lock = np.zeros(N, dtype = np.int64)
+        self.lowest_pivot = np.zeros(N, dtype = np.int64)
+
+        self.episodes = np.zeros(N, dtype = np.int64)
+        self.steps = np.zeros(N, dtype = np.int64)
+        self.lines_cleared = np.zeros(N, dtype = np.int64)
+
+        self.reset()
+
+    # ========================================================== RESET ============================================================
+
+    def reset(self, envs = None):
+        """
+        Reset games to an empty matrix with a new piece sequence
+
+        args:
+            envs (array): The indices of the games to reset, all games if not provided
+
+        returns:
+            (dict): The observation of every game
+        """
+        envs = self.envs if envs is None else np.asarray(envs, dtype = np.int64)
+
+        if len(envs) == 0:
+            return self.observe()
+
+        seeds = (self.seed + envs + self.episodes[envs] * self.num_envs) % _MODULUS # as RNG.__init__
+        self.rng[envs] = np.where(seeds <= 0, seeds + _MODULUS - 1, seeds)
+
+        self.matrix[envs] = 0
+        self.held[envs] = 0
+        self.can_hold[envs] = True
+        self.queue_length[envs] = 0
+        self.last_generated[envs] = -1
+        self.gravity_counter[envs] = 0
+        self.steps[envs] = 0
+        self.lines_cleared[envs] = 0
+
+        self.__fill_queue(envs)
+        self.__spawn(envs, self.__pop_queue(envs))
+
+        return self.observe()
+
+    # ========================================================== STEP ============================================================
+
+    def step(self, actions):
+        """
+        Perform one action in every game, then gravity, lock delay, locking, line clears, spawning and auto reset
+
+        args:
+            actions (array): The action id of each game, see VEC_ACTIONS
+
+        returns:
+            observation (dict): The observation of every game after the step
+            reward (array): The number of lines cleared by each game this step
+            done (array): Whether each game ended this step, these games have already been reset
+        """
+        actions = np.asarray(actions, dtype = np.int64)
+        hard_drop = actions == VEC_ACTION_IDS[Action.HARD_DROP]
+
+        for action, dx in ((Action.MOVE_LEFT, -1), (Action.MOVE_RIGHT, 1)):
+            self.__move(np.flatnonzero(actions == VEC_ACTION_IDS[action]), dx)
+
+        for action, dx in ((Action.SONIC_LEFT, -1), (Action.SONIC_RIGHT, 1)):
+            self.__sonic_move(np.flatnonzero(actions == VEC_ACTION_IDS[action]), dx)
+
+        for action, rotation in _ROTATIONS.items():
+            self.__rotate(np.flatnonzero(actions == VEC_ACTION_IDS[action]), rotation)
+
+        done = np.zeros(self.num_envs, dtype = bool)
+        done[self.__hold(np.flatnonzero(actions == VEC_ACTION_IDS[Action.HOLD]))] = True
+        self.__drop(np.flatnonzero(actions == VEC_ACTION_IDS[Action.SOFT_DROP]), 1)
+        self.__drop(np.flatnonzero(hard_drop | (actions == VEC_ACTION_IDS[Action.SONIC_DROP])), self.HEIGHT)
+
+        self.__apply_gravity()
+
+        on_floor = self.__collides(self.envs, self.piece, self.state, self.x, self.y + 1)
+        self.lock_delay_counter = np.where(on_floor, self.lock_delay_counter + 1, 0)
+        lock = hard_drop | (on_floor & ((self.lock_delay_counter >= self.lock_delay) | (self.moves_before_lock <= 0)))
+
+        locked = np.flatnonzero(lock & ~done)
+        reward = np.zeros(self.num_envs, dtype = np.float32)
+
+        if len(locked):
+            done[locked] = self.__lock(locked)
+            reward[locked] = self.__clear_lines(locked)
+            spawning = locked[~done[locked]]
+            done[spawning] = ~self.__spawn(spawning, self.__pop_queue(spawning))
+
+        self.__update_lowest_pivot(self.envs)
+        self.steps += 1
+
+        if self.max_episode_steps is not None:
+            done |= self.steps >= self.max_episode_steps
+
+        ended = np.flatnonzero(done)
+
+        if len(ended):
+            self.episodes[ended] += 1
+            self.reset(ended)
+
+        return self.observe(), reward, done
+
+    def observe(self):
+        """
+        Get the observation of every game
+
+        returns:
+            (dict):
+                matrix (N, HEIGHT, WIDTH): The piece id of each placed block, 0 for an empty cell, including the buffer zone
+                piece (N, 4): The piece id, rotation state, x and y of the current piece
+                hold (N,): The piece id of the held piece, 0 if nothing is held
+                can_hold (N,): Whether the current piece can be held
+                queue (N, queue_previews): The piece ids of the next pieces
+        """
+        return {
+            'matrix': self.matrix.copy(),
+            'piece': np.stack([self.piece, self.state, self.x, self.y], axis = 1),
+            'hold': self.held.copy(),
+            'can_hold': self.can_hold.copy(),
+            'queue': self.queue[:, :self.queue_previews].copy(),
+        }
+
+    # ========================================================== COLLISION ============================================================
+
+    def __collides(self, envs, pieces, states, xs, ys):
+        """
+        Check if pieces collide with the matrix bounds or the blocks already placed in their games.
+        All arguments are broadcast together and the result has their shape.
+
+        args:
+            envs (array): The game of each piece
+            pieces (array): The piece ids
+            states (array): The rotation states
+            xs (array): The x positions
+            ys (array): The y positions
+        """
+        cells = CELLS[pieces, states]
+        cell_x = np.asarray(xs)[..., None] + cells[..., 0]
+        cell_y = np.asarray(ys)[..., None] + cells[..., 1]
+
+        out_of_bounds = (cell_x < 0) | (cell_x >= self.WIDTH) | (cell_y <= 0) | (cell_y >= self.HEIGHT)
+        occupied = self.matrix[np.asarray(envs)[..., None], np.clip(cell_y, 0, self.HEIGHT - 1), np.clip(cell_x, 0, self.WIDTH - 1)] != 0
+
+        return (out_of_bounds | occupied).any(axis = -1)
+
+    def __drop_distance(self, envs):
+        """
+        Get the number of rows the current pieces of the games can fall before they land
+
+        args:
+            envs (array): The indices of the games
+        """
+        offsets = np.arange(1, self.HEIGHT + 1)
+        collides = self.__collides(envs[:, None], self.piece[envs, None], self.state[envs, None], self.x[envs, None], self.y[envs, None] + offsets)
+        return collides.argmax(axis = 1) # the first offset that collides, every piece collides by HEIGHT rows down
+
+    # ========================================================== MOVEMENT ============================================================
+
+    def __valid_movement(self, envs):
+        """
+        Reset the lock delay of pieces that moved or rotated, using up a move reset if they were on the floor
+
+        args:
+            envs (array): The indices of the games
+        """
+        on_floor = self.__collides(envs, self.piece[envs], self.state[envs], self.x[envs], self.y[envs] + 1)
+        self.lock_delay_counter[envs] = 0
+        self.moves_before_lock[envs] -= on_floor
+
+    def __move(self, envs, dx:int):
+        """
+        Move the current pieces one column if they do not collide
+
+        args:
+            envs (array): The indices of the games
+            dx (int): The direction to move: -1 for left, 1 for right
+        """
+        if len(envs) == 0:
+            return
+
+        envs = envs[~self.__collides(envs, self.piece[envs], self.state[envs], self.x[envs] + dx, self.y[envs])]
+        self.__valid_movement(envs)
+        self.x[envs] += dx
+
+    def __sonic_move(self, envs, dx:int):
+        """
+        Move the current pieces as far as they can go in a direction
+
+        args:
+            envs (array): The indices of the games
+            dx (int): The direction to move: -1 for left, 1 for right
+        """
+        for _ in range(self.WIDTH):
+            if len(envs) == 0:
+                return
+
+            envs = envs[~self.__collides(envs, self.piece[envs], self.state[envs], self.x[envs] + dx, self.y[envs])]
+            self.x[envs] += dx
+            self.__valid_movement(envs)
+
+    def __drop(self, envs, rows:int):
+        """
+        Move the current pieces down by up to a number of rows
+
+        args:
+            envs (array): The indices of the games
+            rows (int): The maximum number of rows to move down
+        """
+        if len(envs) == 0:
+            return
+
+        self.y[envs] += np.minimum(self.__drop_distance(envs), rows)
+
+    def __apply_gravity(self):
+        """
+        Move every current piece down by the whole rows of gravity accumulated
+        """
+        if self.gravity <= 0:
+            return
+
+        if self.gravity >= 20: # instant gravity
+            self.__drop(self.envs, self.HEIGHT)
+            return
+
+        self.gravity_counter += self.gravity
+        rows = np.floor(self.gravity_counter).astype(np.int64)
+        self.gravity_counter -= rows
+
+        envs = np.flatnonzero(rows)
+
+        if len(envs):
+            self.y[envs] += np.minimum(self.__drop_distance(envs), rows[envs])
+
+    def __update_lowest_pivot(self, envs):
+        """
+        Replenish the lock delay and move resets of pieces whose pivot is lower than it has been before, as Tetromino.reset_lock_delay_lower_pivot
+
+        args:
+            envs (array): The indices of the games
+        """
+        pivot = 2 * self.y[envs] + SIZES[self.piece[envs]] # twice the y of the pivot, to stay in integers
+        lower = pivot > self.lowest_pivot[envs]
+        envs, pivot = envs[lower], pivot[lower]
+
+        self.lowest_pivot[envs] = pivot
+        self.lock_delay_counter[envs] = 0
+        self.moves_before_lock[envs] = 15
+
+    # ========================================================== ROTATION ============================================================
+
+    def __rotate(self, envs, rotation:int):
+        """
+        Rotate the current pieces, trying each kick of the rotation system in order until one does not collide
+
+        args:
+            envs (array): The indices of the games
+            rotation (int): The number of clockwise quarter turns: [1, 2, 3]
+        """
+        if len(envs) == 0:
+            return
+
+        desired_state = (self.state[envs] + rotation) % 4
+        rotation_idx = (self.piece[envs] * 4 + self.state[envs]) * 4 + desired_state
+        kicks = self.kicks[rotation_idx]
+
+        collides = self.__collides(envs[:, None], self.piece[envs, None], desired_state[:, None], self.x[envs, None] + kicks[..., 0], self.y[envs, None] + kicks[..., 1])
+        collides |= np.arange(kicks.shape[1]) >= self.kick_counts[rotation_idx][:, None]
+
+        valid = ~collides.all(axis = 1)
+        kick = kicks[np.arange(len(envs)), (~collides).argmax(axis = 1)]
+        envs, desired_state, kick = envs[valid], desired_state[valid], kick[valid]
+
+        self.__valid_movement(envs)
+        self.state[envs] = desired_state
+        self.x[envs] += kick[:, 0]
+        self.y[envs] += kick[:, 1]
+
+    # ========================================================== HOLD ============================================================
+
+    def __hold(self, envs):
+        """
+        Hold the current pieces, swapping in the held piece or the next piece in the queue
+
+        args:
+            envs (array): The indices of the games
+
+        returns:
+            (array): The games that blocked out
+        """
+        if not self.hold_enabled:
+            return envs[:0]
+
+        envs = envs[self.can_hold[envs]]
+
+        if len(envs) == 0:
+            return envs
+
+        next_pieces = self.held[envs].copy()
+        self.held[envs] = self.piece[envs]
+
+        from_queue = envs[next_pieces == 0]
+        next_pieces[next_pieces == 0] = self.queue[from_queue, 0]
+
+        spawned = self.__spawn(envs, next_pieces, peek_queue = from_queue)
+        self.can_hold[envs] = False
+
+        return envs[~spawned]
+
+    # ========================================================== LOCKING ============================================================
+
+    def __lock(self, envs):
+        """
+        Place the current pieces into their matrices
+
+        args:
+            envs (array): The indices of the games
+
+        returns:
+            (array): Whether each game locked out
+        """
+        cells = CELLS[self.piece[envs], self.state[envs]]
+        self.matrix[envs[:, None], self.y[envs, None] + cells[..., 1], self.x[envs, None] + cells[..., 0]] = self.piece[envs, None]
+
+        if self.lock_out_ok:
+            return np.zeros(len(envs), dtype = bool)
+
+        return self.y[envs] + MAX_Y[self.piece[envs], self.state[envs]] <= self.HEIGHT // 2 - 1 # the piece is entirely in the buffer zone
+
+    def __clear_lines(self, envs):
+        """
+        Remove the full lines of the matrices, moving the rows above them down
+
+        args:
+            envs (array): The indices of the games
+
+        returns:
+            (array): The number of lines each game cleared
+        """
+        full = (self.matrix[envs] != 0).all(axis = 2)
+        cleared = full.sum(axis = 1)
+
+        clearing = cleared > 0
+        envs, full, cleared_rows = envs[clearing], full[clearing], cleared[clearing]
+
+        if len(envs):
+            order = np.argsort(~full, axis = 1, kind = 'stable') # full rows first, the remaining rows keep their order
+            matrices = np.take_along_axis(self.matrix[envs], order[:, :, None], axis = 1)
+            matrices[np.arange(self.HEIGHT) < cleared_rows[:, None]] = 0
+            self.matrix[envs] = matrices
+            self.lines_cleared[envs] += cleared_rows
+
+        return cleared
+
+    # ========================================================== SPAWNING ============================================================
+
+    def __spawn(self, envs, pieces, peek_queue = None):
+        """
+        Spawn new pieces at the top of the matrix
+
+        args:
+            envs (array): The indices of the games
+            pieces (array): The piece ids to spawn
+            peek_queue (array): The games whose new piece was only viewed in the queue, it is removed from the queue if the piece can spawn
+
+        returns:
+            (array): Whether each piece could spawn, a game is blocked out if it could not
+        """
+        self.piece[envs] = pieces
+        self.state[envs] = 0
+        self.x[envs] = self.spawn_x[pieces]
+        self.y[envs] = self.spawn_y
+
+        self.can_hold[envs] = True
+        self.gravity_counter[envs] = 0
+        self.lock_delay_counter[envs] = 0
+        self.moves_before_lock[envs] = 15
+        self.lowest_pivot[envs] = 2 * self.y[envs] + SIZES[pieces]
+
+        spawned = ~self.__collides(envs, pieces, 0, self.x[envs], self.y[envs])
+
+        if peek_queue is not None and len(peek_queue):
+            self.__pop_queue(np.intersect1d(peek_queue, envs[spawned]))
+
+        return spawned
+
+    # ========================================================== QUEUE ============================================================
+
+    def __pop_queue(self, envs):
+        """
+        Remove and return the next piece in the queue of each game, refilling the queues
+
+        args:
+            envs (array): The indices of the games
+        """
+        pieces = self.queue[envs, 0].copy()
+        self.queue[envs, :-1] = self.queue[envs, 1:]
+        self.queue_length[envs] -= 1
+        self.__fill_queue(envs)
+        return pieces
+
+    def __fill_queue(self, envs):
+        """
+        Generate pieces until the queue of each game holds at least the previews and the next piece
+
+        args:
+            envs (array): The indices of the games
+        """
+        envs = envs[self.queue_length[envs] <= self.queue_previews]
+
+        while len(envs):
+            match self.randomiser:
+                case '7BAG' | '14BAG':
+                    pieces = self.__shuffle(envs, np.tile(self.tetrominos, (len(envs), 1)))
+                case 'PAIRS':
+                    pieces = self.__shuffle(envs, np.tile(self.tetrominos, (len(envs), 1)))
+                    pieces = self.__shuffle(envs, np.repeat(pieces[:, :2], 3, axis = 1))
+                case 'CLASSIC':
+                    pieces = self.__classic(envs)
+                case 'RANDOM':
+                    pieces = self.__next_index(envs, len(self.tetrominos))[:, None] + 1
+
+            positions = self.queue_length[envs, None] + np.arange(pieces.shape[1])
+            self.queue[envs[:, None], positions] = pieces
+            self.queue_length[envs] += pieces.shape[1]
+
+            envs = envs[self.queue_length[envs] <= self.queue_previews]
+
+    def __next_float(self, envs):
+        """
+        Advance the RNG of the games and return floats in [0, 1), as RNG.next_float
+
+        args:
+            envs (array): The indices of the games
+        """
+        self.rng[envs] = (self.rng[envs] * _MULTIPLIER) % _MODULUS
+        return (self.rng[envs] - 1) / (_MODULUS - 1)
+
+    def __next_index(self, envs, n:int):
+        """
+        Advance the RNG of the games and return an index in [0, n)
+
+        args:
+            envs (array): The indices of the games
+            n (int): The number of choices
+        """
+        return np.floor(self.__next_float(envs) * n).astype(np.int64)
+
+    def __shuffle(self, envs, arrays):
+        """
+        Shuffle one array per game with the Fisher-Yates shuffle, as RNG.shuffle_array
+
+        args:
+            envs (array): The indices of the games
+            arrays (array): (len(envs), length) the arrays to shuffle, shuffled in place
+        """
+        rows = np.arange(len(envs))
+
+        for i in range(arrays.shape[1] - 1, 0, -1):
+            r = self.__next_index(envs, i + 1)
+            arrays[rows, i], arrays[rows, r] = arrays[rows, r], arrays[rows, i].copy()
+
+        return arrays
+
+    def __classic(self, envs):
+        """
+        Generate one piece per game with the classic randomiser, as Queue.classic_randomiser
+
+        args:
+            envs (array): The indices of the games
+        """
+        n = len(self.tetrominos)
+        index = self.__next_index(envs, n + 1)
+        reroll = (index == self.last_generated[envs]) | (index >= n)
+
+        if reroll.any():
+            index[reroll] = self.__next_index(envs[reroll], n)
+
+        self.last_generated[envs] = index
+        return index[:, None] + 1
@@ -0,0 +1,78 @@
+import random
+from functools import cache
+from instance.pieces import PIECE_TYPES
+
+# Zobrist keys: a random 64 bit key for every cell of the matrix and every value of the piece, hold and queue,
+# so the hash of a state is the XOR of the keys of what it holds and can be updated by XORing keys in and out.
+# The keys come from fixed seeds, so hashes are the same across processes and runs.
+
+PIECE_PADDING = 4 # the current piece can sit up to this many cells outside the matrix, its grid origin is above or left of its blocks
+MAX_QUEUE_PREVIEWS = 6
+
+def _get_keys(name:str, count:int):
+    """
+    Get a list of 64 bit keys from a seed of their own
+
+    args:
+        name (str): The name of the keys, which seeds them
+        count (int): The number of keys
+    """
+    rng = random.Random(f'zobrist-{name}')
+    return [rng.getrandbits(64) for _ in range(count)]
+
+@cache
+def get_cell_keys(width:int, height:int):
+    """
+    Get the key of every cell of a matrix, as a tuple of rows
+
+    args:
+        width (int): The width of the matrix
+        height (int): The height of the matrix, including the buffer zone
+    """
+    keys = _get_keys(f'cells-{width}-{height}', width * height)
+    return tuple(tuple(keys[y * width:(y + 1) * width]) for y in range(height))
+
+@cache
+def get_shift_keys(width:int, height:int):
+    """
+    Get the key of every cell XOR the key of the cell below it, what moving a block down one row XORs into the hash, as a tuple of rows
+
+    args:
+        width (int): The width of the matrix
+        height (int): The height of the matrix, including the buffer zone
+    """
+    cells = get_cell_keys(width, height)
+    return tuple(tuple(key ^ below for key, below in zip(cells[y], cells[y + 1])) for y in range(height - 1))
+
+@cache
+def get_piece_keys(width:int, height:int):
+    """
+    Get the key of every piece id, rotation state and position of the current piece, indexed [id][state][y + PIECE_PADDING][x + PIECE_PADDING]
+
+    args:
+        width (int): The width of the matrix
+        height (int): The height of the matrix, including the buffer zone
+    """
+    columns, rows = width + 2 * PIECE_PADDING, height + 2 * PIECE_PADDING
+    keys = iter(_get_keys(f'pieces-{width}-{height}', len(PIECE_TYPES) * 4 * rows * columns))
+
+    return (None,) + tuple(
+        tuple(tuple(tuple(next(keys) for _ in range(columns)) for _ in range(rows)) for _ in range(4))
+        for _ in PIECE_TYPES
+    )
+
+@cache
+def get_state_keys():
+    """
+    Get the keys of the held piece, of being able to hold and of the pieces in the queue previews
+
+    returns:
+        hold (tuple): The key of each held piece id, 0 (nothing held) included
+        can_hold (int): The key XORed in when the current piece can be held
+        queue (tuple): The key of each piece id at each queue preview, indexed [preview][id]
+    """
+    keys = iter(_get_keys('state', (len(PIECE_TYPES) + 1) * (MAX_QUEUE_PREVIEWS + 1) + 1))
+    hold = tuple(next(keys) for _ in range(len(PIECE_TYPES) + 1))
+    can_hold = next(keys)
+    queue = tuple(tuple(next(keys) for _ in range(len(PIECE_TYPES) + 1)) for _ in range(MAX_QUEUE_PREVIEWS))
+    return hold, can_hold, queue
@@ -123,6 +123,10 @@ class UIDebug():
         
         self.debug_surfaces.append((self.Fonts.pfw_small.render(f'ALL_CLEAR: {self.DebugStruct.ALLCLEARFLAG} | B2B: {self.DebugStruct.BACK2BACKFLAG} | COMBO: {self.DebugStruct.COMBOFLAG}', True, (255, 255, 255)), (self.RenderStruct.GRID_SIZE // 2, self.RenderStruct.GRID_SIZE * 18.5)))
         
+        if self.DebugStruct.writer is not None:
+            writer_colour = (255, 0, 0) if self.DebugStruct.Writer_Dropped else (255, 255, 255)
+            self.debug_surfaces.append((self.Fonts.pfw_small.render(f'Replay Writer: queued {self.DebugStruct.Writer_Queued} | written {self.DebugStruct.Writer_Written} | dropped {self.DebugStruct.Writer_Dropped}', True, writer_colour), (self.RenderStruct.GRID_SIZE // 2, self.RenderStruct.GRID_SIZE * 19)))
+        
         for surf, coords in self.debug_surfaces:
             background_surface = pygame.Surface((surf.get_width(), surf.get_height()), pygame.SRCALPHA)
             background_surface.fill((32, 32, 32, 128))
@@ -467,10 +467,8 @@ class Board():
             return False
         
         position = self.GameInstanceStruct.current_tetromino.position
-        blocks = self.GameInstanceStruct.current_tetromino.blocks
-        array = self.GameInstanceStruct.matrix.spawn_overlap
         
-        return self.__check_overlap(position, blocks, array)
+        return self.GameInstanceStruct.matrix.spawn_overlap_collision(self.GameInstanceStruct.current_tetromino.shape, position.x, position.y)
     
     def __check_buffer_overlap(self):
         if self.GameInstanceStruct.current_tetromino is None or self.GameInstanceStruct.lock_out_ok:
@@ -481,20 +479,6 @@ class Board():
         else:
             return False
         
-    def __check_overlap(self, position, blocks, array):
-        if any (
-            val != 0 and (
-                position.x + x < 0 or position.x + x >= self.GameInstanceStruct.matrix.WIDTH or 
-                position.y + y <= 0 or position.y + y >= self.GameInstanceStruct.matrix.HEIGHT or 
-                array[position.y + y][position.x + x] != 0
-            )
-            for y, row in enumerate(blocks)
-            for x, val in enumerate(row)
-        ):
-            return True         
-        else:
-            return False
-    
     def __draw_hold_text(self, surface):
         if not self.GameInstanceStruct.hold:  
             return
@@ -29,7 +29,7 @@ class HoldAndQueue():
             self.row_height = self.queue_rect.height // self.GameInstanceStruct.queue_previews  # split queue_rect into queue length number of rows
             
             self.queue_surf = pygame.Surface((self.queue_rect.width, self.queue_rect.height), pygame.SRCALPHA|pygame.HWSURFACE)
-            self.queue_pieces = 'PLACEHOLDER'
+            self.queue_generation = None
             
         if self.GameInstanceStruct.hold:
             self.hold_rect = self.__get_hold_rect()
@@ -60,16 +60,15 @@ class HoldAndQueue():
             surface (pygame.Surface): The surface to draw onto
         """
         
-        if self.queue_pieces != self.GameInstanceStruct.queue.queue[:self.GameInstanceStruct.queue_previews]:
+        if self.queue_generation != self.GameInstanceStruct.queue.generation: # only draw the queue if a piece was taken from it
             
-            self.queue_pieces = self.GameInstanceStruct.queue.queue[:self.GameInstanceStruct.queue_previews]
+            self.queue_generation = self.GameInstanceStruct.queue.generation
             
             self.queue_background_Surf.fill((0, 0, 0, self.background_alpha))
             self.queue_surf.fill((0, 0, 0, 0))
             
-            for idx, tetromino in enumerate(self.GameInstanceStruct.queue.queue):
-                if idx == self.GameInstanceStruct.queue_previews:
-                    break
+            for idx in range(self.GameInstanceStruct.queue_previews):
+                tetromino = self.GameInstanceStruct.queue.view_queue(idx)
                 
                 self.row_y = idx * self.row_height
                 preview_rect = pygame.Rect(0, self.row_y, self.queue_rect.width, self.row_height)
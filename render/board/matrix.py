@@ -3,7 +3,6 @@ from core.state.struct_flags import StructFlags
 from core.state.struct_gameinstance import StructGameInstance
 from render.board.struct_board import StructBoardConsts
 import pygame
-import copy
 from utils import lerpBlendRGBA, smoothstep, tint_texture
 import numpy as np
 # FIXME: line clear particles dont draw always since I will need to add the cleared lines/blocks to a queue in the game instance and then draw them
@@ -36,7 +35,7 @@ class Matrix():
         
         self.blocks_surface_alpha = 255
         self.blocks_surface = self.blocks_surface = pygame.Surface((self.BoardConsts.MATRIX_SURFACE_WIDTH, self.BoardConsts.MATRIX_SURFACE_HEIGHT * 2), pygame.SRCALPHA|pygame.HWSURFACE)
-        self.placed_blocks = 'PLACEHOLDER'
+        self.placed_blocks_version = None
         
         self.shadow_surface = pygame.Surface((1, 1), pygame.SRCALPHA|pygame.HWSURFACE)
         self.shadow_blocks = 'PLACEHOLDER'
@@ -194,10 +193,8 @@ class Matrix():
         """
         rect = pygame.Rect(matrix_surface_rect.x, matrix_surface_rect.y, matrix_surface_rect.width, matrix_surface_rect.height * 2) # matrix is double the height of the board
 
-        if self.placed_blocks != self.GameInstanceStruct.matrix.matrix:	# only draw the matrix if it has changed
-            self.placed_blocks = copy.deepcopy(self.GameInstanceStruct.matrix.matrix) # if I just do the logical thing here: self.placed_blocks = self.GameInstanceStruct.matrix.matrix 
-                                                                                      # this doesn't work properly and nothing renders?????? neither does self.GameInstanceStruct.matrix.matrix.copy() ???????
-                                                                                      # WTF is deepcopy ???? This has given me an aneurysm
+        if self.placed_blocks_version != self.GameInstanceStruct.matrix.version: # only draw the matrix if it has changed, the version changes whenever the placed blocks do
+            self.placed_blocks_version = self.GameInstanceStruct.matrix.version
             self.blocks_surface.fill((0, 0, 0, 0))
             self.__draw_tetromino_blocks(self.blocks_surface, self.GameInstanceStruct.matrix.matrix, self.blocks_surface.get_rect())
         
@@ -2,6 +2,7 @@ import pygame
 import os
 import numpy as np
 from scipy.ndimage import gaussian_filter, binary_dilation
+from instance.utils import Vec2, get_tetromino_blocks # noqa: F401 (re-exported for the renderer)
 
 def lerpBlendRGBA(base:tuple, overlay:tuple, alpha:float):
     """
@@ -77,102 +78,6 @@ def comma_separate(number: int) -> str:
     """
     return "{:,}".format(number)
   
-def get_tetromino_blocks(type:str):
-    """
-    Get the blocks for the given tetromino.
-    This is the 0th rotation state of the piece that SRS uses.
-    
-    args:
-        type (str): The type of tetromino
-    
-    returns:
-        blocks (list): The pieces blocks
-    """
-    blocks = {
-        'Z':
-            [
-                ('Z', 'Z',  0 ),
-                ( 0 , 'Z', 'Z'),
-                ( 0 ,  0 ,  0 )
-            ],
-        'L': 
-            [
-                ( 0 ,  0 , 'L'),
-                ('L', 'L', 'L'),
-                ( 0 ,  0 ,  0 )
-            ],
-        'O': 
-            [
-                ('O', 'O'), 
-                ('O', 'O'),
-            ],
-        'S': 
-            [
-                ( 0 , 'S', 'S'),
-                ('S', 'S',  0 ),
-                ( 0 ,  0 ,  0 )
-            ],
-        'I': 
-            [
-                ( 0 ,  0 ,  0 ,  0 ),
-                ('I', 'I', 'I', 'I'),
-                ( 0 ,  0 ,  0 ,  0 ),
-                ( 0 ,  0 ,  0 ,  0 ),
-            ],
-        'J':
-            [
-                ('J',  0 ,  0 ),
-                ('J', 'J', 'J'),
-                ( 0 ,  0 ,  0 )
-            ],    
-        'T':
-            [
-                ( 0 , 'T',  0 ),
-                ('T', 'T', 'T'),
-                ( 0 ,  0 ,  0 )
-            ]     
-    }
-    return blocks[type]
-
-class Vec2():
-    def __init__(self, x, y):
-        """
-        Construct a 2D vector (x , y)
-        
-        args:
-            x (float): the x component of the vector
-            y (float): the y component of the vector
-        """
-        self.x = x
-        self.y = y
-    
-    def __str__(self):
-        return f"<Vec2 | x={self.x} y={self.y}>" 
-    
-    def __repr__(self):
-        return f"<Vec2 | x={self.x} y={self.y}>"
-        
-    def __truediv__(self, scalar): 
-        return Vec2(self.x/scalar , self.y/scalar) 
-    
-    def __add__(self, vec): 
-        return Vec2(self.x + vec.x , self.y + vec.y)
-    
-    def __sub__(self, vec): 
-        return Vec2((self.x - vec.x) , (self.y - vec.y))
-    
-    def magnitude(self): 
-        return np.sqrt(self.x**2 + self.y**2)
-    
-    def normalise(a): 
-        return a / a.magnitude()
-    
-    def __mul__(self, scalar):
-        return Vec2(self.x * scalar, self.y * scalar)
-    
-    def distance(a, b): 
-        return np.sqrt((a.x - b.x)**2 + (a.y - b.y)**2)
-    
 def RotateSurface(surface, angle, pivot, origin):
     """
     Rotate a surface around a pivot point.